@@ -195,7 +195,7 @@ class PracticeTypeStatsAdmin(admin.ModelAdmin):
 
 @admin.register(PracticeActiveQuestion)
 class PracticeActiveQuestionAdmin(admin.ModelAdmin):
-    list_display = ['user', 'test_prep', 'lane', 'question']
+    list_display = ['user', 'test_prep', 'lane', 'position', 'question']
     search_fields = ['user__username', 'lane']
     raw_id_fields = ['user', 'question']
 
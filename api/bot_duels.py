@@ -1,68 +1,173 @@
+"""Bot rivals: the cached roster, who is busy, and precomputed answer timelines.
+
+The roster (active bot users with profiles) is cached for ROSTER_TTL seconds.
+A bot is marked busy in the cache when claim_bot seats it and marked idle
+when its room ends (Room.finish), so picking a rival reads only the cache.
+The seat itself is one conditional update (Room.start with idle_only) that
+also refuses a bot already in an active room, which keeps workers that do
+not share a cache honest.
+"""
 import random
 
-from django.db.models import Q
+from django.core.cache import cache
+from django.contrib.auth.models import User
 from django.utils import timezone
 
-from api.models import Profile, Room, TrackedQuestion
+from api.duel_events import publish_room_event
+from api.models import Room, TestPrepUserStats, TrackedQuestion
+
+ROSTER_KEY = 'bots:roster'
+ROSTER_TTL = 60
+# Safety net for a busy mark whose room never reaches finish().
+BUSY_TTL = 30 * 60
+# A bot found busy in the database without a mark here: skip it for a while.
+STALE_BUSY_TTL = 2 * 60
 
 
 def bot_accuracy(rating):
     return min(82, max(52, 52 + (rating - 1200) // 20))
 
 
+def bot_roster():
+    """Active bot users (with profiles) in id order, cached briefly."""
+    roster = cache.get(ROSTER_KEY)
+    if roster is None:
+        roster = list(User.objects.filter(profile__is_bot=True, is_active=True).select_related('profile').order_by('id'))
+        cache.set(ROSTER_KEY, roster, ROSTER_TTL)
+    return roster
+
+
 def rotating_bot_users(now=None):
     """Return three or four bot rivals, rotating once per minute."""
-    bots = list(
-        Profile.objects.filter(is_bot=True, user__is_active=True)
-        .select_related('user')
-        .order_by('user_id')
-    )
+    bots = bot_roster()
     if not bots:
         return []
     slot = int((now or timezone.now()).timestamp() // 60)
     count = min(len(bots), 3 + slot % 2)
     start = slot % len(bots)
-    return [bots[(start + offset) % len(bots)].user for offset in range(count)]
+    return [bots[(start + offset) % len(bots)] for offset in range(count)]
 
 
-def available_bot_user(exclude_user=None):
-    active_ids = set(
-        Room.objects.filter(status__in=['Searching', 'Battling'])
-        .filter(Q(user1__profile__is_bot=True) | Q(user2__profile__is_bot=True))
-        .values_list('user1_id', 'user2_id')
-    )
-    unavailable = {user_id for pair in active_ids for user_id in pair if user_id}
-    if exclude_user:
-        unavailable.add(exclude_user.id)
+def _busy_key(user_id):
+    return f'bots:busy:{user_id}'
+
+
+def mark_bots_idle(*user_ids):
+    """Room lifecycle hook: these users' rooms ended (humans are a no-op)."""
+    cache.delete_many([_busy_key(user_id) for user_id in user_ids if user_id])
+
 
+def _idle_bot_users(exclude_user=None):
+    """Bots not marked busy, current rotation first. Cache reads only."""
     rotating = rotating_bot_users()
-    remaining = [
-        profile.user
-        for profile in Profile.objects.filter(is_bot=True, user__is_active=True)
-        .exclude(user_id__in=[user.id for user in rotating])
-        .select_related('user')
-        .order_by('user_id')
+    rotating_ids = {user.id for user in rotating}
+    candidates = [
+        user for user in rotating + [user for user in bot_roster() if user.id not in rotating_ids]
+        if exclude_user is None or user.id != exclude_user.id
     ]
-    return next((user for user in rotating + remaining if user.id not in unavailable), None)
+    busy = cache.get_many([_busy_key(user.id) for user in candidates])
+    return [user for user in candidates if _busy_key(user.id) not in busy]
 
 
-def advance_bot(room, bot):
-    """Advance a bot from elapsed battle time whenever progress is polled."""
-    if not room.battle_start_time:
-        return
+def available_bot_user(exclude_user=None):
+    """The first bot not marked busy, current rotation first. Cache reads only."""
+    return next(iter(_idle_bot_users(exclude_user)), None)
+
+
+def claim_bot(room, exclude_user=None):
+    """Seat an idle bot as `room`'s opponent; returns it, or None to retry later.
+
+    A bot the cache thinks is idle can still be busy in the database (seated
+    by a worker with another cache, or before a restart). It keeps its mark
+    for STALE_BUSY_TTL so later polls skip it, and the next candidate is
+    tried in the same call.
+    """
+    for bot in _idle_bot_users(exclude_user):
+        if not cache.add(_busy_key(bot.id), room.pk, BUSY_TTL):
+            continue
+        if room.start(bot, idle_only=True):
+            return bot
+        if not Room.objects.filter(pk=room.pk, status='Searching', user2__isnull=True).exists():
+            cache.delete(_busy_key(bot.id))  # the room was taken or cancelled, not the bot
+            return None
+        cache.touch(_busy_key(bot.id), STALE_BUSY_TTL)
+    return None
+
+
+def build_bot_timeline(seed, rating, count):
+    """[[answer time in seconds after start, correct 0/1], ...] for `count` questions.
 
-    questions = list(TrackedQuestion.objects.filter(room=room, user=bot).order_by('id'))
-    rating = bot.profile.elo_rating
+    Pace and accuracy follow the bot's rating; the same seed always yields
+    the same timeline.
+    """
+    rng = random.Random(seed)
     pace_seconds = max(16, 25 - max(0, rating - 1200) // 150)
-    elapsed = max(0, (timezone.now() - room.battle_start_time).total_seconds())
-    due = min(len(questions), int(elapsed // pace_seconds))
     accuracy = bot_accuracy(rating)
+    timeline, at = [], 0.0
+    for _ in range(count):
+        at += pace_seconds * rng.uniform(0.8, 1.2)
+        timeline.append([round(at, 1), int(rng.randrange(100) < accuracy)])
+    return timeline
 
+
+def _draw_timeline(room, bot):
+    # The bot plays at its duel rating for the room's test prep.
+    rating = TestPrepUserStats.for_user(bot, room.test_prep_id).duel_elo
+    count = TrackedQuestion.objects.filter(room=room, user=bot).count()
+    return build_bot_timeline(f'{room.pk}:{bot.pk}', rating, count)
+
+
+def store_bot_timeline(room, bot):
+    """Draw the bot's timeline as it is seated (Room.start) and store it on the room."""
+    room.bot_timeline = _draw_timeline(room, bot)
+    Room.objects.filter(pk=room.pk).update(bot_timeline=room.bot_timeline)
+    return room.bot_timeline
+
+
+def bot_timeline(room, bot):
+    """The room's stored bot timeline.
+
+    Rooms seated before timelines were drawn at start have none; theirs is
+    drawn on first use and stored with a compare-and-swap, so concurrent
+    readers agree.
+    """
+    if room.bot_timeline is None:
+        timeline = _draw_timeline(room, bot)
+        if not Room.objects.filter(pk=room.pk, bot_timeline__isnull=True).update(bot_timeline=timeline):
+            timeline = Room.objects.values_list('bot_timeline', flat=True).get(pk=room.pk)
+        room.bot_timeline = timeline
+    return room.bot_timeline
+
+
+def bot_answers_due(room, bot, now=None):
+    """How many timeline answers the bot has given by `now` (pure once stored)."""
+    if not room.battle_start_time:
+        return 0
+    # Capped at the clock so reads after the match agree with what end_match settled.
+    elapsed = min(((now or timezone.now()) - room.battle_start_time).total_seconds(), room.battle_duration)
+    return sum(1 for at, _ in bot_timeline(room, bot) if at <= elapsed)
+
+
+def apply_bot_progress(room, bot, rows, now=None):
+    """Fill the bot's Blank tracked rows (id order) from the timeline, in memory.
+
+    Returns the rows that changed; nothing is written — see settle_bot.
+    """
+    due = bot_answers_due(room, bot, now)
+    timeline = bot_timeline(room, bot) if due else []
     changed = []
-    for tracked in questions[:due]:
-        if tracked.status != 'Blank':
-            continue
-        tracked.status = 'Correct' if random.randrange(100) < accuracy else 'Incorrect'
-        changed.append(tracked)
+    for tracked, (_, correct) in zip(rows[:due], timeline):
+        if tracked.status == 'Blank':
+            tracked.status = 'Correct' if correct else 'Incorrect'
+            changed.append(tracked)
+    return changed
+
+
+def settle_bot(room, bot, now=None):
+    """Write the bot's answers given so far in one bulk update; returns its rows."""
+    rows = list(TrackedQuestion.objects.filter(room=room, user=bot).order_by('id'))
+    changed = apply_bot_progress(room, bot, rows, now)
     if changed:
         TrackedQuestion.objects.bulk_update(changed, ['status'])
+        publish_room_event(room.pk)
+    return rows
@@ -0,0 +1,183 @@
+"""Live duel events: publish from the request paths, stream to clients over SSE.
+
+Publishing bumps Room.event_seq; that counter is the only channel between
+the writers (the WSGI `web` app) and the streams (the ASGI events app, see
+satduel.asgi), which run in different processes and share only the
+database. Each stream checks event_seq every POLL_SECONDS and, when it
+moved, re-reads the room and turns differences into events, so a bump that
+lands between checks costs a query, never an event. There is no push
+channel between processes.
+
+Each stream's reads run on the default executor (thread_sensitive=False),
+not the worker's one sync thread, so open streams don't queue behind each
+other or the sync views. Each read borrows an executor thread for a query
+or two, and executor threads keep their own database connections.
+
+Events (SSE `event:` names):
+    snapshot   first message: status, clock, both players' answers, recent emotes
+    progress   a tracked question changed status {tracked_question_id, user_id, status}
+    status     the room's status changed {status}
+    clock      the battle clock started {end_time, battle_duration}
+    emote      a reaction became visible {id, sender_id, emoji, visible_at}
+    time_up    the clock ran out; the client should call end_match
+    end        the room ended; the stream closes after this
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.db.models import F
+from django.utils import timezone
+
+from api.models import DuelEmote, Room, TrackedQuestion
+
+POLL_SECONDS = 1.0
+KEEPALIVE_SECONDS = 15
+# Streams close on their own this long after the battle clock (or, before it
+# starts, the connection) would have run out.
+STREAM_GRACE_SECONDS = 60
+SNAPSHOT_EMOTES = 20
+
+def publish_room_event(room_id):
+    """Record that something happened in a room; streams see it on their next check."""
+    Room.objects.filter(pk=room_id).update(event_seq=F('event_seq') + 1)
+
+
+def format_event(name, data):
+    return f'event: {name}\ndata: {json.dumps(data, default=str)}\n\n'
+
+
+class RoomView:
+    """What the stream has already told its client about one room."""
+
+    def __init__(self, room_id, user_id):
+        self.room_id = room_id
+        self.user_id = user_id
+        self.bot = None  # the viewer's opponent, when it is a bot
+        self.seq = None
+        self.status = None
+        self.battle_start_time = None
+        self.answers = {}  # tracked question id -> status
+        self.bot_due = 0  # bot answers given as of the last read
+        self.last_emote_id = 0
+        self.pending_emotes = []  # emote rows not yet visible
+        self.time_up_sent = False
+
+    def read(self):
+        """Re-read the room (sync) and return the events since the last read.
+
+        The bot's answers are computed from its timeline rather than read,
+        since they are only written when the match ends.
+        """
+        from api.bot_duels import apply_bot_progress, bot_answers_due  # bot_duels publishes through this module
+        room = Room.objects.select_related('user1__profile', 'user2__profile').get(pk=self.room_id)
+        events = []
+        first = self.seq is None
+        self.seq = room.event_seq
+        opponent = room.user2 if room.user1_id == self.user_id else room.user1
+        self.bot = opponent if opponent is not None and opponent.profile.is_bot else None
+        bot = self.bot
+
+        tracked = list(TrackedQuestion.objects.filter(room=room).order_by('id').only('id', 'user_id', 'status'))
+        if bot is not None:
+            self.bot_due = bot_answers_due(room, bot)
+            if self.bot_due:
+                apply_bot_progress(room, bot, [row for row in tracked if row.user_id == bot.id])
+        rows = [{'id': row.id, 'user_id': row.user_id, 'status': row.status} for row in tracked]
+        emotes = list(
+            DuelEmote.objects.filter(room=room, id__gt=self.last_emote_id)
+            .order_by('id').values('id', 'sender_id', 'emoji', 'visible_at')
+        )
+        if emotes:
+            self.last_emote_id = emotes[-1]['id']
+        self.pending_emotes.extend(emotes)
+
+        if first:
+            events.append(('snapshot', {
+                'status': room.status,
+                'clock': _clock(room),
+                'answers': rows,
+                'emotes': self.due_emotes()[-SNAPSHOT_EMOTES:],
+            }))
+        else:
+            if room.status != self.status:
+                events.append(('status', {'status': room.status}))
+            if room.battle_start_time and not self.battle_start_time:
+                events.append(('clock', _clock(room)))
+            for row in rows:
+                if self.answers.get(row['id']) != row['status']:
+                    events.append(('progress', {
+                        'tracked_question_id': row['id'], 'user_id': row['user_id'], 'status': row['status'],
+                    }))
+        self.status = room.status
+        self.battle_start_time = room.battle_start_time
+        self.answers = {row['id']: row['status'] for row in rows}
+        return room, events
+
+    def due_emotes(self, now=None):
+        now = now or timezone.now()
+        due = [emote for emote in self.pending_emotes if emote['visible_at'] <= now]
+        self.pending_emotes = [emote for emote in self.pending_emotes if emote['visible_at'] > now]
+        return due
+
+
+def _clock(room):
+    if not room.battle_start_time:
+        return None
+    end_time = room.battle_start_time + timezone.timedelta(seconds=room.battle_duration)
+    return {'end_time': end_time.isoformat(), 'battle_duration': room.battle_duration}
+
+
+def _tick(view):
+    """One sync step of the stream: diff if the room or the bot's timeline moved."""
+    from api.bot_duels import bot_answers_due
+    room = Room.objects.only(
+        'id', 'event_seq', 'battle_start_time', 'battle_duration', 'bot_timeline',
+    ).get(pk=view.room_id)
+    bot_moved = view.bot is not None and bot_answers_due(room, view.bot) != view.bot_due
+    if room.event_seq == view.seq and not bot_moved:
+        return None, []
+    return view.read()
+
+
+async def room_event_stream(room_id, user, poll_seconds=POLL_SECONDS):
+    """Async generator of SSE chunks for `user`'s view of a duel room."""
+    view = RoomView(room_id, user.id)
+    connected_at = timezone.now()
+    room, events = await sync_to_async(view.read, thread_sensitive=False)()
+
+    for name, data in events:
+        yield format_event(name, data)
+    idle = 0.0
+    while True:
+        if view.status == 'Ended':
+            yield format_event('end', {'status': view.status})
+            return
+        started = view.battle_start_time or connected_at
+        if timezone.now() > started + timezone.timedelta(seconds=room.battle_duration + STREAM_GRACE_SECONDS):
+            return
+
+        await asyncio.sleep(poll_seconds)
+        try:
+            fresh, events = await sync_to_async(_tick, thread_sensitive=False)(view)
+        except Room.DoesNotExist:  # cancelled before anyone joined
+            yield format_event('end', {'status': 'Cancelled'})
+            return
+        room = fresh or room
+        events += [('emote', emote) for emote in view.due_emotes()]
+        if (
+            not view.time_up_sent and view.status == 'Battling' and view.battle_start_time
+            and timezone.now() >= view.battle_start_time + timezone.timedelta(seconds=room.battle_duration)
+        ):
+            view.time_up_sent = True
+            events.append(('time_up', {}))
+
+        if events:
+            idle = 0.0
+            for name, data in events:
+                yield format_event(name, data)
+        else:
+            idle += poll_seconds
+            if idle >= KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ': keepalive\n\n'
@@ -0,0 +1,112 @@
+"""Duel result documents, written once when a room ends (Room.end_battle).
+
+The document holds everything get_results and match history show: both
+players as they were at the end of the match, scores, Elo before and after,
+and each player's answers as compact [tracked question id, question id,
+status] rows. Reads reshape it for the viewer and never touch the tracked
+questions, profiles or rating rows again.
+
+Rooms that ended before documents existed have Room.result = null; the
+views fall back to building the same payload live for those.
+"""
+from rest_framework import serializers
+
+from api.models import TrackedQuestion, usable_duel_emotes
+
+_datetime = serializers.DateTimeField()
+
+
+def _timestamp(value):
+    return None if value is None else _datetime.to_representation(value)
+
+
+def _player(room, user, prefix):
+    profile = user.profile
+    return {
+        'user': {
+            'id': user.id,
+            'username': user.username,
+            'avatar': profile.avatar,
+            'avatar_icon': profile.avatar_icon,
+            'elo_rating': getattr(room, f'{prefix}_elo_after'),
+            'duel_emotes': usable_duel_emotes(profile),
+            'is_premium': profile.has_premium,
+        },
+        'score': getattr(room, f'{prefix}_score'),
+        'elo_before': getattr(room, f'{prefix}_elo_before'),
+        'elo_after': getattr(room, f'{prefix}_elo_after'),
+        'results': [],
+    }
+
+
+def build_result(room):
+    """The result document for a room whose scores and Elo are settled."""
+    players = {room.user1_id: _player(room, room.user1, 'user1'), room.user2_id: _player(room, room.user2, 'user2')}
+    rows = TrackedQuestion.objects.filter(room=room).order_by('id').values_list('id', 'user_id', 'question_id', 'status')
+    for tracked_id, user_id, question_id, status in rows:
+        players[user_id]['results'].append([tracked_id, question_id, status])
+    return {
+        'room_id': room.pk,
+        'test_prep': room.test_prep_id,
+        'created_at': _timestamp(room.created_at),
+        'battle_start_time': _timestamp(room.battle_start_time),
+        'winner': room.winner.id if room.winner else None,
+        'players': [players[room.user1_id], players[room.user2_id]],
+    }
+
+
+def _results(player):
+    return [
+        {'id': tracked_id, 'user': player['user'], 'question': question_id, 'status': status}
+        for tracked_id, question_id, status in player['results']
+    ]
+
+
+def _result_player(player):
+    before, after = player['elo_before'], player['elo_after']
+    return {
+        **player['user'],
+        'score': player['score'],
+        'elo_before': before,
+        'elo_after': after,
+        'elo_change': after - before if before is not None and after is not None else None,
+        'results': _results(player),
+    }
+
+
+def results_payload(document, viewer_id):
+    """get_results' response for `viewer_id` from a stored document."""
+    first, second = document['players']
+    current, opponent = (first, second) if first['user']['id'] == viewer_id else (second, first)
+    winner = document['winner']
+    return {
+        'outcome': 'draw' if winner is None else 'win' if winner == viewer_id else 'loss',
+        'current_user': _result_player(current),
+        'opponent': _result_player(opponent),
+        'created_at': document['created_at'],
+        # Keep the legacy arrays while older clients age out.
+        'user1_results': _results(first),
+        'user2_results': _results(second),
+    }
+
+
+def history_payload(document):
+    """One match-history entry (RoomSerializer's shape) from a stored document."""
+    first, second = document['players']
+    return {
+        'id': document['room_id'],
+        'test_prep': document['test_prep'],
+        'user1': first['user'],
+        'user2': second['user'],
+        'created_at': document['created_at'],
+        'status': 'Ended',
+        'questions': [question_id for _, question_id, _ in first['results']],
+        'winner': document['winner'],
+        'battle_start_time': document['battle_start_time'],
+        'user1_score': first['score'],
+        'user2_score': second['score'],
+        'user1_elo_before': first['elo_before'],
+        'user1_elo_after': first['elo_after'],
+        'user2_elo_before': second['elo_before'],
+        'user2_elo_after': second['elo_after'],
+    }
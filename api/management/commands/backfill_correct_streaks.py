@@ -0,0 +1,56 @@
+"""
+Recompute Profile.practice_correct_streak from each user's practice history.
+The counter is maintained at answer time; run this once after adding it, or
+to repair it after editing attempts by hand. Also raises max_streak when the
+recomputed run beats it.
+
+    python manage.py backfill_correct_streaks
+    python manage.py backfill_correct_streaks --dry-run
+"""
+from django.core.management.base import BaseCommand
+from django.db.models.functions import Greatest
+
+from api.models import DEFAULT_TEST_PREP, PracticeAttempt, Profile
+
+
+def correct_streak_from_history(user_id):
+    """Correct answers since the user's most recent miss."""
+    streak = 0
+    for correct in PracticeAttempt.objects.filter(
+        user_id=user_id, test_prep_id=DEFAULT_TEST_PREP,
+    ).order_by('-created_at', '-id').values_list('correct', flat=True).iterator():
+        if not correct:
+            break
+        streak += 1
+    return streak
+
+
+class Command(BaseCommand):
+    help = "Recompute every profile's practice correct-answer streak from its attempts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report changes without writing them.')
+
+    def handle(self, *args, **options):
+        user_ids = (
+            PracticeAttempt.objects.filter(test_prep_id=DEFAULT_TEST_PREP)
+            .values_list('user_id', flat=True).distinct()
+        )
+        changed = 0
+        for profile_id, user_id, stored in (
+            Profile.objects.filter(user_id__in=user_ids)
+            .values_list('id', 'user_id', 'practice_correct_streak').iterator()
+        ):
+            streak = correct_streak_from_history(user_id)
+            if streak == stored:
+                continue
+            changed += 1
+            if not options['dry_run']:
+                Profile.objects.filter(pk=profile_id).update(
+                    practice_correct_streak=streak,
+                    max_streak=Greatest('max_streak', streak),
+                )
+
+        verb = 'Would update' if options['dry_run'] else 'Updated'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {changed} profile(s)."))
@@ -0,0 +1,257 @@
+"""
+Load and latency benchmark for the practice loop. Seeds users, questions and
+prior attempts into a scratch test database (never the configured one), then
+drives next_question -> check_answer -> practice_status through the DRF test
+client and prints a JSON report to compare branches.
+
+    python manage.py bench_practice
+    python manage.py bench_practice --users 50 --questions 5000 --attempts 300 --rounds 40
+    python manage.py bench_practice --workers 8 --output bench.json
+
+Concurrent workers need a real database server; SQLite serializes writers and
+will report lock errors instead of latency. rows_scanned is read from
+pg_stat_user_tables and is null on other backends.
+"""
+import json
+import random
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import (
+    DEFAULT_TEST_PREP,
+    PracticeAttempt,
+    Profile,
+    Question,
+    UserQuestionState,
+)
+from api.question_bank import bump_bank_version
+from api.views.practice_views import SUBJECT_TYPES, rebuild_practice_days
+
+DIFFICULTY_ELO = {1: 600, 2: 800, 3: 1200, 4: 1600, 5: 2000}
+ENDPOINTS = ('next_question', 'check_answer', 'practice_status')
+CORRECT_RATE = 0.7
+
+
+def seed(users, questions, attempts, rng):
+    """Create premium bench users and a SAT bank; returns (users, {question id: answer text})."""
+    kinds = [(subject, question_type) for subject, types in SUBJECT_TYPES.items() for question_type in types]
+    bank = []
+    for number in range(questions):
+        subject, question_type = kinds[number % len(kinds)]
+        difficulty = rng.randint(1, 5)
+        bank.append(Question(
+            question=f'Bench question {number}?',
+            choice_a=f'{number}-a', choice_b=f'{number}-b', choice_c=f'{number}-c', choice_d=f'{number}-d',
+            answer=rng.choice('ABCD'), difficulty=difficulty, question_type=question_type,
+            subject=subject, test_prep_id=DEFAULT_TEST_PREP, sp_elo_rating=DIFFICULTY_ELO[difficulty],
+        ))
+    bank = Question.objects.bulk_create(bank, batch_size=1000)
+    bump_bank_version()  # bulk_create skips the Question signals
+    answers = {question.id: question.answer_text for question in bank}
+
+    seeded = []
+    subjects = {question.id: question.subject for question in bank}
+    question_ids = list(answers)
+    for number in range(users):
+        user = User.objects.create_user(username=f'bench-{number}', email=f'bench-{number}@example.com')
+        Profile.objects.create(user=user, is_premium=True)
+        # created_at is auto_now_add, so the whole history lands today;
+        # bench users are premium and never hit the daily quota.
+        history = [
+            (question_id, rng.random() < CORRECT_RATE)
+            for question_id in rng.sample(question_ids, min(attempts, len(question_ids)))
+        ]
+        PracticeAttempt.objects.bulk_create([
+            PracticeAttempt(
+                user=user, test_prep_id=DEFAULT_TEST_PREP, question_id=question_id,
+                subject=subjects[question_id], correct=correct,
+            )
+            for question_id, correct in history
+        ], batch_size=1000)
+        UserQuestionState.objects.bulk_create([
+            UserQuestionState(
+                user=user, test_prep_id=DEFAULT_TEST_PREP, question_id=question_id,
+                first_attempt_at=timezone.now(), last_correct=correct,
+            )
+            for question_id, correct in history
+        ], batch_size=1000)
+        rebuild_practice_days(user)
+        seeded.append(user)
+    return seeded, answers
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of an unsorted list."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def rows_scanned():
+    """Tuples read across user tables so far (Postgres only)."""
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cur:
+        cur.execute('SELECT pg_stat_clear_snapshot()')
+        cur.execute(
+            'SELECT COALESCE(SUM(seq_tup_read), 0) + COALESCE(SUM(idx_tup_fetch), 0) FROM pg_stat_user_tables'
+        )
+        return int(cur.fetchone()[0])
+
+
+class Recorder:
+    """Per-endpoint latency and query samples, shared by the worker threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {name: {'ms': [], 'queries': [], 'errors': 0, 'first_error': None} for name in ENDPOINTS}
+
+    def call(self, name, request):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            try:
+                response = request()
+                error = f'HTTP {response.status_code}' if response.status_code >= 400 else None
+            except Exception as exc:
+                response, error = None, f'{type(exc).__name__}: {exc}'
+            elapsed = (time.perf_counter() - started) * 1000
+        failed = error is not None
+        with self.lock:
+            sample = self.samples[name]
+            sample['ms'].append(elapsed)
+            sample['queries'].append(len(queries))
+            sample['errors'] += failed
+            sample['first_error'] = sample['first_error'] or error
+        return None if failed else response
+
+    def report(self):
+        report = {}
+        for name, sample in self.samples.items():
+            report[name] = {
+                'requests': len(sample['ms']),
+                'errors': sample['errors'],
+                'first_error': sample['first_error'],
+                'p50_ms': _round(percentile(sample['ms'], 0.50)),
+                'p95_ms': _round(percentile(sample['ms'], 0.95)),
+                'p99_ms': _round(percentile(sample['ms'], 0.99)),
+                'queries_mean': _round(sum(sample['queries']) / len(sample['queries'])) if sample['queries'] else None,
+                'queries_max': max(sample['queries'], default=None),
+            }
+        return report
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+def drive(user, answers, rounds, recorder, rng):
+    """One user's practice session: rounds of next -> answer -> status."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    next_url, answer_url, status_url = reverse('practice_next'), reverse('check_answer'), reverse('practice_status')
+    try:
+        for _ in range(rounds):
+            subject = rng.choice(list(SUBJECT_TYPES))
+            served = recorder.call('next_question', lambda: client.get(next_url, {'subject': subject}))
+            if served is None:
+                continue
+            question_id = served.data['question']['id']
+            choice = answers[question_id] if rng.random() < CORRECT_RATE else 'wrong answer'
+            recorder.call('check_answer', lambda: client.post(answer_url, {
+                'question_id': question_id, 'selected_choice': choice, 'mode': 'practice',
+            }, format='json'))
+            recorder.call('practice_status', lambda: client.get(status_url))
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            connection.close()
+
+
+def run_benchmark(users, questions, attempts, rounds, workers, seed_value=None):
+    """Seed the current database and run the loop; returns the report dict."""
+    rng = random.Random(seed_value)
+    seeded, answers = seed(users, questions, attempts, rng)
+    recorder = Recorder()
+    scanned_before = rows_scanned()
+    started = time.perf_counter()
+
+    if workers <= 1:
+        for user in seeded:
+            drive(user, answers, rounds, recorder, random.Random(rng.random()))
+    else:
+        batches = [seeded[index::workers] for index in range(workers)]
+
+        def work(batch, worker_rng):
+            for user in batch:
+                drive(user, answers, rounds, recorder, worker_rng)
+
+        threads = [
+            threading.Thread(target=work, args=(batch, random.Random(rng.random())))
+            for batch in batches if batch
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    elapsed = time.perf_counter() - started
+    scanned_after = rows_scanned()
+    endpoints = recorder.report()
+    total = sum(endpoint['requests'] for endpoint in endpoints.values())
+    scanned = None if scanned_before is None else scanned_after - scanned_before
+    return {
+        'config': {
+            'users': users, 'questions': questions, 'attempts': attempts,
+            'rounds': rounds, 'workers': workers, 'seed': seed_value,
+        },
+        'database': connection.vendor,
+        'elapsed_s': round(elapsed, 3),
+        'requests': total,
+        'requests_per_s': round(total / elapsed, 2) if elapsed else None,
+        'rows_scanned': scanned,
+        'rows_scanned_per_request': round(scanned / total, 2) if scanned is not None and total else None,
+        'endpoints': endpoints,
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark next_question -> check_answer -> practice_status on a scratch database; prints JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help='Bench users to seed (default: 20).')
+        parser.add_argument('--questions', type=int, default=2000, help='SAT questions to seed (default: 2000).')
+        parser.add_argument('--attempts', type=int, default=200,
+                            help='Prior attempts seeded per user (default: 200).')
+        parser.add_argument('--rounds', type=int, default=25,
+                            help='Practice loops driven per user (default: 25).')
+        parser.add_argument('--workers', type=int, default=1, help='Concurrent client threads (default: 1).')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for a repeatable bank.')
+        parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            report = run_benchmark(
+                options['users'], options['questions'], options['attempts'],
+                options['rounds'], options['workers'], options['seed'],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        text = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(text + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}."))
+        else:
+            self.stdout.write(text)
@@ -0,0 +1,34 @@
+"""
+Expire abandoned duel searches and finish battles whose clock ran out
+without anyone calling end_match (see api.room_reaper). Safe to run from
+cron at any interval; the match view only expires searches and the
+caller's own battle, so this is what settles everyone else's.
+
+    python manage.py reap_rooms
+    python manage.py reap_rooms --dry-run
+    python manage.py reap_rooms --limit 500
+"""
+from django.core.management.base import BaseCommand
+
+from api.room_reaper import overdue_battles, reap, stale_searching
+
+
+class Command(BaseCommand):
+    help = "Delete stale Searching rooms and settle overdue Battling rooms."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Settle at most this many overdue battles (default: all).')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only count what would be reaped.')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            searching = stale_searching().count()
+            battles = len(overdue_battles(limit=options['limit']))
+            self.stdout.write(f"Would expire {searching} stale search(es) and settle {battles} overdue battle(s).")
+            return
+        expired, settled = reap(limit=options['limit'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {expired} stale search(es); settled {settled} overdue battle(s)."
+        ))
@@ -0,0 +1,35 @@
+"""
+Recompute the PracticeDay rollup (quota, week strip, activity grid) from the
+attempt log, bucketing into each user's CURRENT profile timezone. Run after
+timezone changes or hand edits to PracticeAttempt.
+
+    python manage.py rebuild_practice_days                  # every practising user
+    python manage.py rebuild_practice_days --user alice bob
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from api.models import DEFAULT_TEST_PREP, PracticeAttempt
+from api.views.practice_views import rebuild_practice_days
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-day practice rollups from PracticeAttempt in each user's timezone."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', nargs='+', dest='usernames',
+                            help='Only rebuild these usernames.')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(
+            id__in=PracticeAttempt.objects.filter(test_prep_id=DEFAULT_TEST_PREP).values('user_id'),
+        ).select_related('profile')
+        if options['usernames']:
+            users = users.filter(username__in=options['usernames'])
+
+        rebuilt = 0
+        for user in users.iterator():
+            days = rebuild_practice_days(user)
+            rebuilt += 1
+            self.stdout.write(f"  - {user.username}: {days} day(s)")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} user(s)."))
@@ -0,0 +1,124 @@
+"""Rating-banded duel matchmaking.
+
+Searching rooms are the queue: each one records its opener's duel rating and
+rating bucket, under a partial index on (test_prep, search_bucket, created_at)
+that covers Searching rooms only. A new searcher
+looks at the oldest open rooms in the buckets it could ever accept and takes
+the closest one whose allowed gap — which widens the longer that room has
+waited — covers the difference. The candidates are read without locks and
+claimed one at a time: the chosen room alone is locked with SELECT ... SKIP
+LOCKED where the database has it, then seated with Room.start's
+compare-and-swap. A searcher that finds its room locked or already taken
+moves on to the next candidate, so a rush of searchers spreads over
+different rooms instead of queueing on one row lock.
+
+ponytail: two searchers who were too far apart when they arrived never merge
+later; the bot fallback in get_room_status picks them up. Merge waiting rooms
+if human-vs-human rates ever matter more than wait time.
+"""
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models import Room, TestPrepUserStats
+
+RATING_BUCKET = 100
+BASE_GAP = 150
+GAP_PER_SECOND = 25
+MAX_GAP = 600
+CANDIDATE_LIMIT = 20
+# get_room_status hands a waiting room to a bot by this age at the latest.
+BOT_FALLBACK_SECONDS = 10
+ARRIVAL_WINDOW_SECONDS = 10 * 60
+
+
+def bucket_of(rating):
+    return rating // RATING_BUCKET
+
+
+def allowed_gap(waited_seconds):
+    """Rating difference a room accepts after waiting this long."""
+    return min(MAX_GAP, BASE_GAP + GAP_PER_SECOND * max(0.0, waited_seconds))
+
+
+def duel_rating(user, test_prep):
+    return TestPrepUserStats.for_user(user, test_prep).duel_elo
+
+
+def _candidates(user, test_prep, rating):
+    return (
+        Room.objects.filter(test_prep_id=test_prep, status='Searching', user2__isnull=True)
+        .filter(
+            Q(search_bucket__range=(bucket_of(rating - MAX_GAP), bucket_of(rating + MAX_GAP)))
+            | Q(search_bucket__isnull=True)
+        )
+        .exclude(user1=user)
+        .order_by('created_at', 'id')[:CANDIDATE_LIMIT]
+    )
+
+
+def _eligible(rooms, rating, now):
+    """Rooms whose current gap covers `rating`, closest first, then oldest."""
+    fits = []
+    for room in rooms:
+        # Rooms opened without a rating (older clients, admin) accept anyone.
+        gap = 0 if room.search_rating is None else abs(room.search_rating - rating)
+        if gap <= allowed_gap((now - room.created_at).total_seconds()):
+            fits.append((gap, room.created_at, room.id, room))
+    return [room for *_, room in sorted(fits, key=lambda fit: fit[:3])]
+
+
+def _lock_candidate(room):
+    """Lock this one room for the claim; False when another searcher holds it.
+
+    Without SKIP LOCKED (SQLite) there is nothing to take; Room.start's
+    compare-and-swap settles the race on its own.
+    """
+    if not connection.features.has_select_for_update_skip_locked:
+        return True
+    return (
+        Room.objects.filter(pk=room.pk, status='Searching', user2__isnull=True)
+        .select_for_update(skip_locked=True).values_list('pk', flat=True).first()
+    ) is not None
+
+
+def claim_opponent(user, test_prep, rating):
+    """Seat `user` as user2 in the best open room; returns it or None.
+
+    Candidates are read without locks; only the room being claimed is
+    locked (held until the caller's transaction commits), so concurrent
+    searchers skip that one room rather than the whole candidate page.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        for room in _eligible(list(_candidates(user, test_prep, rating)), rating, now):
+            if _lock_candidate(room) and room.start(user):
+                return room
+    return None
+
+
+def expected_wait(test_prep, rating, now=None):
+    """Seconds until someone in range is likely to show up, from recent arrivals."""
+    now = now or timezone.now()
+    arrivals = Room.objects.filter(
+        test_prep_id=test_prep,
+        created_at__gte=now - timezone.timedelta(seconds=ARRIVAL_WINDOW_SECONDS),
+        search_bucket__range=(bucket_of(rating - MAX_GAP), bucket_of(rating + MAX_GAP)),
+    ).count()
+    if not arrivals:
+        return float(BOT_FALLBACK_SECONDS)
+    return round(min(ARRIVAL_WINDOW_SECONDS / arrivals, BOT_FALLBACK_SECONDS), 1)
+
+
+def find_match(user, test_prep):
+    """Join the best waiting room or open one. Returns (room, matched, expected_wait)."""
+    rating = duel_rating(user, test_prep)
+    room = claim_opponent(user, test_prep, rating)
+    if room is not None:
+        return room, True, 0.0
+    wait = expected_wait(test_prep, rating)
+    room = Room.objects.create(
+        user1=user, status='Searching', test_prep_id=test_prep,
+        search_rating=rating, search_bucket=bucket_of(rating),
+    )
+    return room, False, wait
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:03
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0088_premium_tests_and_party_emotes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='practice_state_version',
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+    ]
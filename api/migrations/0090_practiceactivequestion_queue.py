@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0089_profile_practice_state_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='practiceactivequestion',
+            options={'ordering': ['position']},
+        ),
+        migrations.RemoveConstraint(
+            model_name='practiceactivequestion',
+            name='unique_active_question_per_test_lane',
+        ),
+        migrations.AddField(
+            model_name='practiceactivequestion',
+            name='position',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='practiceactivequestion',
+            name='reserved_elo',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='practiceactivequestion',
+            constraint=models.UniqueConstraint(fields=('user', 'test_prep', 'lane', 'position'), name='unique_active_question_per_lane_slot'),
+        ),
+    ]
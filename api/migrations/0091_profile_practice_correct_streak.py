@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0090_practiceactivequestion_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='practice_correct_streak',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0091_profile_practice_correct_streak'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PracticeDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('answered', models.IntegerField(default=0)),
+                ('english', models.IntegerField(default=0)),
+                ('math', models.IntegerField(default=0)),
+                ('test_prep', models.ForeignKey(default='sat', on_delete=django.db.models.deletion.CASCADE, related_name='practice_days', to='api.testprep')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='practice_days', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'test_prep', 'date'), name='unique_practice_day_per_test')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Seed the PracticeDay rollup from the PracticeAttempt log, bucketing every
+# attempt into its user's local day with the profile timezone as of now (the
+# same rule the old recounting code applied). Later timezone changes are
+# handled by `manage.py rebuild_practice_days`.
+
+import pytz
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    PracticeAttempt = apps.get_model('api', 'PracticeAttempt')
+    PracticeDay = apps.get_model('api', 'PracticeDay')
+    Profile = apps.get_model('api', 'Profile')
+
+    zones = {}
+    for user_id, name in Profile.objects.values_list('user_id', 'timezone'):
+        try:
+            zones[user_id] = pytz.timezone(name)
+        except Exception:
+            zones[user_id] = pytz.UTC
+
+    days = {}
+    for user_id, test_prep_id, stamp, subject in (
+        PracticeAttempt.objects
+        .values_list('user_id', 'test_prep_id', 'created_at', 'subject')
+        .iterator(chunk_size=2000)
+    ):
+        local_date = stamp.astimezone(zones.get(user_id, pytz.UTC)).date()
+        day = days.setdefault((user_id, test_prep_id, local_date), {'answered': 0, 'english': 0, 'math': 0})
+        day['answered'] += 1
+        if subject in ('english', 'math'):
+            day[subject] += 1
+
+    PracticeDay.objects.all().delete()
+    PracticeDay.objects.bulk_create(
+        [
+            PracticeDay(user_id=user_id, test_prep_id=test_prep_id, date=date, **counts)
+            for (user_id, test_prep_id, date), counts in days.items()
+        ],
+        batch_size=500,
+    )
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0092_practiceday'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, noop),
+    ]
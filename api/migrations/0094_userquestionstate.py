@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0093_backfill_practice_days'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserQuestionState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_attempt_at', models.DateTimeField()),
+                ('last_correct', models.BooleanField()),
+                ('attempts', models.PositiveIntegerField(default=1)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_states', to='api.question')),
+                ('test_prep', models.ForeignKey(default='sat', on_delete=django.db.models.deletion.CASCADE, related_name='question_states', to='api.testprep')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'test_prep', 'question'), name='unique_question_state_per_user_test')],
+            },
+        ),
+    ]
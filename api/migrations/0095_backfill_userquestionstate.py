@@ -0,0 +1,56 @@
+# Seed UserQuestionState from the PracticeAttempt log: one row per
+# (user, test prep, question) with the first attempt time, the number of
+# recorded attempts, and whether the most recent one was correct.
+
+from django.db import migrations
+from django.db.models import Count, Min, OuterRef, Subquery
+
+
+def backfill(apps, schema_editor):
+    PracticeAttempt = apps.get_model('api', 'PracticeAttempt')
+    UserQuestionState = apps.get_model('api', 'UserQuestionState')
+
+    latest_correct = (
+        PracticeAttempt.objects
+        .filter(
+            user_id=OuterRef('user_id'),
+            test_prep_id=OuterRef('test_prep_id'),
+            question_id=OuterRef('question_id'),
+        )
+        .order_by('-created_at', '-id')
+        .values('correct')[:1]
+    )
+    rows = (
+        PracticeAttempt.objects
+        .values('user_id', 'test_prep_id', 'question_id')
+        .annotate(
+            first_attempt_at=Min('created_at'),
+            attempts=Count('id'),
+            last_correct=Subquery(latest_correct),
+        )
+        .order_by()
+    )
+
+    UserQuestionState.objects.all().delete()
+    batch = []
+    for row in rows.iterator(chunk_size=2000):
+        batch.append(UserQuestionState(**row))
+        if len(batch) >= 500:
+            UserQuestionState.objects.bulk_create(batch)
+            batch = []
+    UserQuestionState.objects.bulk_create(batch)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0094_userquestionstate'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, noop),
+    ]
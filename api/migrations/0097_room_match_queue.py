@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0096_questionbank'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='search_bucket',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='search_rating',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['test_prep', 'status', 'search_bucket'], name='api_room_test_pr_6fae90_idx'),
+        ),
+    ]
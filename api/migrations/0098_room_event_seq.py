@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0097_room_match_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='event_seq',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0098_room_event_seq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='bot_timeline',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0099_room_bot_timeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='result',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
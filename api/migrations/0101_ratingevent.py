@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:21
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0100_room_result'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('duel', 'Duel'), ('practice', 'Practice')], max_length=10)),
+                ('subject', models.CharField(blank=True, default='', max_length=32)),
+                ('rating', models.IntegerField()),
+                ('delta', models.IntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('test_prep', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_events', to='api.testprep')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'test_prep', 'created_at'], name='api_ratinge_user_id_81e73f_idx')],
+            },
+        ),
+    ]
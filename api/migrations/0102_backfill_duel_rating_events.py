@@ -0,0 +1,50 @@
+# Seed RatingEvent from ended duels: one 'duel' row per player per settled
+# room, stamped with the room's creation time. Practice rating history was
+# never recorded, so practice series start with the first answer after this.
+
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    Room = apps.get_model('api', 'Room')
+    RatingEvent = apps.get_model('api', 'RatingEvent')
+
+    rooms = (
+        Room.objects
+        .filter(status='Ended', user2__isnull=False, user1_elo_after__isnull=False)
+        .values_list(
+            'test_prep_id', 'created_at',
+            'user1_id', 'user1_elo_before', 'user1_elo_after',
+            'user2_id', 'user2_elo_before', 'user2_elo_after',
+        )
+        .order_by('id')
+    )
+    RatingEvent.objects.filter(kind='duel').delete()
+    batch = []
+    for test_prep, created_at, *players in rooms.iterator(chunk_size=2000):
+        for user_id, before, after in (players[:3], players[3:]):
+            if before is None or after is None:
+                continue
+            batch.append(RatingEvent(
+                user_id=user_id, test_prep_id=test_prep, kind='duel',
+                rating=after, delta=after - before, created_at=created_at,
+            ))
+        if len(batch) >= 500:
+            RatingEvent.objects.bulk_create(batch)
+            batch = []
+    RatingEvent.objects.bulk_create(batch)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0101_ratingevent'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0102_backfill_duel_rating_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='room',
+            name='api_room_test_pr_6fae90_idx',
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(condition=models.Q(('status', 'Searching')), fields=['test_prep', 'search_bucket', 'created_at'], name='room_searching_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(condition=models.Q(('status__in', ('Searching', 'Battling'))), fields=['user1'], name='room_live_user1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(condition=models.Q(('status__in', ('Searching', 'Battling'))), fields=['user2'], name='room_live_user2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(condition=models.Q(('status__in', ('Searching', 'Battling'))), fields=['status', 'created_at'], name='room_live_created_idx'),
+        ),
+    ]
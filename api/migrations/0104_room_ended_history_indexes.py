@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0103_room_live_partial_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(condition=models.Q(('status', 'Ended')), fields=['user1', 'test_prep', '-created_at', '-id'], name='room_ended_user1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(condition=models.Q(('status', 'Ended')), fields=['user2', 'test_prep', '-created_at', '-id'], name='room_ended_user2_idx'),
+        ),
+    ]
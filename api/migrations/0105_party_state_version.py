@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0104_room_ended_history_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partyplayer',
+            name='state_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='partyroom',
+            name='phase_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='partyroom',
+            name='state_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
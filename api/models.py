@@ -1,6 +1,6 @@
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 import math
 import random
@@ -40,6 +40,13 @@ def usable_duel_emotes(profile):
 # =========================================================
 
 DEFAULT_TEST_PREP = 'sat'
+# SAT duels and the public random-question endpoint draw from these types.
+DEFAULT_DUEL_QUESTION_TYPES = (
+    'Cross-Text Connections', 'Text Structure and Purpose', 'Words in Context',
+    'Rhetorical Synthesis', 'Transitions', 'Central Ideas and Details',
+    'Command of Evidence', 'Inferences', 'Boundaries', 'Form, Structure, and Sense',
+)
+DUEL_QUESTION_COUNT = 10
 
 
 class TestPrep(models.Model):
@@ -151,18 +158,10 @@ class Question(models.Model):
 
     @classmethod
     def get_random_questions(self, num_questions, test_prep=DEFAULT_TEST_PREP):
-        default_question_types = [
-            'Cross-Text Connections', 'Text Structure and Purpose', 'Words in Context',
-            'Rhetorical Synthesis', 'Transitions', 'Central Ideas and Details',
-            'Command of Evidence', 'Inferences', 'Boundaries', 'Form, Structure, and Sense'
-        ]
-        questions = self.objects.filter(test_prep_id=test_prep)
-        if test_prep == DEFAULT_TEST_PREP:
-            questions = questions.filter(question_type__in=default_question_types)
-        questions = list(questions)
-        if num_questions > len(questions):
-            num_questions = len(questions)
-        return random.sample(questions, num_questions)
+        from api.question_bank import draw_question_ids
+        ids = draw_question_ids(num_questions, test_prep)
+        questions = self.objects.in_bulk(ids)
+        return [questions[question_id] for question_id in ids if question_id in questions]
 
 
 class QuestionReport(models.Model):
@@ -198,6 +197,18 @@ class Announcement(models.Model):
         return self.message[:80] or 'Site announcement'
 
 
+class QuestionBank(models.Model):
+    """Singleton stamp for caches derived from the question bank (type
+    totals, the practice rating index, serialized payloads). Any change to
+    Question rows rotates `version`; see api.question_bank."""
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1, editable=False)
+    version = models.UUIDField(default=uuid.uuid4)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'Question bank {self.version}'
+
+
 # =========================================================
 # User Profile and Statistics Models
 # =========================================================
@@ -289,6 +300,9 @@ class Profile(models.Model):
     is_bot = models.BooleanField(default=False, db_index=True)
     duel_emotes = models.JSONField(default=default_duel_emotes)
     max_streak = models.IntegerField(default=0)
+    # Running practice correct-answer streak; reset by a wrong recorded
+    # answer. max_streak is its best-ever value.
+    practice_correct_streak = models.IntegerField(default=0)
     active_test_prep = models.ForeignKey(
         TestPrep, on_delete=models.PROTECT, related_name='active_profiles', default=DEFAULT_TEST_PREP,
     )
@@ -327,6 +341,10 @@ class Profile(models.Model):
     practice_streak = models.IntegerField(default=0)
     longest_practice_streak = models.IntegerField(default=0)
     last_practice_completed = models.DateField(null=True, blank=True)
+    # Cache stamp for the practice picker's bitmaps (api.practice_state).
+    # Rotated rather than incremented so a recycled user id can never read
+    # another account's cached state.
+    practice_state_version = models.UUIDField(default=uuid.uuid4, editable=False)
 
     @property
     def has_premium(self):
@@ -484,23 +502,31 @@ class PracticeActiveQuestion(models.Model):
     subject's random mix ('english:any' / 'math:any') or a specific question
     type for premium topic drills, so switching lanes and back resumes the
     same question instead of letting it be skipped. Rows are deleted when the
-    question is answered, so the table only holds open questions."""
+    question is answered, so the table only holds open questions.
+
+    With lookahead a lane holds an ordered queue: the lowest `position` is the
+    current question and the rest are reservations served ahead of time.
+    `reserved_elo` is the user's rating when a row was picked, so reservations
+    can be re-ranked once the rating drifts away from it."""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='practice_active_questions')
     test_prep = models.ForeignKey(
         TestPrep, on_delete=models.CASCADE, related_name='active_questions', default=DEFAULT_TEST_PREP,
     )
     lane = models.CharField(max_length=128)
+    position = models.PositiveIntegerField(default=0)
     question = models.ForeignKey('api.Question', on_delete=models.CASCADE, related_name='+')
+    reserved_elo = models.IntegerField(null=True, blank=True)
 
     class Meta:
+        ordering = ['position']
         constraints = [
             models.UniqueConstraint(
-                fields=['user', 'test_prep', 'lane'], name='unique_active_question_per_test_lane',
+                fields=['user', 'test_prep', 'lane', 'position'], name='unique_active_question_per_lane_slot',
             ),
         ]
 
     def __str__(self):
-        return f"{self.user.username} [{self.lane}] -> Q{self.question_id}"
+        return f"{self.user.username} [{self.lane}#{self.position}] -> Q{self.question_id}"
 
 
 class UserStatistics(models.Model):
@@ -560,6 +586,28 @@ class TestPrepUserStats(models.Model):
             Profile.objects.filter(user_id=self.user_id).update(elo_rating=self.duel_elo)
 
 
+class RatingEvent(models.Model):
+    """Append-only log of rating changes, one row per change, for rating
+    charts. Duel rows are written by Room.end_battle, practice rows (one
+    series per subject) by answer_practice_question."""
+    KIND_CHOICES = [('duel', 'Duel'), ('practice', 'Practice')]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='rating_events')
+    test_prep = models.ForeignKey(TestPrep, on_delete=models.CASCADE, related_name='rating_events')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    subject = models.CharField(max_length=32, blank=True, default='')
+    rating = models.IntegerField()
+    delta = models.IntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'test_prep', 'created_at'])]
+
+    def __str__(self):
+        series = self.subject or self.kind
+        return f'{self.user_id} {self.test_prep_id} {series}: {self.rating} ({self.delta:+d})'
+
+
 
 class SurvivalStatistics(models.Model):
     """Tracks user's survival mode performance."""
@@ -631,6 +679,14 @@ class TournamentQuestion(models.Model):
         return f"{self.participation.user.username} - Q{self.question.id} - {self.status} - {self.time_taken}"
 
 
+LIVE_ROOM_STATUSES = ('Searching', 'Battling')
+
+
+def _mark_bots_idle(*user_ids):
+    from api.bot_duels import mark_bots_idle
+    mark_bots_idle(*user_ids)
+
+
 class Room(models.Model):
     """Represents a battle room between two users."""
     user1 = models.ForeignKey(User, related_name='room_user1', on_delete=models.CASCADE)
@@ -651,6 +707,49 @@ class Room(models.Model):
     user1_elo_after = models.IntegerField(null=True, blank=True)
     user2_elo_before = models.IntegerField(null=True, blank=True)
     user2_elo_after = models.IntegerField(null=True, blank=True)
+    # Matchmaking queue key (api.matchmaking): the searcher's duel rating when
+    # the room opened and its rating bucket. Null on rooms opened elsewhere.
+    search_rating = models.IntegerField(null=True, blank=True)
+    search_bucket = models.IntegerField(null=True, blank=True)
+    # Bumped with every event a live client cares about (answers, emotes,
+    # transitions); the duel event streams poll it (api.duel_events).
+    event_seq = models.PositiveIntegerField(default=0)
+    # Bot opponent's answers as [seconds after battle start, correct 0/1] in
+    # tracked-question order, drawn from a seeded RNG when the bot is seated
+    # (Room.start, api.bot_duels).
+    bot_timeline = models.JSONField(null=True, blank=True)
+    # Immutable result document written by end_battle (api.duel_results);
+    # get_results and match history serve it as-is.
+    result = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        # Partial indexes over the live rooms only, so matchmaking, rejoin
+        # and the bot idle check scale with active rooms, not history.
+        indexes = [
+            models.Index(
+                fields=['test_prep', 'search_bucket', 'created_at'],
+                condition=models.Q(status='Searching'), name='room_searching_queue_idx',
+            ),
+            models.Index(
+                fields=['user1'], condition=models.Q(status__in=LIVE_ROOM_STATUSES), name='room_live_user1_idx',
+            ),
+            models.Index(
+                fields=['user2'], condition=models.Q(status__in=LIVE_ROOM_STATUSES), name='room_live_user2_idx',
+            ),
+            models.Index(
+                fields=['status', 'created_at'],
+                condition=models.Q(status__in=LIVE_ROOM_STATUSES), name='room_live_created_idx',
+            ),
+            # Keyset ranges for match history, one per seat.
+            models.Index(
+                fields=['user1', 'test_prep', '-created_at', '-id'],
+                condition=models.Q(status='Ended'), name='room_ended_user1_idx',
+            ),
+            models.Index(
+                fields=['user2', 'test_prep', '-created_at', '-id'],
+                condition=models.Q(status='Ended'), name='room_ended_user2_idx',
+            ),
+        ]
 
     def is_full(self):
         return self.user2 is not None
@@ -663,7 +762,67 @@ class Room(models.Model):
     def __str__(self):
         return f"Room {self.id} by {self.user1.username} and {self.user2.username if self.user2 else 'empty'}"
 
+    # Status transitions are conditional UPDATEs that report whether this
+    # caller won them; only the winner runs the side effects. save() is a
+    # plain write and never deals questions or settles Elo.
+
+    def start(self, opponent, idle_only=False):
+        """Searching -> Battling with `opponent` seated; deals the questions.
+
+        With idle_only the swap also fails while `opponent` is in another
+        active room (bot rivals, see api.bot_duels.claim_bot).
+        """
+        rooms = Room.objects.filter(pk=self.pk, status='Searching', user2__isnull=True)
+        if idle_only:
+            rooms = rooms.exclude(models.Exists(
+                Room.objects.filter(status__in=LIVE_ROOM_STATUSES)
+                .filter(models.Q(user1=opponent) | models.Q(user2=opponent))
+            ))
+        won = rooms.update(user2=opponent, status='Battling', event_seq=models.F('event_seq') + 1)
+        if not won:
+            return False
+        self.user2 = opponent
+        self.status = 'Battling'
+        self.deal_questions()
+        if opponent.profile.is_bot:
+            from api.bot_duels import store_bot_timeline  # bot_duels imports the models
+            store_bot_timeline(self, opponent)
+        return True
+
+    def start_clock(self, now=None):
+        """Stamp battle_start_time once; returns the stamp that stuck."""
+        now = now or timezone.now()
+        if Room.objects.filter(pk=self.pk, battle_start_time__isnull=True).update(
+            battle_start_time=now, event_seq=models.F('event_seq') + 1,
+        ):
+            self.battle_start_time = now
+        else:
+            self.battle_start_time = Room.objects.values_list('battle_start_time', flat=True).get(pk=self.pk)
+        return self.battle_start_time
+
+    def finish(self, user1_score, user2_score):
+        """Battling -> Ended with final scores; the winner settles Elo."""
+        with transaction.atomic():
+            won = Room.objects.filter(pk=self.pk, status='Battling').update(
+                status='Ended', user1_score=user1_score, user2_score=user2_score,
+                event_seq=models.F('event_seq') + 1,
+            )
+            if not won:
+                return False
+            self.status = 'Ended'
+            self.user1_score = user1_score
+            self.user2_score = user2_score
+            self.end_battle()
+        _mark_bots_idle(self.user1_id, self.user2_id)
+        return True
+
+    def cancel(self):
+        """Drop a room nobody has joined yet; False once it has been matched."""
+        deleted, _ = Room.objects.filter(pk=self.pk, status='Searching', user2__isnull=True).delete()
+        return bool(deleted)
+
     def end_battle(self):
+        """Settle an ended room: winner, both players' Elo and the result document. Called by finish()."""
         if not self.user2:
             return
 
@@ -685,8 +844,6 @@ class Room(models.Model):
         user2_start = user2_stats.duel_elo
         self.user1_elo_before = user1_start
         self.user2_elo_before = user2_start
-        self.status = 'Ended'
-        self.save()
 
         user1_stats.update_elo(user2_start, result_user1)
         user2_stats.update_elo(user1_start, result_user2)
@@ -699,34 +856,48 @@ class Room(models.Model):
                     profile.save(update_fields=['elo_rating'])
         self.user1_elo_after = user1_stats.duel_elo
         self.user2_elo_after = user2_stats.duel_elo
+        now = timezone.now()
+        RatingEvent.objects.bulk_create([
+            RatingEvent(
+                user_id=user_id, test_prep_id=self.test_prep_id, kind='duel',
+                rating=after, delta=after - before, created_at=now,
+            )
+            for user_id, before, after in (
+                (self.user1_id, self.user1_elo_before, self.user1_elo_after),
+                (self.user2_id, self.user2_elo_before, self.user2_elo_after),
+            )
+        ])
+        from api.duel_results import build_result
+        self.result = build_result(self)
         Room.objects.filter(pk=self.pk).update(
+            winner=self.winner,
+            user1_elo_before=self.user1_elo_before,
+            user2_elo_before=self.user2_elo_before,
             user1_elo_after=self.user1_elo_after,
             user2_elo_after=self.user2_elo_after,
+            result=self.result,
         )
 
-    def save(self, *args, **kwargs):
-        previous_status = None
-        if self.pk:
-            previous_status = Room.objects.filter(pk=self.pk).values_list('status', flat=True).first()
-
-        super().save(*args, **kwargs)
-        if self.status == 'Ended' and previous_status != 'Ended':
-            self.end_battle()
-        if not self.questions.exists() and self.user1 and self.user2:
-            self.questions.set(Question.get_random_questions(10, self.test_prep_id))
-            for question in self.questions.all():
-                TrackedQuestion.objects.create(
-                    user=self.user1,
-                    room=self,
-                    question=question,
-                    status="Blank"
-                )
-                TrackedQuestion.objects.create(
-                    user=self.user2,
-                    room=self,
-                    question=question,
-                    status="Blank"
-                )
+    def deal_questions(self, count=DUEL_QUESTION_COUNT):
+        """Draw the room's questions and both players' TrackedQuestion rows, once."""
+        from api.question_bank import draw_question_ids
+        if self.questions.exists():
+            return
+        with transaction.atomic():
+            # Concurrent callers queue on the row lock; the second one then
+            # sees the first one's questions.
+            list(Room.objects.select_for_update().filter(pk=self.pk).values_list('pk'))
+            if self.questions.exists():
+                return
+            ids = draw_question_ids(count, self.test_prep_id)
+            Room.questions.through.objects.bulk_create([
+                Room.questions.through(room_id=self.pk, question_id=question_id) for question_id in ids
+            ])
+            TrackedQuestion.objects.bulk_create([
+                TrackedQuestion(user_id=user_id, room_id=self.pk, question_id=question_id, status='Blank')
+                for user_id in (self.user1_id, self.user2_id)
+                for question_id in ids
+            ])
 
 
 class TrackedQuestion(models.Model):
@@ -838,8 +1009,8 @@ class OnlineUser(models.Model):
 class PracticeAttempt(models.Model):
     """One infinite-practice answer submission.
 
-    The source of truth for the daily free-tier quota and for "only the first
-    attempt at a question moves Elo".
+    The source of truth for "only the first attempt at a question moves Elo"
+    and for the PracticeDay rollup behind the daily free-tier quota.
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='practice_attempts')
     test_prep = models.ForeignKey(
@@ -868,6 +1039,63 @@ class PracticeAttempt(models.Model):
         return f"{self.user.username} - Q{self.question_id} - {'✓' if self.correct else '✗'}"
 
 
+class UserQuestionState(models.Model):
+    """Latest recorded result per (user, question): the denormalized view of
+    PracticeAttempt that the review filters and the first-attempt rule read.
+
+    The answer pipeline inserts the row as its first write, so the unique
+    constraint is also what decides which of two racing submissions counts.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='question_states')
+    test_prep = models.ForeignKey(
+        TestPrep, on_delete=models.CASCADE, related_name='question_states', default=DEFAULT_TEST_PREP,
+    )
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='user_states')
+    first_attempt_at = models.DateTimeField()
+    last_correct = models.BooleanField()
+    # Recorded attempts. Only first attempts are recorded now, so this is 1
+    # except for history from before that rule.
+    attempts = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'test_prep', 'question'], name='unique_question_state_per_user_test',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - Q{self.question_id} - {'✓' if self.last_correct else '✗'}"
+
+
+class PracticeDay(models.Model):
+    """Practice answers per user per LOCAL calendar day.
+
+    Rollup of PracticeAttempt kept by the answer pipeline, bucketed with the
+    profile timezone at write time, so the quota, week strip and activity grid
+    read a few rows instead of recounting attempts. After a timezone change
+    or hand-edited attempts, `manage.py rebuild_practice_days` recomputes it.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='practice_days')
+    test_prep = models.ForeignKey(
+        TestPrep, on_delete=models.CASCADE, related_name='practice_days', default=DEFAULT_TEST_PREP,
+    )
+    date = models.DateField()
+    answered = models.IntegerField(default=0)
+    english = models.IntegerField(default=0)
+    math = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'test_prep', 'date'], name='unique_practice_day_per_test',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} {self.date}: {self.answered}"
+
+
 class PracticeTestResult(models.Model):
     """A completed full-length/diagnostic practice test.
 
@@ -1202,10 +1430,46 @@ class PartyRoom(models.Model):
     current_index = models.IntegerField(default=0)
     phase_started_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped by every mutation a poller can see (bump_state). `phase_version`
+    # is the last room-wide change (phase, question, settings, host, seating)
+    # that a per-player delta can't express; party_state serves full state to
+    # clients that are behind it.
+    state_version = models.PositiveIntegerField(default=0)
+    phase_version = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"Party {self.code} by {self.host.username} ({self.status})"
 
+    def bump_state(self, players=(), room_wide=False):
+        """Record a visible change; stamps the changed seats with the new version.
+
+        With the hot-state engine on, a room-wide change first writes the
+        cached seats back, and a seat change in a hot room is versioned in
+        the cache instead (party_engine.bump).
+        """
+        from api import party_engine  # party_engine imports the models
+        if party_engine.enabled():
+            if room_wide:
+                party_engine.flush(self)
+            else:
+                version = party_engine.bump(self, players)
+                if version is not None:
+                    return version
+        with transaction.atomic():
+            version = PartyRoom.objects.select_for_update().values_list('state_version', flat=True).get(pk=self.pk) + 1
+            changes = {'state_version': version}
+            if room_wide:
+                changes['phase_version'] = version
+            PartyRoom.objects.filter(pk=self.pk).update(**changes)
+            if players:
+                PartyPlayer.objects.filter(pk__in=[player.pk for player in players]).update(state_version=version)
+        self.state_version = version
+        if room_wide:
+            self.phase_version = version
+        for player in players:
+            player.state_version = version
+        return version
+
     def current_question_id(self):
         if 0 <= self.current_index < len(self.question_ids):
             return self.question_ids[self.current_index]
@@ -1228,6 +1492,16 @@ class PartyRoom(models.Model):
         """True while the room is on the Final Jeopardy betting question."""
         return self.mode == 'jeopardy' and self.is_final_question()
 
+    def roster(self):
+        """Every seat with its user and profile, cached heartbeats and hot-state seats applied.
+
+        Load it once per request and pass it down: advance() and the helpers
+        below all take it, and change the seats in it in place.
+        """
+        from api import party_engine, party_presence  # both import the models
+        players = list(self.players.select_related('user__profile'))
+        return party_presence.overlay(self, party_engine.overlay(self, players))
+
     def survivors(self, players=None):
         """Players still holding at least one heart."""
         roster = self.players.all() if players is None else players
@@ -1241,43 +1515,42 @@ class PartyRoom(models.Model):
         """
         return self.mode == 'survival' and self.last_standing
 
-    def charge_survival_timeouts(self):
+    def charge_survival_timeouts(self, players=None):
         """Take a heart from anyone still alive who let the clock run out.
 
         Sitting a question out has to cost the same as answering it wrong,
         or waiting the timer out becomes a way to dodge the risk.
         """
         key = str(self.current_index)
-        for player in self.survivors():
-            if key in player.answers:
-                continue
+        charged = [player for player in self.survivors(players) if key not in player.answers]
+        for player in charged:
             player.answers[key] = {'choice': None, 'correct': False, 'points': 0, 'life_lost': True}
             player.lives -= 1
-            player.save(update_fields=['answers', 'lives'])
+        PartyPlayer.objects.bulk_update(charged, ['answers', 'lives'])
 
-    def survival_is_over(self):
+    def survival_is_over(self, players=None):
         """Last-one-standing ends as soon as the field is down to one player."""
-        return self.mode == 'survival' and self.last_standing and len(self.survivors()) <= 1
+        return self.mode == 'survival' and self.last_standing and len(self.survivors(players)) <= 1
 
-    def game_is_over(self):
-        return self.is_final_question() or self.survival_is_over()
+    def game_is_over(self, players=None):
+        return self.is_final_question() or self.survival_is_over(players)
 
-    def settle_unplayed_wagers(self):
+    def settle_unplayed_wagers(self, players=None):
         """Charge bets to anyone who let the final question time out.
 
         Without this, sitting the question out would be strictly safer than
         answering it, which defeats the whole point of betting.
         """
         key = str(self.current_index)
-        for player in self.players.all():
-            if key in player.answers or not player.wager:
-                continue
+        roster = self.players.all() if players is None else players
+        charged = [player for player in roster if key not in player.answers and player.wager]
+        for player in charged:
             player.answers[key] = {
                 'choice': None, 'correct': False,
                 'points': -player.wager, 'wager': player.wager,
             }
             player.score -= player.wager
-            player.save(update_fields=['answers', 'score'])
+        PartyPlayer.objects.bulk_update(charged, ['answers', 'score'])
 
     def team_label(self, index):
         names = self.team_names or []
@@ -1305,34 +1578,61 @@ class PartyRoom(models.Model):
             counts[target] += 1
             player.save(update_fields=['team'])
 
-    def sync_presence(self):
+    def sync_presence(self, roster=None):
         """Reconcile the room with players who left without saying goodbye.
 
-        Polling is our only presence signal, so this runs on every state read:
-        stale lobby seats are freed, a vanished host hands the room to the
-        longest-seated active player, and a room with nobody left is closed so
-        its join code stops matching.
+        Polling is our only presence signal (heartbeats, see party_presence),
+        so this runs on every state read: stale lobby seats are freed, a
+        vanished host hands the room to the longest-seated active player, and
+        a room with nobody left is closed so its join code stops matching.
         """
         if self.status == 'finished':
             return
         cutoff = timezone.now() - timezone.timedelta(seconds=PARTY_PRESENCE_TIMEOUT_SECONDS)
-        players = list(self.players.order_by('id'))
+        players = self.roster() if roster is None else roster
         active = [p for p in players if p.last_seen >= cutoff]
         if not active:
             self.status = 'finished'
             self.save(update_fields=['status'])
+            self.bump_state(room_wide=True)
             return
+        changed = False
         if self.status == 'lobby':
             # Mid-game seats survive a dropout (scores may still podium);
             # lobby seats don't, so the player count stays honest.
-            self.players.filter(last_seen__lt=cutoff).delete()
+            stale = [p.pk for p in players if p.last_seen < cutoff]
+            changed = bool(stale) and self.players.filter(pk__in=stale).delete()[0] > 0
+            players[:] = [p for p in players if p.pk not in stale]
         if all(p.user_id != self.host_id for p in active):
             self.host = active[0].user
             self.save(update_fields=['host'])
+            changed = True
+        if changed:
+            self.bump_state(room_wide=True)
+
+    def advance(self, roster=None):
+        """Move the room forward when the current phase has expired.
 
-    def advance(self):
-        """Move the room forward when the current phase has expired."""
-        self.sync_presence()
+        `roster` (from roster()) saves the helpers a fetch of their own; it
+        is kept in step with the seats this changes or removes.
+        """
+        from api import party_engine
+        roster = self.roster() if roster is None else roster
+        self.sync_presence(roster)
+        status = self.status
+        with party_engine.phase_lock(self) as held:
+            if held:
+                self._advance_phase(party_engine.overlay(self, roster))
+        if self.status != status:
+            self.bump_state(room_wide=True)
+
+    def _end_hot_phase(self):
+        """Write the engine's cached seats back before their phase ends (under phase_lock)."""
+        from api import party_engine
+        if party_engine.enabled():
+            party_engine.flush_locked(self)
+
+    def _advance_phase(self, players):
         now = timezone.now()
         if self.status == 'countdown':
             ends = self.phase_started_at + timezone.timedelta(seconds=PARTY_COUNTDOWN_SECONDS)
@@ -1343,14 +1643,15 @@ class PartyRoom(models.Model):
                 self.save(update_fields=['status', 'phase_started_at'])
         if self.status == 'playing':
             if now >= self.game_deadline():
+                self._end_hot_phase()
                 self.status = 'finished'
                 self.save(update_fields=['status'])
         if self.status == 'wager':
             cutoff = now - timezone.timedelta(seconds=PARTY_ACTIVE_WINDOW_SECONDS)
-            players = list(self.players.all())
             active = [p for p in players if p.last_seen >= cutoff] or players
             # A player with nothing to bet has nothing to decide, so they never block.
             if now >= self.wager_deadline() or all(p.wager_locked or p.score <= 0 for p in active):
+                self._end_hot_phase()
                 self.status = 'question'
                 self.phase_started_at = now
                 self.save(update_fields=['status', 'phase_started_at'])
@@ -1358,17 +1659,17 @@ class PartyRoom(models.Model):
         if self.status == 'question':
             key = str(self.current_index)
             cutoff = now - timezone.timedelta(seconds=PARTY_ACTIVE_WINDOW_SECONDS)
-            players = list(self.players.all())
             active = [p for p in players if p.last_seen >= cutoff] or players
             if self.eliminates():
                 # Knocked-out players are spectators — they can't answer, so
                 # they must not hold the room open either.
                 active = [p for p in active if p.lives > 0] or active
             if now >= self.question_deadline() or all(key in p.answers for p in active):
+                self._end_hot_phase()
                 if self.is_wager_question():
-                    self.settle_unplayed_wagers()
+                    self.settle_unplayed_wagers(players)
                 if self.mode == 'survival':
-                    self.charge_survival_timeouts()
+                    self.charge_survival_timeouts(players)
                 self.status = 'leaderboard'
                 self.phase_started_at = now
                 self.save(update_fields=['status', 'phase_started_at'])
@@ -1394,6 +1695,7 @@ class PartyPlayer(models.Model):
     gq_locked_until = models.DateTimeField(null=True, blank=True)  # 3s wrong-answer penalty
     gq_pending = models.JSONField(null=True, blank=True)  # {'kind': 'chest'|'wrong', ...}
     last_seen = models.DateTimeField(auto_now=True)
+    state_version = models.PositiveIntegerField(default=0)  # room.state_version of this seat's last change
 
     class Meta:
         ordering = ['id']
@@ -1414,14 +1716,25 @@ class PartyPlayer(models.Model):
             self.save(update_fields=['gq_deck', 'gq_index'])
         return self.gq_deck[self.gq_index]
 
-    def gold_rush_tick(self):
+    def next_gold_question(self):
+        """Step to the next Gold Rush question, reshuffling the deck after a lap."""
+        self.gq_index += 1
+        if self.gq_index >= len(self.gq_deck):
+            random.shuffle(self.gq_deck)
+            self.gq_index = 0
+
+    def gold_rush_tick(self, save=True):
         """Clear an expired wrong-answer lockout and move to the next question.
 
         Runs on every state read, so a player self-heals to their next question
-        a second after the 3s penalty ends without needing a button.
+        a second after the 3s penalty ends without needing a button. Returns
+        whether it moved.
         """
         if self.gq_locked_until and timezone.now() >= self.gq_locked_until:
             self.gq_locked_until = None
             self.gq_pending = None
-            self.gq_index += 1
-            self.save(update_fields=['gq_locked_until', 'gq_pending', 'gq_index'])
+            self.next_gold_question()
+            if save:
+                self.save(update_fields=['gq_locked_until', 'gq_pending', 'gq_deck', 'gq_index'])
+            return True
+        return False
@@ -0,0 +1,260 @@
+"""Optional cache-backed hot state for live party rooms (settings.PARTY_HOT_STATE).
+
+With the engine off, every answer, bet and Gold Rush move holds the PartyRoom
+row (select_for_update) for its whole request, so a room's players queue on
+one database lock. With it on, the seats of a room in a playing phase
+(question, wager, Gold Rush `playing`) live in one cache entry per room:
+moves run against that entry under a per-room cache lock (cache.add), and
+reads overlay it onto the PartyPlayer rows. The entry is written back in one
+bulk_update when its phase ends (PartyRoom._advance_phase) and before any
+room-wide change (bump_state), so the lobby, leaderboards, results and
+history keep reading plain rows.
+
+Loading an entry reserves VERSION_BLOCK state versions on the room row, and
+moves count through that block inside the entry. The row therefore always
+stays ahead of every version handed out from the cache, and an entry that is
+lost and reloaded never reuses one.
+
+The cache has to be shared by every worker that serves the room; locmem is
+enough for one worker and for tests.
+
+ponytail: an evicted entry loses the moves made since the last phase
+boundary. Size the cache for the live rooms, or leave the engine off.
+"""
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from api.models import PartyPlayer, PartyRoom
+
+HOT_STATUSES = ('question', 'wager', 'playing')
+# What a move can change on a seat; everything else stays on the row.
+SEAT_FIELDS = (
+    'score', 'lives', 'wager', 'wager_locked', 'answers',
+    'gq_deck', 'gq_index', 'gq_locked_until', 'gq_pending', 'state_version',
+)
+PHASE_FIELDS = ['status', 'current_index', 'phase_started_at']
+VERSION_BLOCK = 1000
+ENTRY_TTL_SECONDS = 2 * 60 * 60
+LOCK_TTL_SECONDS = 5
+LOCK_WAIT_SECONDS = 2
+LOCK_POLL_SECONDS = 0.005
+
+
+class RoomBusy(Exception):
+    """The room's cache lock could not be taken in LOCK_WAIT_SECONDS."""
+
+
+def enabled():
+    return settings.PARTY_HOT_STATE
+
+
+def _entry_key(room_id):
+    return f'party:hot:{room_id}'
+
+
+def _lock_key(room_id):
+    return f'party:hot-lock:{room_id}'
+
+
+def _phase(room):
+    return (room.status, room.current_index)
+
+
+def _acquire(room_id):
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + LOCK_WAIT_SECONDS
+    while not cache.add(_lock_key(room_id), token, LOCK_TTL_SECONDS):
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(LOCK_POLL_SECONDS)
+    return token
+
+
+def _release(room_id, token):
+    if cache.get(_lock_key(room_id)) == token:
+        cache.delete(_lock_key(room_id))
+
+
+@contextmanager
+def room_lock(room_id):
+    token = _acquire(room_id)
+    if token is None:
+        raise RoomBusy(room_id)
+    try:
+        yield
+    finally:
+        _release(room_id, token)
+
+
+@contextmanager
+def phase_lock(room):
+    """Hold a hot room while advance() decides whether its phase is over.
+
+    Yields whether the caller may advance: False means another request holds
+    the room, and that request advances it instead. The room's phase fields
+    are re-read under the lock, since a transition may have just committed.
+    """
+    if not enabled() or room.status not in HOT_STATUSES:
+        yield True
+        return
+    token = _acquire(room.pk)
+    if token is None:
+        yield False
+        return
+    try:
+        room.refresh_from_db(fields=PHASE_FIELDS)
+        yield True
+    finally:
+        _release(room.pk, token)
+
+
+def _seat(player):
+    return {'id': player.pk, **{field: getattr(player, field) for field in SEAT_FIELDS}}
+
+
+def _copy(entry, players):
+    for player in players:
+        seat = entry['seats'].get(player.user_id)
+        if seat is not None:
+            for field in SEAT_FIELDS:
+                setattr(player, field, seat[field])
+
+
+def _reserve(room_id):
+    """Claim the next VERSION_BLOCK versions on the row; returns the block's ceiling."""
+    PartyRoom.objects.filter(pk=room_id).update(state_version=F('state_version') + VERSION_BLOCK)
+    return PartyRoom.objects.values_list('state_version', flat=True).get(pk=room_id)
+
+
+def _load(room):
+    ceiling = _reserve(room.pk)
+    return {
+        'phase': _phase(room),
+        'version': ceiling - VERSION_BLOCK,
+        'ceiling': ceiling,
+        'seats': {player.user_id: _seat(player) for player in PartyPlayer.objects.filter(room=room)},
+    }
+
+
+def _entry(room, load=False):
+    """The room's entry for its current phase; loaded from the rows if asked."""
+    if room.status not in HOT_STATUSES:
+        return None
+    entry = cache.get(_entry_key(room.pk))
+    if entry is not None and entry['phase'] == _phase(room):
+        return entry
+    if not load:
+        return None
+    entry = _load(room)
+    cache.set(_entry_key(room.pk), entry, ENTRY_TTL_SECONDS)
+    return entry
+
+
+def _next_version(room, entry):
+    if entry['version'] >= entry['ceiling']:
+        entry['ceiling'] = _reserve(room.pk)
+        entry['version'] = entry['ceiling'] - VERSION_BLOCK
+    entry['version'] += 1
+    return entry['version']
+
+
+def _store(room, entry, players):
+    version = _next_version(room, entry)
+    for player in players:
+        player.state_version = version
+        entry['seats'][player.user_id] = _seat(player)
+    cache.set(_entry_key(room.pk), entry, ENTRY_TTL_SECONDS)
+    return version
+
+
+def overlay(room, players):
+    """Copy the room's hot seats onto loaded PartyPlayer rows, in place."""
+    if enabled():
+        entry = _entry(room)
+        if entry is not None:
+            _copy(entry, players)
+    return players
+
+
+def version(room):
+    """The room's current state version, counting moves still in the cache."""
+    entry = _entry(room) if enabled() else None
+    return room.state_version if entry is None else entry['version']
+
+
+def apply(room, player, action):
+    """Run one move against the hot seats, under the room's cache lock.
+
+    `action(room, player, seat)` is the view's move: `seat(user_id)` loads
+    another player's seat the same way, and it returns (data, status,
+    changed seats). The changed seats are stored together under one new
+    version. Returns (data, status).
+    """
+    with room_lock(room.pk):
+        room.refresh_from_db(fields=PHASE_FIELDS)
+        entry = _entry(room, load=True)
+        if entry is not None:
+            _copy(entry, [player])
+
+        def seat(user_id):
+            other = room.players.select_related('user').filter(user_id=user_id).first()
+            if other is not None and entry is not None:
+                _copy(entry, [other])
+            return other
+
+        data, status, changed = action(room, player, seat)
+        if changed and entry is not None:
+            _store(room, entry, changed)
+            return data, status
+    # Moves only change seats in hot phases; anything else goes to the rows.
+    for other in changed:
+        other.save(update_fields=SEAT_FIELDS)
+    if changed:
+        room.bump_state(players=changed)
+    return data, status
+
+
+def bump(room, players=()):
+    """bump_state for a hot room: version the change in the cache entry.
+
+    Returns the new version, or None when the room has no entry and the
+    change belongs on the row.
+    """
+    if room.status not in HOT_STATUSES or cache.get(_entry_key(room.pk)) is None:
+        return None
+    with room_lock(room.pk):
+        entry = _entry(room)
+        if entry is None:
+            return None
+        version = _next_version(room, entry)
+        for player in players:
+            # A seat the entry doesn't know yet (a mid-game join) comes from its row.
+            seat = entry['seats'].setdefault(player.user_id, _seat(player))
+            seat['state_version'] = player.state_version = version
+        cache.set(_entry_key(room.pk), entry, ENTRY_TTL_SECONDS)
+        return version
+
+
+def flush_locked(room):
+    """Write the room's entry back to its rows and drop it; the caller holds the room."""
+    entry = cache.get(_entry_key(room.pk))
+    if entry is None:
+        return
+    PartyPlayer.objects.bulk_update(
+        [PartyPlayer(pk=seat['id'], **{field: seat[field] for field in SEAT_FIELDS}) for seat in entry['seats'].values()],
+        SEAT_FIELDS,
+    )
+    cache.delete(_entry_key(room.pk))
+
+
+def flush(room):
+    """Write the room's entry back before a room-wide change."""
+    if cache.get(_entry_key(room.pk)) is None:
+        return
+    with room_lock(room.pk):
+        flush_locked(room)
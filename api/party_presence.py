@@ -0,0 +1,51 @@
+"""Party presence: who is still polling a room.
+
+Every party_state poll is a heartbeat. Heartbeats land in the cache, one key
+per seat, and the PartyPlayer.last_seen column is written at most once per
+HEARTBEAT_WRITE_SECONDS per seat (a cache.add throttle), so a live room costs
+one UPDATE per player every few seconds instead of one per poll. Readers
+(sync_presence, host handoff, the "everyone answered" checks) take the later
+of the cached heartbeat and the column: a lost cache entry falls back to a
+column at most HEARTBEAT_WRITE_SECONDS old, which is still inside
+PARTY_ACTIVE_WINDOW_SECONDS.
+"""
+from django.core.cache import cache
+from django.utils import timezone
+
+from api.models import PartyPlayer
+
+HEARTBEAT_WRITE_SECONDS = 10
+SEEN_TTL_SECONDS = 5 * 60  # well past PARTY_PRESENCE_TIMEOUT_SECONDS
+
+
+def _key(room_id, user_id):
+    return f'party:seen:{room_id}:{user_id}'
+
+
+def _written_key(room_id, user_id):
+    return f'party:seen-written:{room_id}:{user_id}'
+
+
+def heartbeat(player, now=None):
+    """Record that `player` polled; writes the row only when it is due."""
+    now = now or timezone.now()
+    cache.set(_key(player.room_id, player.user_id), now, SEEN_TTL_SECONDS)
+    if cache.add(_written_key(player.room_id, player.user_id), True, HEARTBEAT_WRITE_SECONDS):
+        PartyPlayer.objects.filter(pk=player.pk).update(last_seen=now)
+    player.last_seen = now
+
+
+def forget(room_id, user_id):
+    """Drop a seat's cached heartbeat (leave_party ages the row itself)."""
+    cache.delete(_key(room_id, user_id))
+
+
+def overlay(room, players):
+    """Set each loaded seat's last_seen to its latest heartbeat, cached or stored."""
+    keys = {player.user_id: _key(room.pk, player.user_id) for player in players}
+    seen = cache.get_many(keys.values())
+    for player in players:
+        cached = seen.get(keys[player.user_id])
+        if cached is not None and cached > player.last_seen:
+            player.last_seen = cached
+    return players
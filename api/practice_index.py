@@ -0,0 +1,193 @@
+"""In-process rating index over the practice bank.
+
+The adaptive picker wants "a random unanswered question within N points of the
+user's rating" and used to answer it with up to four widening id queries. This
+index keeps `(subject, question_type, difficulty) -> sorted [(rating, id)]`
+buckets in memory so a window is two bisects per bucket, and a pick samples
+positions inside the window, skipping ids the caller rejects (the user's
+attempted bitmap) instead of materializing the window.
+
+Each gunicorn worker holds its own copy. The practice answer pipeline nudges
+the local copy when a question's rating moves. Bank edits rotate the question
+bank version (api.question_bank), and every worker rebuilds once it sees the
+new version; rating moves served by other workers are picked up on the
+PRACTICE_INDEX_TTL rebuild. Callers must treat an id from the index as a hint
+and verify it.
+"""
+import bisect
+import random
+import threading
+import time
+
+from api.models import DEFAULT_TEST_PREP, Question
+from api.question_bank import bank_version
+
+PRACTICE_INDEX_TTL = 5 * 60
+RATING_WINDOWS = (250, 500, 1000, None)
+# Random probes per window before falling back to walking it from a random
+# offset. Fresh users accept nearly every probe; only heavy users need the walk.
+SAMPLE_TRIES = 16
+
+
+class RatingIndex:
+    def __init__(self, rows):
+        self.buckets = {}  # (subject, question_type, difficulty) -> sorted [(rating, id)]
+        self.located = {}  # id -> (bucket key, rating)
+        for question_id, subject, question_type, difficulty, rating in rows:
+            key = (subject, question_type, difficulty)
+            self.buckets.setdefault(key, []).append((rating, question_id))
+            self.located[question_id] = (key, rating)
+        for bucket in self.buckets.values():
+            bucket.sort()
+
+    def keys_for(self, subject, types, levels):
+        """Bucket keys matching a subject, a type list and (optional) levels."""
+        types = set(types)
+        return {
+            key for key in self.buckets
+            if key[0] == subject and key[1] in types and (not levels or key[2] in levels)
+        }
+
+    def in_keys(self, question_id, keys):
+        located = self.located.get(question_id)
+        return located is not None and located[0] in keys
+
+    def size(self, keys):
+        return sum(len(self.buckets[key]) for key in keys)
+
+    # Writers copy a bucket and swap it in, so a picker walking the old list
+    # on another thread never sees it shrink underneath it.
+
+    def move(self, question_id, rating):
+        """Re-slot a question after its rating changed."""
+        located = self.located.get(question_id)
+        if located is None:
+            return
+        key, previous = located
+        bucket = self._without(key, (previous, question_id))
+        bisect.insort(bucket, (rating, question_id))
+        self.buckets[key] = bucket
+        self.located[question_id] = (key, rating)
+
+    def _without(self, key, entry):
+        bucket = list(self.buckets[key])
+        position = bisect.bisect_left(bucket, entry)
+        if position < len(bucket) and bucket[position] == entry:
+            del bucket[position]
+        return bucket
+
+    @staticmethod
+    def _ranges(buckets, low, high):
+        """{key: (start, stop)} positions of each bucket inside [low, high]."""
+        ranges = {}
+        for key, bucket in buckets.items():
+            start = 0 if low is None else bisect.bisect_left(bucket, (low, -1))
+            stop = len(bucket) if high is None else bisect.bisect_right(bucket, (high, float('inf')))
+            if stop > start:
+                ranges[key] = (start, stop)
+        return ranges
+
+    def sample_near(self, keys, rating, accept):
+        """Random accepted id, widening the window around `rating` until one fits.
+
+        Each window only looks at the positions the narrower ones did not
+        cover (those were all rejected): SAMPLE_TRIES random probes, then a
+        walk from a random offset that stops at the first accepted id. The
+        walks of one pick visit each position at most once, and a heavy user
+        pays for the run of answered questions before the first fresh one,
+        not for the window.
+        """
+        buckets = {key: self.buckets[key] for key in keys}  # one snapshot; writers swap lists
+        covered = {}
+        for window in RATING_WINDOWS:
+            low = None if window is None else rating - window
+            high = None if window is None else rating + window
+            ranges = self._ranges(buckets, low, high)
+            segments = []
+            for key, (start, stop) in ranges.items():
+                seen_start, seen_stop = covered.get(key, (start, start))
+                segments += [(buckets[key], start, seen_start), (buckets[key], seen_stop, stop)]
+            segments = [segment for segment in segments if segment[2] > segment[1]]
+            covered = ranges
+            total = sum(stop - start for _, start, stop in segments)
+            if not total:
+                continue
+            for _ in range(min(SAMPLE_TRIES, total)):
+                question_id = _at(segments, random.randrange(total))
+                if accept(question_id):
+                    return question_id
+            for question_id in _walk(segments, random.randrange(total)):
+                if accept(question_id):
+                    return question_id
+        return None
+
+
+def _at(segments, offset):
+    """The id `offset` positions into the segments, taken end to end."""
+    for bucket, start, stop in segments:
+        if offset < stop - start:
+            return bucket[start + offset][1]
+        offset -= stop - start
+
+
+def _walk(segments, first):
+    """Every id in the segments once, from offset `first`, wrapping around."""
+    for index, (bucket, start, stop) in enumerate(segments):
+        if first < stop - start:
+            break
+        first -= stop - start
+    pivot = start + first
+    ordered = [(bucket, pivot, stop), *segments[index + 1:], *segments[:index], (bucket, start, pivot)]
+    for part, part_start, part_stop in ordered:
+        for position in range(part_start, part_stop):
+            yield part[position][1]
+
+
+_lock = threading.Lock()
+_index = None
+_built_at = 0.0
+_built_version = None
+
+
+def _build():
+    return RatingIndex(
+        Question.objects.filter(test_prep_id=DEFAULT_TEST_PREP)
+        .values_list('id', 'subject', 'question_type', 'difficulty', 'sp_elo_rating')
+        .iterator()
+    )
+
+
+def _fresh(index, version):
+    return (
+        index is not None
+        and _built_version == version
+        and time.monotonic() - _built_at < PRACTICE_INDEX_TTL
+    )
+
+
+def get_practice_index():
+    global _index, _built_at, _built_version
+    version = bank_version()
+    index = _index
+    if _fresh(index, version):
+        return index
+    with _lock:
+        if not _fresh(_index, version):
+            _index = _build()
+            _built_at = time.monotonic()
+            _built_version = version
+        return _index
+
+
+def invalidate_practice_index():
+    global _index
+    _index = None
+
+
+def note_question_rating(question_id, rating):
+    """Keep this worker's index in step with a rating it just wrote."""
+    index = _index
+    if index is None:
+        return
+    with _lock:
+        index.move(question_id, rating)
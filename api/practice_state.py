@@ -0,0 +1,153 @@
+"""Per-user practice state as question-id bitmaps.
+
+The practice picker needs four facts about every question a user has touched:
+attempted, saved, and whether the latest recorded attempt was right or wrong.
+Each of those is kept as a Python int used as a bitset over the question-id
+space (bit n set means question n), so the filter bar's combinations are plain
+`&`/`|` on four integers instead of NOT IN (...) lists rebuilt every request.
+
+Entries live in the Django cache keyed by Profile.practice_state_version.
+Writers (the practice answer pipeline and the saved-question endpoints) rotate
+that version and write the updated bitmaps through, so the answer -> next loop
+stays warm. A writer that loses a race rotates the version without writing, and the
+next read simply rebuilds from the database.
+
+ponytail: only those writers stamp the version. Anything else that adds or
+removes attempts/saves (admin, shell, a future bulk tool) must call
+invalidate_practice_state, or the user sees stale filters for up to the TTL.
+Question deletes are harmless: the picker only ever tests ids the bank returns.
+"""
+import uuid
+
+from django.core.cache import cache
+
+from api.models import DEFAULT_TEST_PREP, Profile, SavedQuestion, UserQuestionState
+
+PRACTICE_STATE_TTL = 60 * 60
+
+
+def bit(question_id):
+    return 1 << question_id
+
+
+def has(bitmap, question_id):
+    return bool(bitmap >> question_id & 1)
+
+
+def bitmap_ids(bitmap):
+    """Question ids set in `bitmap`, ascending."""
+    bits = bin(bitmap)[:1:-1]  # least significant bit first, without '0b'
+    ids = []
+    index = bits.find('1')
+    while index != -1:
+        ids.append(index)
+        index = bits.find('1', index + 1)
+    return ids
+
+
+class PracticeState:
+    """The four bitmaps for one user. `correct`/`incorrect` reflect the latest
+    recorded (first-time) attempt, so they are disjoint subsets of `attempted`."""
+    __slots__ = ('attempted', 'saved', 'correct', 'incorrect')
+
+    def __init__(self, attempted=0, saved=0, correct=0, incorrect=0):
+        self.attempted = attempted
+        self.saved = saved
+        self.correct = correct
+        self.incorrect = incorrect
+
+    def record_answer(self, question_id, correct):
+        mask = bit(question_id)
+        self.attempted |= mask
+        if correct:
+            self.correct |= mask
+            self.incorrect &= ~mask
+        else:
+            self.incorrect |= mask
+            self.correct &= ~mask
+
+    def set_saved(self, question_id, saved):
+        if saved:
+            self.saved |= bit(question_id)
+        else:
+            self.saved &= ~bit(question_id)
+
+    def masks(self, filters, review):
+        """Resolve the attempted/result filters to (require, forbid) bitmaps.
+
+        `require` is None when nothing narrows the pool to known ids; otherwise
+        a question must be in it. A question in `forbid` is always excluded.
+        The saved filter is applied by the caller, since it also decides the
+        'no_questions' empty state.
+        """
+        if not review:
+            # Fresh pool — practice never recycles a question the student has answered.
+            return None, self.attempted
+        if filters['result'] == 'correct':
+            return self.correct, 0
+        if filters['result'] == 'incorrect':
+            return self.incorrect, 0
+        return self.attempted, 0
+
+
+def _cache_key(user_id, version):
+    return f'practice-state:{user_id}:{version}'
+
+
+def build_practice_state(user):
+    """Rebuild a user's bitmaps from their question states and saved list."""
+    state = PracticeState()
+    for question_id, last_correct in UserQuestionState.objects.filter(
+        user=user, test_prep_id=DEFAULT_TEST_PREP,
+    ).values_list('question_id', 'last_correct'):
+        state.record_answer(question_id, last_correct)
+    for question_id in SavedQuestion.objects.filter(
+        user=user, test_prep_id=DEFAULT_TEST_PREP,
+    ).values_list('question_id', flat=True):
+        state.set_saved(question_id, True)
+    return state
+
+
+def load_practice_state(user):
+    profile = getattr(user, 'profile', None)
+    if profile is None:
+        return build_practice_state(user)
+    key = _cache_key(user.id, profile.practice_state_version)
+    state = cache.get(key)
+    if state is None:
+        state = build_practice_state(user)
+        cache.set(key, state, PRACTICE_STATE_TTL)
+    return state
+
+
+def _rotate(user, mutate):
+    """Rotate the user's state version, writing `mutate`d bitmaps through."""
+    profile = getattr(user, 'profile', None)
+    if profile is None:
+        return
+    previous = profile.practice_state_version
+    state = cache.get(_cache_key(user.id, previous))
+    version = uuid.uuid4()
+    won = Profile.objects.filter(
+        pk=profile.pk, practice_state_version=previous,
+    ).update(practice_state_version=version)
+    if not won:
+        # Another request moved the version first; our cached copy may be
+        # missing its change, so leave the new version cold.
+        Profile.objects.filter(pk=profile.pk).update(practice_state_version=version)
+    elif state is not None and mutate is not None:
+        mutate(state)
+        cache.set(_cache_key(user.id, version), state, PRACTICE_STATE_TTL)
+    profile.practice_state_version = version
+
+
+def invalidate_practice_state(user):
+    _rotate(user, None)
+
+
+def note_practice_answer(user, question_id, correct):
+    _rotate(user, lambda state: state.record_answer(question_id, correct))
+
+
+def note_saved(user, question_id, saved):
+    _rotate(user, lambda state: state.set_saved(question_id, saved))
@@ -0,0 +1,141 @@
+"""Question-bank version stamp and the caches keyed by it.
+
+The bank only changes when admins create, edit, import or delete questions,
+yet practice reads aggregates over it on every answer. Every such write
+rotates QuestionBank.version (signals cover save/delete, bulk edits call
+bump_bank_version themselves), and derived data is cached under the version
+it was computed from, so a bump makes every old entry unreachable at once.
+
+The version is a UUID rather than a counter for the same reason as
+Profile.practice_state_version: a rolled-back bump can never hand a later
+bump the same number and, with it, a stale cache entry.
+
+With a per-worker cache (locmem, the default without REDIS_URL) the
+version itself is cached for BANK_VERSION_TTL seconds, which bounds how long
+another worker can serve pre-edit data. Practice answers move ratings with update() and do not bump;
+nothing cached here includes a rating.
+"""
+import random
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from api.models import DEFAULT_DUEL_QUESTION_TYPES, DEFAULT_TEST_PREP, Question, QuestionBank
+from api.views.serializers import QuestionSerializer
+
+BANK_VERSION_KEY = 'question-bank:version'
+BANK_VERSION_TTL = 10
+TYPE_TOTALS_TTL = 24 * 60 * 60
+DECK_TTL = 24 * 60 * 60
+PAYLOAD_TTL = 24 * 60 * 60
+REVIEW_FIELDS = ('answer', 'answer_text', 'explanation')
+
+
+def bank_version():
+    version = cache.get(BANK_VERSION_KEY)
+    if version is None:
+        bank, _ = QuestionBank.objects.get_or_create(pk=1)
+        version = bank.version.hex
+        cache.set(BANK_VERSION_KEY, version, BANK_VERSION_TTL)
+    return version
+
+
+def bump_bank_version():
+    version = uuid.uuid4()
+    if not QuestionBank.objects.filter(pk=1).update(version=version):
+        QuestionBank.objects.update_or_create(pk=1, defaults={'version': version})
+    # Drop the cached stamp now and again once the edit is visible, so a
+    # read between the two can't pin the pre-edit version here for the TTL.
+    cache.delete(BANK_VERSION_KEY)
+    transaction.on_commit(lambda: cache.delete(BANK_VERSION_KEY))
+
+
+def type_totals():
+    """{question_type: number of SAT questions}, cached per bank version."""
+    key = f'question-bank:type-totals:{bank_version()}'
+    totals = cache.get(key)
+    if totals is None:
+        totals = {
+            row['question_type']: row['total']
+            for row in Question.objects.filter(test_prep_id=DEFAULT_TEST_PREP)
+            .values('question_type').annotate(total=Count('id')).order_by()
+        }
+        cache.set(key, totals, TYPE_TOTALS_TTL)
+    return totals
+
+
+def question_deck(test_prep):
+    """Ids eligible for duels and random draws in a test prep, cached per bank version."""
+    key = f'question-bank:deck:{test_prep}:{bank_version()}'
+    deck = cache.get(key)
+    if deck is None:
+        questions = Question.objects.filter(test_prep_id=test_prep)
+        if test_prep == DEFAULT_TEST_PREP:
+            questions = questions.filter(question_type__in=DEFAULT_DUEL_QUESTION_TYPES)
+        deck = list(questions.order_by('id').values_list('id', flat=True))
+        cache.set(key, deck, DECK_TTL)
+    return deck
+
+
+def draw_question_ids(count, test_prep=DEFAULT_TEST_PREP):
+    """Up to `count` distinct random question ids from the deck.
+
+    Another worker's deck can trail a deletion by BANK_VERSION_TTL, so the
+    draw is checked against the table before anyone inserts a foreign key.
+    """
+    deck = question_deck(test_prep)
+    drawn = random.sample(deck, min(count, len(deck)))
+    live = set(Question.objects.filter(id__in=drawn).values_list('id', flat=True))
+    return [question_id for question_id in drawn if question_id in live]
+
+
+def _payload_entry(question):
+    return {
+        'public': dict(QuestionSerializer(question).data),
+        'review': {
+            'answer': question.answer,
+            'answer_text': question.answer_text,
+            'explanation': question.explanation or '',
+        },
+    }
+
+
+def payload_entries(question_ids):
+    """{id: {'public': ..., 'review': ...}} straight from the table, in one query.
+
+    For callers that keep a fixed set of questions cached on their own terms
+    (a Gold Rush room's pool); merge the halves with merge_entry.
+    """
+    return {question.id: _payload_entry(question) for question in Question.objects.filter(id__in=question_ids)}
+
+
+def merge_entry(entry, review=False):
+    return {**entry['public'], **entry['review']} if review else entry['public']
+
+
+def get_many(question_ids, review=False):
+    """{id: payload} for the given question ids, serialized once per bank version.
+
+    The public shape is exactly QuestionSerializer's, so it never carries the
+    answer. review=True adds REVIEW_FIELDS; only hand that to surfaces that
+    are allowed to reveal the answer. Missing ids are left out.
+    """
+    version = bank_version()
+    keys = {question_id: f'question-bank:payload:{version}:{question_id}' for question_id in question_ids}
+    cached = cache.get_many(keys.values())
+    entries = {question_id: cached[key] for question_id, key in keys.items() if key in cached}
+    missing = [question_id for question_id in keys if question_id not in entries]
+    if missing:
+        fresh = {
+            question.id: _payload_entry(question)
+            for question in Question.objects.filter(id__in=missing)
+        }
+        cache.set_many({keys[question_id]: entry for question_id, entry in fresh.items()}, PAYLOAD_TTL)
+        entries.update(fresh)
+    return {question_id: merge_entry(entry, review) for question_id, entry in entries.items()}
+
+
+def get_payload(question_id, review=False):
+    return get_many([question_id], review=review).get(question_id)
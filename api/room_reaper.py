@@ -0,0 +1,95 @@
+"""Expire abandoned duel rooms and settle battles nobody ended.
+
+A Searching room older than SEARCH_TTL_SECONDS was left by a closed tab
+(live searches get a bot within BOT_FALLBACK_SECONDS); those are deleted in
+bulk, like Room.cancel. A Battling room whose clock ran out more than
+BATTLE_GRACE_SECONDS ago — or whose clock never started at all — is
+finished as end_match would: bots' answers settled, scores counted, Elo
+applied.
+
+Runs from `python manage.py reap_rooms` (cron). The match view only does
+the cheap part in-request: at most once per SWEEP_INTERVAL_SECONDS per cache
+it deletes stale searches, and it finishes the caller's own overdue battle,
+which would otherwise block them. Other players' battles wait for the
+command.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from api.bot_duels import settle_bot
+from api.models import Room, TrackedQuestion
+
+SEARCH_TTL_SECONDS = 10 * 60
+BATTLE_GRACE_SECONDS = 2 * 60
+SWEEP_INTERVAL_SECONDS = 60
+SWEEP_KEY = 'rooms:reaper-sweep'
+
+
+def stale_searching(now=None):
+    now = now or timezone.now()
+    return Room.objects.filter(
+        status='Searching', user2__isnull=True,
+        created_at__lt=now - timedelta(seconds=SEARCH_TTL_SECONDS),
+    )
+
+
+def overdue_battles(now=None, limit=None, user=None):
+    """Battling rooms past their clock plus grace, oldest first; only `user`'s if given."""
+    now = now or timezone.now()
+    grace = timedelta(seconds=BATTLE_GRACE_SECONDS)
+    rooms = Room.objects.filter(status='Battling')
+    if user is not None:
+        rooms = rooms.filter(Q(user1=user) | Q(user2=user))
+    rooms = (
+        rooms
+        .filter(
+            Q(battle_start_time__lt=now - grace)
+            # The clock never started: nobody opened the battle page.
+            | Q(battle_start_time__isnull=True, created_at__lt=now - timedelta(seconds=SEARCH_TTL_SECONDS))
+        )
+        .select_related('user1__profile', 'user2__profile')
+        .order_by('created_at', 'id')
+    )
+    overdue = (
+        room for room in rooms.iterator()
+        if room.battle_start_time is None
+        or now > room.battle_start_time + timedelta(seconds=room.battle_duration) + grace
+    )
+    return [room for _, room in zip(range(limit), overdue)] if limit else list(overdue)
+
+
+def finish_room(room):
+    """Settle the bots' answers, count both scores, and finish the room."""
+    for player in (room.user1, room.user2):
+        if player is not None and player.profile.is_bot:
+            settle_bot(room, player)
+    scores = dict(
+        TrackedQuestion.objects.filter(room=room, status='Correct')
+        .values_list('user_id').annotate(correct=Count('id')).order_by()
+    )
+    return room.finish(scores.get(room.user1_id, 0), scores.get(room.user2_id, 0))
+
+
+def reap(now=None, limit=None):
+    """Expire stale searches and finish overdue battles; returns (expired, settled)."""
+    _, deleted = stale_searching(now).delete()
+    expired = deleted.get(Room._meta.label, 0)
+    settled = sum(finish_room(room) for room in overdue_battles(now, limit))
+    return expired, settled
+
+
+def sweep(user):
+    """In-request reaping for `user`'s match call; returns (expired, settled).
+
+    Stale searches go at most once per SWEEP_INTERVAL_SECONDS; of the overdue
+    battles only the caller's own is finished.
+    """
+    expired = 0
+    if cache.add(SWEEP_KEY, True, SWEEP_INTERVAL_SECONDS):
+        _, deleted = stale_searching().delete()
+        expired = deleted.get(Room._meta.label, 0)
+    settled = sum(finish_room(room) for room in overdue_battles(user=user))
+    return expired, settled
@@ -18,12 +18,13 @@ syncs when the value actually changed.
 import logging
 
 from allauth.account.signals import email_confirmed
-from django.db.models.signals import post_migrate, post_save, pre_save
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
 from django.dispatch import receiver
 
 from api.emails import send_welcome_email
 from api.marketing import marketing_sync_enabled, sync_marketing_contact
-from api.models import Profile, TestPrep, TestSection
+from api.models import Profile, Question, TestPrep, TestSection
+from api.question_bank import bump_bank_version
 
 logger = logging.getLogger(__name__)
 
@@ -113,3 +114,12 @@ def _welcome_on_email_confirmed(request, email_address, **kwargs):
     user = getattr(email_address, 'user', None)
     if user is not None and user.email:
         send_welcome_email(user)
+
+
+@receiver(post_save, sender=Question, dispatch_uid='question_bank_on_question_save')
+@receiver(post_delete, sender=Question, dispatch_uid='question_bank_on_question_delete')
+def _bump_question_bank(sender, instance, **kwargs):
+    # The practice answer pipeline writes ratings with update() and re-slots
+    # them itself, so this only fires for real bank edits (admin, API,
+    # generation imports). One bump per row; imports are rare enough.
+    bump_bank_version()
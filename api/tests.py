@@ -1,3 +1,4 @@
+from io import StringIO
 from unittest.mock import patch
 from datetime import date, timedelta
 from importlib import import_module
@@ -5,11 +6,12 @@ from types import SimpleNamespace
 
 from django.contrib.auth.models import User
 from django.core import mail
+from django.core.cache import cache
 from django.db import connection
 from django.test import override_settings, TransactionTestCase
 from django.urls import reverse
 from django.utils import timezone
-from rest_framework.test import APITestCase
+from rest_framework.test import APIClient, APITestCase
 
 from allauth.account.models import EmailAddress
 from api import generation
@@ -18,6 +20,7 @@ from api.models import (
     Profile, Question, QuestionReport, Room, SATExamDate, SavedQuestion, TrackedQuestion,
 )
 from api.views.auth_views import PendingRegistrationSerializer
+from api.views.practice_views import rebuild_practice_days
 from api.views.serializers import QuestionSerializer
 
 
@@ -1464,25 +1467,44 @@ class DuelEloTests(APITestCase):
         )
         room.questions.set([question])
 
-        room.status = 'Ended'
-        room.save()
+        self.assertTrue(room.finish(7, 3))
         room.refresh_from_db()
         profile1.refresh_from_db()
         profile2.refresh_from_db()
         first_elo1 = profile1.elo_rating
         first_elo2 = profile2.elo_rating
+        self.assertEqual((room.status, room.winner_id), ('Ended', user1.id))
         self.assertEqual((room.user1_elo_before, room.user2_elo_before), (1500, 1500))
         self.assertEqual((room.user1_elo_after, room.user2_elo_after), (first_elo1, first_elo2))
 
+        # A racing second end_match loses the transition and settles nothing.
+        stale = Room.objects.get(pk=room.pk)
+        stale.status = 'Battling'
+        self.assertFalse(stale.finish(3, 7))
         room.save()
         profile1.refresh_from_db()
         profile2.refresh_from_db()
         self.assertEqual(profile1.elo_rating, first_elo1)
         self.assertEqual(profile2.elo_rating, first_elo2)
 
+    def test_save_is_a_plain_write(self):
+        user1 = User.objects.create_user(username='plain1', email='p1@e.com')
+        user2 = User.objects.create_user(username='plain2', email='p2@e.com')
+        Profile.objects.create(user=user1)
+        Profile.objects.create(user=user2)
+        room = Room.objects.create(user1=user1, status='Searching')
+        with self.assertNumQueries(1):
+            room.save()
+        self.assertTrue(room.start(user2))
+        self.assertFalse(Room.objects.get(pk=room.pk).cancel())
+        self.assertFalse(room.start(user1))
+        with self.assertNumQueries(1):
+            room.save()
+
 
 class BotDuelTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(username='human_duelist', email='human@e.com')
         Profile.objects.create(user=self.user, elo_rating=1500)
         self.client.force_authenticate(user=self.user)
@@ -1505,7 +1527,8 @@ class BotDuelTests(APITestCase):
         )
 
     def _room(self, started_seconds_ago=0):
-        room = Room.objects.create(user1=self.user, user2=self._bot(), status='Battling')
+        room = Room.objects.create(user1=self.user, status='Searching')
+        room.start(self._bot())
         if started_seconds_ago:
             room.battle_start_time = timezone.now() - timedelta(seconds=started_seconds_ago)
             room.save(update_fields=['battle_start_time'])
@@ -1577,6 +1600,40 @@ class BotDuelTests(APITestCase):
         self.assertEqual(TrackedQuestion.objects.filter(room=room, user=self.user).count(), 10)
         self.assertEqual(TrackedQuestion.objects.filter(room=room, user=room.user2).count(), 10)
 
+    def test_bot_claims_skip_busy_bots_until_their_room_ends(self):
+        from api.bot_duels import available_bot_user, claim_bot
+        first = Room.objects.create(user1=self.user, status='Searching')
+        bot = claim_bot(first)
+        self.assertEqual(first.user2, bot)
+
+        other = User.objects.create_user(username='second_human', email='second@e.com')
+        Profile.objects.create(user=other)
+        second = Room.objects.create(user1=other, status='Searching')
+        with self.assertNumQueries(0):
+            self.assertNotEqual(available_bot_user(exclude_user=other), bot)
+
+        first.finish(0, 0)
+        self.assertEqual(available_bot_user(exclude_user=other), bot)
+        self.assertEqual(claim_bot(second), bot)
+
+    def test_bot_claims_skip_a_bot_busy_only_in_the_database(self):
+        from api.bot_duels import _idle_bot_users, available_bot_user, claim_bot
+        first = Room.objects.create(user1=self.user, status='Searching')
+        busy_bot = claim_bot(first)
+        cache.clear()  # another worker's cache, or a restart: the busy mark is gone
+
+        other = User.objects.create_user(username='second_human', email='second@e.com')
+        Profile.objects.create(user=other)
+        second = Room.objects.create(user1=other, status='Searching')
+        self.assertEqual(available_bot_user(exclude_user=other), busy_bot)
+        rival = claim_bot(second, exclude_user=other)
+
+        self.assertIsNotNone(rival)
+        self.assertNotEqual(rival, busy_bot)
+        second.refresh_from_db()
+        self.assertEqual(second.user2, rival)
+        self.assertNotIn(busy_bot, _idle_bot_users(exclude_user=other))
+
     def test_match_prioritizes_a_waiting_human(self):
         other = User.objects.create_user(username='waiting_human', email='waiting@e.com')
         Profile.objects.create(user=other, elo_rating=1600)
@@ -1588,31 +1645,136 @@ class BotDuelTests(APITestCase):
         self.assertEqual(response.data['full'], 'true')
         self.assertEqual(room.user2_id, self.user.id)
 
+    def test_match_pairs_the_closest_rating_the_room_will_accept(self):
+        near = User.objects.create_user(username='near_human', email='near@e.com')
+        Profile.objects.create(user=near, elo_rating=1550)
+        far = User.objects.create_user(username='far_human', email='far@e.com')
+        Profile.objects.create(user=far, elo_rating=2100)
+        far_room = Room.objects.create(user1=far, status='Searching', search_rating=2100, search_bucket=21)
+        near_room = Room.objects.create(user1=near, status='Searching', search_rating=1550, search_bucket=15)
+
+        response = self.client.get('/api/match/')
+        self.assertEqual(response.data, {'id': near_room.id, 'full': 'true'})
+        near_room.refresh_from_db()
+        self.assertEqual((near_room.status, near_room.user2_id), ('Battling', self.user.id))
+        self.assertEqual(TrackedQuestion.objects.filter(room=near_room, user=self.user).count(), 10)
+        far_room.refresh_from_db()
+        self.assertEqual(far_room.status, 'Searching')
+
+    def test_concurrent_searchers_each_claim_a_waiting_room(self):
+        from api import matchmaking
+        waiting = []
+        for name in ('first_waiter', 'second_waiter'):
+            user = User.objects.create_user(username=name, email=f'{name}@e.com')
+            Profile.objects.create(user=user, elo_rating=1500)
+            waiting.append(Room.objects.create(user1=user, status='Searching', search_rating=1500, search_bucket=15))
+        racer = User.objects.create_user(username='racer', email='racer@e.com')
+        Profile.objects.create(user=racer, elo_rating=1500)
+
+        # The racer's claim on the oldest room is still uncommitted (its row
+        # lock is held), so this searcher skips that one room only.
+        real_lock = matchmaking._lock_candidate
+        with patch('api.matchmaking._lock_candidate', side_effect=lambda room: room.pk != waiting[0].pk and real_lock(room)):
+            self.assertEqual(self.client.get('/api/match/').data, {'id': waiting[1].id, 'full': 'true'})
+        self.client.force_authenticate(user=racer)
+        self.assertEqual(self.client.get('/api/match/').data, {'id': waiting[0].id, 'full': 'true'})
+        self.assertFalse(Room.objects.filter(status='Searching').exists())
+
+    def test_match_widens_the_rating_gap_with_wait_time(self):
+        far = User.objects.create_user(username='patient_human', email='patient@e.com')
+        Profile.objects.create(user=far, elo_rating=1900)
+        room = Room.objects.create(user1=far, status='Searching', search_rating=1900, search_bucket=19)
+
+        opened = self.client.get('/api/match/')
+        self.assertEqual(opened.data['status'], 'Searching')
+        self.assertLessEqual(opened.data['expected_wait'], 10)
+        Room.objects.filter(pk=opened.data['id']).delete()
+
+        Room.objects.filter(pk=room.pk).update(created_at=timezone.now() - timedelta(seconds=12))
+        matched = self.client.get('/api/match/')
+        self.assertEqual(matched.data, {'id': room.id, 'full': 'true'})
+
+    def test_matched_room_deals_its_deck_once(self):
+        room = self._room()
+        tracked = list(TrackedQuestion.objects.filter(room=room).order_by('id').values_list('user_id', 'question_id'))
+        self.assertEqual(len(tracked), 20)
+        dealt = [question_id for user_id, question_id in tracked if user_id == self.user.id]
+        self.assertEqual(dealt, [question_id for user_id, question_id in tracked if user_id == room.user2_id])
+        self.assertEqual(set(room.questions.values_list('id', flat=True)), set(dealt))
+
+        room.save()
+        room.deal_questions()
+        self.assertEqual(TrackedQuestion.objects.filter(room=room).count(), 20)
+
+    def test_event_stream_requires_a_player(self):
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+        from rest_framework_simplejwt.tokens import AccessToken
+        room = self._room()
+        outsider = User.objects.create_user(username='lurker', email='lurk@e.com')
+        Profile.objects.create(user=outsider)
+        url = f'/api/match/{room.id}/events/'
+        client = AsyncClient()
+        self.assertEqual(async_to_sync(client.get)(url).status_code, 401)
+        response = async_to_sync(client.get)(url, {'token': str(AccessToken.for_user(outsider))})
+        self.assertEqual(response.status_code, 404)
+
+    def test_event_stream_refuses_to_buffer_under_wsgi(self):
+        room = self._room()
+        self.assertEqual(self.client.get(f'/api/match/{room.id}/events/').status_code, 501)
+
     def test_polling_advances_bot_progress(self):
         room = self._room(started_seconds_ago=100)
         response = self.client.post('/api/match/get_opponent_progress/', {'room_id': room.id}, format='json')
         self.assertEqual(response.status_code, 200)
         self.assertGreater(sum(row['status'] != 'Blank' for row in response.data), 0)
 
-    def test_bot_accuracy_uses_current_elo_and_rng(self):
-        from api.bot_duels import advance_bot, bot_accuracy
+    def test_bot_timeline_is_seeded_and_follows_elo(self):
+        from api.bot_duels import build_bot_timeline
+        self.assertEqual(build_bot_timeline('7:3', 1400, 10), build_bot_timeline('7:3', 1400, 10))
+        weak = build_bot_timeline('seed', 1200, 500)
+        strong = build_bot_timeline('seed', 1700, 500)
+        self.assertLess(sum(correct for _, correct in weak), sum(correct for _, correct in strong))
+        self.assertLess(strong[-1][0], weak[-1][0])
+        self.assertEqual([at for at, _ in weak], sorted(at for at, _ in weak))
+
+    def test_bot_timeline_is_drawn_at_start_from_the_rooms_test_prep_rating(self):
+        from api.bot_duels import build_bot_timeline, bot_answers_due
+        from api.models import TestPrepUserStats
+        bot = self._bot()
+        TestPrepUserStats.objects.create(user=bot, test_prep_id='act', duel_elo=bot.profile.elo_rating + 200)
+        room = Room.objects.create(user1=self.user, status='Searching', test_prep_id='act')
+        with patch('api.bot_duels.build_bot_timeline', wraps=build_bot_timeline) as build:
+            room.start(bot)
+            self.assertEqual(build.call_args.args[1], bot.profile.elo_rating + 200)
+            self.assertEqual(Room.objects.get(pk=room.pk).bot_timeline, room.bot_timeline)
+            room = Room.objects.get(pk=room.pk)
+            room.battle_start_time = timezone.now()
+            bot_answers_due(room, bot)
+        self.assertEqual(build.call_count, 1)
+
+    def test_bot_answers_are_read_from_the_timeline_and_written_once(self):
         room = self._room(started_seconds_ago=100)
         bot = room.user2
-        bot.profile.elo_rating = 1200
-        bot.profile.save(update_fields=['elo_rating'])
-        with patch('api.bot_duels.random.randrange', return_value=60):
-            advance_bot(room, bot)
-        first = TrackedQuestion.objects.filter(room=room, user=bot).order_by('id').first()
-        self.assertEqual(first.status, 'Incorrect')
-
-        TrackedQuestion.objects.filter(room=room, user=bot).update(status='Blank')
-        bot.profile.elo_rating = 1700
-        bot.profile.save(update_fields=['elo_rating'])
-        with patch('api.bot_duels.random.randrange', return_value=60):
-            advance_bot(room, bot)
-        first.refresh_from_db()
-        self.assertEqual(first.status, 'Correct')
-        self.assertLess(bot_accuracy(1200), bot_accuracy(1700))
+        first = self.client.post('/api/match/get_opponent_progress/', {'room_id': room.id}, format='json')
+        again = self.client.post('/api/match/get_opponent_progress/', {'room_id': room.id}, format='json')
+        self.assertEqual([row['status'] for row in first.data], [row['status'] for row in again.data])
+        self.assertFalse(TrackedQuestion.objects.filter(room=room, user=bot).exclude(status='Blank').exists())
+
+        room.battle_start_time = timezone.now() - timedelta(seconds=room.battle_duration + 1)
+        room.save(update_fields=['battle_start_time'])
+        TrackedQuestion.objects.filter(room=room, user=self.user).update(status='Incorrect')
+        response = self.client.post('/api/match/end_match/', {'room_id': room.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+        room.refresh_from_db()
+        expected = [
+            'Correct' if correct else 'Incorrect'
+            for at, correct in room.bot_timeline if at <= room.battle_duration
+        ]
+        self.assertEqual(
+            list(TrackedQuestion.objects.filter(room=room, user=bot).order_by('id').values_list('status', flat=True)),
+            expected + ['Blank'] * (10 - len(expected)),
+        )
 
     def test_duel_answer_is_graded_server_side(self):
         room = self._room()
@@ -1687,6 +1849,212 @@ class BotDuelTests(APITestCase):
         self.assertEqual(result.data['current_user']['elo_change'], 8)
         self.assertNotIn('is_bot', result.data['opponent'])
 
+    def test_results_and_history_are_served_from_the_result_document(self):
+        room = self._room()
+        TrackedQuestion.objects.filter(room=room, user=self.user).update(status='Correct')
+        TrackedQuestion.objects.filter(room=room, user=room.user2).update(status='Incorrect')
+        self.client.post('/api/match/end_match/', {'room_id': room.id}, format='json')
+        room.refresh_from_db()
+        self.assertEqual(room.result['players'][0]['score'], 10)
+
+        first = self.client.post('/api/match/get_results/', {'room_id': room.id}, format='json').data
+        TrackedQuestion.objects.filter(room=room).update(status='Blank')
+        with self.assertNumQueries(1):
+            again = self.client.post('/api/match/get_results/', {'room_id': room.id}, format='json').data
+        self.assertEqual(again, first)
+        self.assertEqual(first['outcome'], 'win')
+        self.assertEqual(first['current_user']['elo_after'], room.user1_elo_after)
+        self.assertEqual([row['status'] for row in first['user2_results']], ['Incorrect'] * 10)
+
+        history = self.client.get('/api/match/get_match_history/').data
+        self.assertEqual(history[0]['id'], room.id)
+        self.assertEqual(history[0]['user1_score'], 10)
+        self.assertEqual(history[0]['winner'], self.user.id)
+        self.assertEqual(history[0]['user2']['username'], room.user2.username)
+
+
+class DuelEventStreamTests(TransactionTestCase):
+    """The stream reads on executor threads, outside any test transaction."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='human_duelist', email='human@e.com')
+        Profile.objects.create(user=self.user, elo_rating=1500)
+        for i in range(10):
+            Question.objects.create(
+                question=f'Duel Q{i}?', choice_a='a', choice_b='b', choice_c='c', choice_d='d',
+                answer='B', difficulty=3, question_type='Transitions',
+            )
+
+    def test_event_stream_pushes_answers_and_the_end_signal(self):
+        from asgiref.sync import async_to_sync, sync_to_async
+        from api.duel_events import room_event_stream
+        other = User.objects.create_user(username='streamer', email='stream@e.com')
+        Profile.objects.create(user=other, elo_rating=1500)
+        room = Room.objects.create(user1=self.user, status='Searching')
+        room.start(other)
+        theirs = TrackedQuestion.objects.filter(room=room, user=other).order_by('id').first()
+
+        def answer():
+            client = APIClient()
+            client.force_authenticate(user=other)
+            client.post('/api/match/update/', {
+                'tracked_question_id': theirs.id, 'selected_choice': 'b',
+            }, format='json')
+
+        async def collect():
+            stream = room_event_stream(room.id, self.user, poll_seconds=0.01)
+            chunks = [await stream.__anext__()]
+            await sync_to_async(answer)()
+            chunks.append(await stream.__anext__())
+            await sync_to_async(room.finish)(0, 1)
+            chunks.append(await stream.__anext__())
+            chunks.append(await stream.__anext__())
+            await stream.aclose()
+            return chunks
+
+        snapshot, progress, status_change, end = async_to_sync(collect)()
+        self.assertTrue(snapshot.startswith('event: snapshot\n'))
+        self.assertIn('"status": "Battling"', snapshot)
+        self.assertTrue(progress.startswith('event: progress\n'))
+        self.assertIn(f'"tracked_question_id": {theirs.id}', progress)
+        self.assertIn('"status": "Correct"', progress)
+        self.assertEqual(status_change, 'event: status\ndata: {"status": "Ended"}\n\n')
+        self.assertEqual(end, 'event: end\ndata: {"status": "Ended"}\n\n')
+
+
+class MatchHistoryPagingTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='veteran', email='veteran@e.com')
+        Profile.objects.create(user=self.user)
+        rival = User.objects.create_user(username='nemesis', email='nemesis@e.com')
+        Profile.objects.create(user=rival, avatar_icon='initial')
+        self.client.force_authenticate(user=self.user)
+        start = timezone.now() - timedelta(days=1)
+        rooms = []
+        for index in range(25):
+            mine_first = index % 2 == 0
+            rooms.append(Room(
+                user1=self.user if mine_first else rival, user2=rival if mine_first else self.user,
+                status='Ended', user1_score=index % 3, user2_score=1,
+                user1_elo_before=1500, user1_elo_after=1500 + index,
+                user2_elo_before=1500, user2_elo_after=1500 - index,
+            ))
+        self.rooms = Room.objects.bulk_create(rooms)
+        # Pairs share a timestamp so the id tiebreak is exercised.
+        for index, room in enumerate(self.rooms):
+            Room.objects.filter(pk=room.pk).update(created_at=start + timedelta(minutes=index // 2))
+        Room.objects.create(user1=self.user, user2=rival, status='Battling')
+
+    def test_cursor_pages_cover_every_ended_duel_once_at_constant_cost(self):
+        from django.test.utils import CaptureQueriesContext
+        seen, cursor, costs = [], None, []
+        while True:
+            params = {'limit': 10, **({'cursor': cursor} if cursor else {})}
+            with CaptureQueriesContext(connection) as queries:
+                page = self.client.get('/api/match/history/', params).data
+            costs.append(len(queries))
+            seen += page['results']
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual([row['room_id'] for row in seen], [room.id for room in reversed(self.rooms)])
+        self.assertEqual(len(costs), 3)
+        self.assertEqual(len(set(costs)), 1)
+
+        newest = seen[0]  # the user sat as user1
+        self.assertEqual(newest['opponent_username'], 'nemesis')
+        self.assertEqual((newest['score'], newest['opponent_score']), (0, 1))
+        self.assertEqual(newest['elo_change'], 24)
+        self.assertEqual(seen[1]['elo_change'], -23)
+        self.assertEqual(seen[1]['score'], 1)
+
+    def test_cursors_survive_an_unencoded_echo_and_bad_ones_are_rejected(self):
+        first = self.client.get('/api/match/history/', {'limit': 10}).data
+        cursor = first['next_cursor']
+        self.assertRegex(cursor, r'^\d+_\d+$')
+        echoed = self.client.get(f'/api/match/history/?limit=10&cursor={cursor}').data
+        self.assertEqual(echoed['results'][0]['room_id'], self.rooms[14].id)
+
+        for bad in ('2026-10-18T10:00:00 00:00,5', 'abc', '12_'):
+            response = self.client.get('/api/match/history/', {'cursor': bad})
+            self.assertEqual(response.status_code, 400)
+
+
+class RoomReaperTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reaped', email='reaped@e.com')
+        Profile.objects.create(user=self.user, elo_rating=1500)
+        for i in range(10):
+            Question.objects.create(
+                question=f'Reap Q{i}?', choice_a='a', choice_b='b', choice_c='c', choice_d='d',
+                answer='B', difficulty=3, question_type='Transitions',
+            )
+
+    def _aged(self, room, **ages):
+        now = timezone.now()
+        Room.objects.filter(pk=room.pk).update(**{
+            field: now - timedelta(seconds=seconds) for field, seconds in ages.items()
+        })
+        room.refresh_from_db()
+        return room
+
+    def test_reap_expires_stale_searches_and_settles_overdue_battles(self):
+        from api.room_reaper import reap
+        stale = self._aged(Room.objects.create(user1=self.user, status='Searching'), created_at=3600)
+        other = User.objects.create_user(username='fresh', email='fresh@e.com')
+        Profile.objects.create(user=other)
+        fresh = Room.objects.create(user1=other, status='Searching')
+
+        bot = User.objects.filter(profile__is_bot=True).first()
+        overdue = Room.objects.create(user1=self.user, status='Searching')
+        overdue.start(bot)
+        TrackedQuestion.objects.filter(room=overdue, user=self.user).update(status='Correct')
+        overdue = self._aged(overdue, battle_start_time=overdue.battle_duration + 600)
+        running = Room.objects.create(user1=other, status='Searching')
+        running.start(self.user)
+        running = self._aged(running, battle_start_time=30)
+
+        self.assertEqual(reap(), (1, 1))
+        self.assertFalse(Room.objects.filter(pk=stale.pk).exists())
+        self.assertTrue(Room.objects.filter(pk=fresh.pk, status='Searching').exists())
+        overdue.refresh_from_db()
+        self.assertEqual(overdue.status, 'Ended')
+        self.assertEqual(overdue.user1_score, 10)
+        given = [correct for at, correct in overdue.bot_timeline if at <= overdue.battle_duration]
+        self.assertEqual(overdue.user2_score, sum(given))
+        self.assertEqual(TrackedQuestion.objects.filter(room=overdue, user=bot).exclude(status='Blank').count(), len(given))
+        self.assertEqual(Room.objects.get(pk=running.pk).status, 'Battling')
+
+    def test_match_sweeps_a_stale_room_that_would_block_the_user(self):
+        from django.core.management import call_command
+        self._aged(Room.objects.create(user1=self.user, status='Searching'), created_at=3600)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/match/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Room.objects.filter(user1=self.user).count(), 1)
+
+        self._aged(Room.objects.get(user1=self.user), created_at=3600)
+        call_command('reap_rooms', stdout=StringIO())
+        self.assertFalse(Room.objects.filter(user1=self.user).exists())
+
+    def test_match_settles_only_the_callers_own_overdue_battle(self):
+        bot = User.objects.filter(profile__is_bot=True).first()
+        other = User.objects.create_user(username='bystander', email='bystander@e.com')
+        Profile.objects.create(user=other)
+        theirs = Room.objects.create(user1=other, status='Searching')
+        theirs.start(bot)
+        self._aged(theirs, battle_start_time=theirs.battle_duration + 600)
+        mine = Room.objects.create(user1=self.user, status='Searching')
+        mine.start(User.objects.filter(profile__is_bot=True).exclude(pk=bot.pk).first())
+        self._aged(mine, battle_start_time=mine.battle_duration + 600)
+
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get('/api/match/').status_code, 200)
+        self.assertEqual(Room.objects.get(pk=mine.pk).status, 'Ended')
+        self.assertEqual(Room.objects.get(pk=theirs.pk).status, 'Battling')
+
 
 class CleanupUnverifiedUsersTests(APITestCase):
     def setUp(self):
@@ -1777,6 +2145,7 @@ class PracticeTierTests(APITestCase):
         PracticeAttempt.objects.filter(pk=current.pk).update(
             created_at=datetime.datetime(2026, 7, 10, 23, tzinfo=datetime.timezone.utc),
         )
+        rebuild_practice_days(self.user)
         now = datetime.datetime(2026, 7, 11, 1, tzinfo=datetime.timezone.utc)
 
         with patch('api.views.practice_views.timezone.now', return_value=now):
@@ -1806,6 +2175,62 @@ class PracticeTierTests(APITestCase):
         self.assertEqual(resp.status_code, 400)
         self.assertEqual(resp.data['error'], 'active_question_required')
 
+    def test_practice_answer_runs_in_a_fixed_query_budget(self):
+        # Steady state: the type-stats row exists and the practice bitmaps are
+        # warm. The budget must not grow with the user's history (17 includes
+        # the RatingEvent insert).
+        first = self.client.get('/api/practice/next/')
+        self._answer(Question.objects.get(id=first.data['question']['id']))
+        served = self.client.get('/api/practice/next/')
+        question = Question.objects.get(id=served.data['question']['id'])
+        with self.assertNumQueries(17):
+            resp = self._answer(question)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.data['rated'])
+        self.assertEqual(resp.data['practice_stats']['english_answered'], 2)
+        self.assertEqual(resp.data['quota']['used'], 2)
+
+    def test_lookahead_serves_a_queue_answered_in_order(self):
+        resp = self.client.get('/api/practice/next/', {'lookahead': 3})
+        self.assertEqual(resp.status_code, 200)
+        head = Question.objects.get(id=resp.data['question']['id'])
+        upcoming = [Question.objects.get(id=q['id']) for q in resp.data['upcoming']]
+        self.assertEqual(len(upcoming), 2)
+        self.assertEqual(len({head.id, *(q.id for q in upcoming)}), 3)
+
+        # Reservations are not answerable until they reach the front.
+        self.assertEqual(self._answer(upcoming[0]).status_code, 400)
+        self.assertEqual(self._answer(head).status_code, 200)
+        self.assertEqual(self._answer(upcoming[0]).status_code, 200)
+
+        resumed = self.client.get('/api/practice/next/')
+        self.assertEqual(resumed.data['question']['id'], upcoming[1].id)
+
+    @override_settings(FREE_DAILY_LIMIT=2)
+    def test_lookahead_never_exceeds_the_remaining_quota(self):
+        first = self.client.get('/api/practice/next/')
+        self._answer(Question.objects.get(id=first.data['question']['id']))
+        resp = self.client.get('/api/practice/next/', {'lookahead': 5})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['upcoming'], [])
+
+    def test_lookahead_repicks_reservations_after_rating_drift(self):
+        from api.models import PracticeActiveQuestion
+        from api.views.practice_views import PRACTICE_LOOKAHEAD_DRIFT
+        first = self.client.get('/api/practice/next/', {'lookahead': 2})
+        reserved = PracticeActiveQuestion.objects.get(user=self.user, position=1)
+
+        stats = self._stats()
+        stats.elo += PRACTICE_LOOKAHEAD_DRIFT + 1
+        stats.save(update_fields=['elo'])
+        again = self.client.get('/api/practice/next/', {'lookahead': 2})
+
+        self.assertEqual(again.data['question']['id'], first.data['question']['id'])
+        self.assertFalse(PracticeActiveQuestion.objects.filter(id=reserved.id).exists())
+        refreshed = PracticeActiveQuestion.objects.get(user=self.user, position=1)
+        self.assertEqual(refreshed.reserved_elo, stats.elo)
+        self.assertEqual(again.data['upcoming'][0]['id'], refreshed.question_id)
+
     def test_topic_selection_requires_premium(self):
         resp = self.client.get('/api/practice/next/', {'type': 'Transitions'})
         self.assertEqual(resp.status_code, 403)
@@ -1884,6 +2309,7 @@ class PracticeTierTests(APITestCase):
             PracticeAttempt.objects.create(
                 user=self.user, question=self.questions[i % 5], correct=True,
             )
+        rebuild_practice_days(self.user)
         next_resp = self.client.get('/api/practice/next/')
         self.assertEqual(next_resp.status_code, 429)
         # A brand-new (never-answered) question is still blocked once the free
@@ -1989,17 +2415,23 @@ class PracticeTierTests(APITestCase):
         self.assertLess(stats.elo, before)
         self.assertEqual((stats.answered, stats.correct), (1, 0))
 
+    def _seed_attempt(self, question, correct=True):
+        """History as the answer pipeline would have left it."""
+        from api.models import UserQuestionState
+        attempt = PracticeAttempt.objects.create(user=self.user, question=question, correct=correct)
+        UserQuestionState.objects.create(
+            user=self.user, question=question, first_attempt_at=attempt.created_at, last_correct=correct,
+        )
+
     def test_next_prefers_unattempted_questions(self):
-        from api.models import PracticeAttempt
         for q in self.questions[:4]:
-            PracticeAttempt.objects.create(user=self.user, question=q, correct=True)
+            self._seed_attempt(q)
         resp = self.client.get('/api/practice/next/')
         self.assertEqual(resp.data['question']['id'], self.questions[4].id)
 
     def test_next_does_not_repeat_after_finishing_a_topic(self):
-        from api.models import PracticeAttempt
         for question in self.questions:
-            PracticeAttempt.objects.create(user=self.user, question=question, correct=True)
+            self._seed_attempt(question)
 
         resp = self.client.get('/api/practice/next/')
 
@@ -2054,6 +2486,60 @@ class PracticeTierTests(APITestCase):
         )
 
 
+class RatingChartTests(APITestCase):
+    def setUp(self):
+        from api.models import Question
+        self.user = User.objects.create_user(username='charted', email='chart@e.com')
+        Profile.objects.create(user=self.user, elo_rating=1500)
+        self.client.force_authenticate(user=self.user)
+        self.question = Question.objects.create(
+            question='C0?', choice_a='a', choice_b='b', choice_c='c', choice_d='d',
+            answer='B', difficulty=3, question_type='Transitions',
+        )
+
+    def test_duels_and_practice_answers_append_rating_events(self):
+        from api.models import RatingEvent
+        rival = User.objects.create_user(username='rival', email='rival@e.com')
+        Profile.objects.create(user=rival, elo_rating=1500)
+        room = Room.objects.create(user1=self.user, status='Searching')
+        room.start(rival)
+        room.finish(3, 1)
+        self.client.post('/api/check_answer/', {
+            'question_id': self.question.id, 'selected_choice': 'b', 'mode': 'practice',
+        }, format='json')
+
+        events = RatingEvent.objects.filter(user=self.user).order_by('id')
+        self.assertEqual(
+            [(event.kind, event.subject, event.delta > 0) for event in events],
+            [('duel', '', True), ('practice', 'english', True)],
+        )
+        self.assertEqual(events[0].rating, room.user1_elo_after)
+        self.assertEqual(RatingEvent.objects.get(user=rival).delta, room.user2_elo_after - room.user2_elo_before)
+
+    def test_chart_keeps_the_last_rating_per_bucket_in_one_scan(self):
+        from api.models import RatingEvent
+        now = timezone.now()
+        RatingEvent.objects.bulk_create([
+            RatingEvent(user=self.user, test_prep_id='sat', kind='duel', rating=1500 + day,
+                        delta=1, created_at=now - timedelta(days=30 - day, hours=1))
+            for day in range(30)
+        ] + [
+            RatingEvent(user=self.user, test_prep_id='sat', kind='practice', subject='math',
+                        rating=1210, delta=10, created_at=now - timedelta(days=2)),
+            RatingEvent(user=self.user, test_prep_id='sat', kind='duel', rating=1400,
+                        delta=-5, created_at=now - timedelta(days=200)),
+        ])
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/profile/rating_chart/', {'days': 30, 'points': 10})
+        duel = response.data['series']['duel']
+        self.assertEqual(len(duel), 10)
+        self.assertEqual(duel[-1]['rating'], 1529)
+        self.assertEqual([point['rating'] for point in response.data['series']['math']], [1210])
+        other = self.client.get(f'/api/profile/rating_chart/{self.user.id + 999}/')
+        self.assertEqual(other.status_code, 404)
+
+
 class PracticeTypeProgressTests(APITestCase):
     """Question-bank progress: per-type solved/total counters for the
     practice page progress bars."""
@@ -2206,12 +2692,226 @@ class PracticeFilterTests(APITestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp.data['question']['id'], self.by_level[3].id)
 
+    def test_first_attempt_claim_beats_a_stale_bitmap(self):
+        # Another worker recorded this question but our cached bitmap missed
+        # it: the unique question-state row still makes this a free review.
+        from api.models import UserQuestionState
+        from api.practice_state import load_practice_state
+        question = self.by_level[2]
+        load_practice_state(self.user)
+        UserQuestionState.objects.create(
+            user=self.user, question=question, first_attempt_at=timezone.now(), last_correct=True,
+        )
+        resp = self._answer(question, 'a')
+        self.assertTrue(resp.data['review'])
+        self.assertFalse(PracticeAttempt.objects.filter(user=self.user).exists())
+        state = UserQuestionState.objects.get(user=self.user, question=question)
+        self.assertTrue(state.last_correct)
+
     def test_empty_review_pool_reports_no_matches(self):
         resp = self.client.get('/api/practice/next/', {'result': 'incorrect'})
         self.assertEqual(resp.status_code, 404)
         self.assertEqual(resp.data['error'], 'no_matches')
 
 
+class PracticeStateTests(APITestCase):
+    """Cached practice bitmaps stay in step with answers and saves."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='bitmapper', email='bm@e.com')
+        self.profile = Profile.objects.create(user=self.user, is_premium=True)
+        self.client.force_authenticate(user=self.user)
+        self.questions = [
+            Question.objects.create(
+                question=f'B{i}?', choice_a='a', choice_b='b', choice_c='c', choice_d='d',
+                answer='B', difficulty=3, question_type='Transitions',
+            )
+            for i in range(3)
+        ]
+
+    def _answer(self, q, choice='b'):
+        return self.client.post('/api/check_answer/', {
+            'question_id': q.id, 'selected_choice': choice, 'mode': 'practice',
+        }, format='json')
+
+    def test_bitmap_ids_round_trips(self):
+        from api.practice_state import bit, bitmap_ids, has
+        bitmap = bit(0) | bit(7) | bit(4096)
+        self.assertEqual(bitmap_ids(bitmap), [0, 7, 4096])
+        self.assertTrue(has(bitmap, 7))
+        self.assertFalse(has(bitmap, 8))
+
+    def test_answer_writes_through_to_the_warm_cache(self):
+        from api.practice_state import load_practice_state
+        load_practice_state(self.user)  # warm
+        self._answer(self.questions[0], 'a')
+        self.profile.refresh_from_db()
+        self.user.profile = self.profile
+        with self.assertNumQueries(0):
+            state = load_practice_state(self.user)
+        self.assertEqual(state.incorrect, 1 << self.questions[0].id)
+        self.assertEqual(state.correct, 0)
+
+    def test_save_and_unsave_update_the_saved_filter(self):
+        # /practice/next/ pins a served question to its lane, so drive the
+        # picker directly; the endpoints only need to keep the cache honest.
+        from api.practice_state import load_practice_state
+        from api.views.practice_views import pick_filtered_question
+        filters = {'types': [], 'levels': [], 'saved': 'only', 'attempted': 'all', 'result': 'all'}
+        load_practice_state(self.user)  # warm the cache before saving
+        target = self.questions[2]
+
+        self.client.post('/api/practice/saved/', {'question_id': target.id}, format='json')
+        self.user.profile.refresh_from_db()
+        self.assertEqual(pick_filtered_question(self.user, 'english', filters), (target, None))
+
+        self.client.delete(f'/api/practice/saved/{target.id}/')
+        self.user.profile.refresh_from_db()
+        self.assertEqual(pick_filtered_question(self.user, 'english', filters), (None, 'no_questions'))
+
+    def test_lost_race_leaves_the_new_version_cold(self):
+        from api.practice_state import _cache_key, load_practice_state, note_practice_answer
+        load_practice_state(self.user)
+        stale = User.objects.get(pk=self.user.pk)
+        stale.profile  # pin the pre-race version on this copy
+        note_practice_answer(self.user, self.questions[0].id, True)
+        note_practice_answer(stale, self.questions[1].id, True)
+        self.assertIsNone(cache.get(_cache_key(self.user.id, stale.profile.practice_state_version)))
+
+
+class PracticeIndexTests(APITestCase):
+    """The in-process rating index behind the adaptive picker."""
+
+    def test_sample_widens_from_the_nearest_window(self):
+        from api.practice_index import RatingIndex
+        rows = [
+            (1, 'english', 'Transitions', 3, 900),
+            (2, 'english', 'Transitions', 3, 1210),
+            (3, 'english', 'Transitions', 3, 2000),
+        ]
+        index = RatingIndex(rows)
+        keys = index.keys_for('english', ['Transitions'], [])
+        self.assertEqual(index.sample_near(keys, 1200, lambda qid: True), 2)
+        # Skipping the near one falls through to the 500 window, never to 2000.
+        self.assertEqual(index.sample_near(keys, 1200, lambda qid: qid != 2), 1)
+        self.assertIsNone(index.sample_near(keys, 1200, lambda qid: False))
+
+    def test_a_nearly_answered_bank_is_walked_once_per_pick(self):
+        from api.practice_index import RATING_WINDOWS, SAMPLE_TRIES, RatingIndex
+        index = RatingIndex([(qid, 'english', 'Transitions', 3, 600 + qid) for qid in range(1, 1001)])
+        keys = index.keys_for('english', ['Transitions'], [])
+        checked = []
+
+        def accept(qid):
+            checked.append(qid)
+            return qid == 1000
+
+        self.assertEqual(index.sample_near(keys, 1200, accept), 1000)
+        self.assertLessEqual(len(checked), 1000 + SAMPLE_TRIES * len(RATING_WINDOWS))
+        checked.clear()
+        self.assertIsNone(index.sample_near(keys, 1200, lambda qid: checked.append(qid) and False))
+        self.assertEqual(sorted(set(checked)), list(range(1, 1001)))
+        self.assertLessEqual(len(checked), 1000 + SAMPLE_TRIES * len(RATING_WINDOWS))
+
+    def test_rating_moves_reslot_the_question(self):
+        from api.practice_index import RatingIndex
+        index = RatingIndex([(1, 'math', 'Linear equations in one variable', 2, 800)])
+        index.move(1, 1500)
+        keys = index.keys_for('math', ['Linear equations in one variable'], [2])
+        self.assertEqual(index.buckets[next(iter(keys))], [(1500, 1)])
+        self.assertEqual(index.sample_near(keys, 1500, lambda qid: True), 1)
+
+    def test_picker_rebuilds_when_the_bank_changed_underneath(self):
+        from api.practice_index import get_practice_index
+        from api.views.practice_views import pick_practice_question
+        user = User.objects.create_user(username='indexer', email='ix@e.com')
+        Profile.objects.create(user=user)
+        question = Question.objects.create(
+            question='Moved?', choice_a='a', choice_b='b', choice_c='c', choice_d='d',
+            answer='B', difficulty=3, question_type='Transitions',
+        )
+        get_practice_index()
+        # queryset.update() bypasses the save signal, leaving the index stale.
+        Question.objects.filter(pk=question.pk).update(question_type='Boundaries')
+        self.assertEqual(pick_practice_question(user, 'english', 'Transitions'), (None, 'no_questions'))
+        self.assertEqual(pick_practice_question(user, 'english', 'Boundaries'), (question, None))
+
+
+class QuestionBankVersionTests(APITestCase):
+    """Bank-derived caches are keyed by QuestionBank.version."""
+
+    def setUp(self):
+        cache.clear()
+
+    def _question(self, question_type='Transitions'):
+        return Question.objects.create(
+            question='Bank?', choice_a='a', choice_b='b', choice_c='c', choice_d='d',
+            answer='A', difficulty=2, question_type=question_type,
+        )
+
+    def test_bank_edits_rotate_the_version_and_refresh_totals(self):
+        from api.question_bank import bank_version, type_totals
+        question = self._question()
+        version = bank_version()
+        self.assertEqual(type_totals(), {'Transitions': 1})
+        with self.assertNumQueries(0):
+            self.assertEqual(type_totals(), {'Transitions': 1})
+
+        question.question_type = 'Boundaries'
+        question.save()
+        self.assertNotEqual(bank_version(), version)
+        self.assertEqual(type_totals(), {'Boundaries': 1})
+
+        version = bank_version()
+        question.delete()
+        self.assertNotEqual(bank_version(), version)
+        self.assertEqual(type_totals(), {})
+
+    def test_payloads_are_served_from_cache_until_the_question_changes(self):
+        from api.question_bank import get_many
+        question = self._question()
+        public = get_many([question.id, 999999])
+        self.assertEqual(public, {question.id: dict(QuestionSerializer(question).data)})
+        self.assertNotIn('answer', public[question.id])
+        with self.assertNumQueries(0):
+            review = get_many([question.id], review=True)[question.id]
+        self.assertEqual((review['answer'], review['answer_text']), ('A', 'a'))
+
+        question.question = 'Edited?'
+        question.save()
+        self.assertEqual(get_many([question.id])[question.id]['question'], 'Edited?')
+
+    def test_bulk_edit_bumps_the_version(self):
+        from api.question_bank import bank_version, type_totals
+        question = self._question()
+        admin = User.objects.create_user(username='bank-admin', email='ba@e.com', is_staff=True)
+        Profile.objects.create(user=admin)
+        self.client.force_authenticate(user=admin)
+        self.assertEqual(type_totals(), {'Transitions': 1})
+        version = bank_version()
+        resp = self.client.post(
+            reverse('bulk_update_questions'),
+            {'question_ids': [question.id], 'field': 'question_type', 'value': 'Boundaries'},
+            format='json',
+        )
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertNotEqual(bank_version(), version)
+        self.assertEqual(type_totals(), {'Boundaries': 1})
+
+
+class PracticeBenchmarkTests(APITestCase):
+    def test_benchmark_drives_the_practice_loop_and_reports_percentiles(self):
+        from api.management.commands.bench_practice import run_benchmark
+        report = run_benchmark(users=2, questions=60, attempts=10, rounds=3, workers=1, seed_value=7)
+        self.assertEqual(report['requests'], 18)
+        self.assertEqual(set(report['endpoints']), {'next_question', 'check_answer', 'practice_status'})
+        for endpoint in report['endpoints'].values():
+            self.assertEqual((endpoint['requests'], endpoint['errors']), (6, 0))
+            self.assertLessEqual(endpoint['p50_ms'], endpoint['p99_ms'])
+            self.assertGreater(endpoint['queries_mean'], 0)
+        self.assertEqual(PracticeAttempt.objects.filter(user__username='bench-0').count(), 13)
+
+
 class BillingViewsTests(APITestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='subscriber', email='sub@example.com')
@@ -2562,6 +3262,7 @@ class PracticeStreakTests(APITestCase):
                 user=self.user, question=self.questions[i], correct=True,
             )
             PracticeAttempt.objects.filter(pk=a.pk).update(created_at=when)
+        rebuild_practice_days(self.user)  # hand-made attempts bypass the rollup
 
     def test_streak_extends_on_goal_completion(self):
         for i in range(9):
@@ -2606,6 +3307,49 @@ class PracticeStreakTests(APITestCase):
         self.assertEqual(resp.data['max_streak'], 3)
         self.assertEqual(stats.data['current_streak'], 0)
 
+    def test_correct_streak_is_kept_on_the_profile(self):
+        for question in self.questions[:2]:
+            resp = self._answer(question)
+        self.assertEqual(resp.data['practice_stats']['current_streak'], 2)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.practice_correct_streak, 2)
+        self.assertEqual(self.profile.max_streak, 2)
+
+    def test_answers_roll_up_into_the_local_day(self):
+        from api.models import PracticeDay
+        self._answer(self.questions[0])
+        self._answer(self.questions[1])
+        day = PracticeDay.objects.get(user=self.user)
+        self.assertEqual((day.answered, day.english, day.math), (2, 2, 0))
+        resp = self.client.get('/api/infinite_questions_profile/')
+        self.assertEqual(resp.data['activity'][-1]['count'], 2)
+
+    def test_rebuild_rebuckets_days_after_a_timezone_change(self):
+        import datetime
+        from django.core.management import call_command
+        from api.models import PracticeAttempt, PracticeDay
+        attempt = PracticeAttempt.objects.create(user=self.user, question=self.questions[0], correct=True)
+        PracticeAttempt.objects.filter(pk=attempt.pk).update(
+            created_at=datetime.datetime(2026, 7, 10, 3, tzinfo=datetime.timezone.utc),
+        )
+        rebuild_practice_days(self.user)
+        self.assertEqual(PracticeDay.objects.get(user=self.user).date, datetime.date(2026, 7, 10))
+
+        self.profile.timezone = 'America/Los_Angeles'
+        self.profile.save(update_fields=['timezone'])
+        call_command('rebuild_practice_days', '--user', self.user.username, stdout=StringIO())
+        self.assertEqual(PracticeDay.objects.get(user=self.user).date, datetime.date(2026, 7, 9))
+
+    def test_backfill_recomputes_streak_from_history(self):
+        from django.core.management import call_command
+        from api.models import PracticeAttempt
+        for correct, question in zip([True, False, True, True], self.questions):
+            PracticeAttempt.objects.create(user=self.user, question=question, correct=correct)
+        call_command('backfill_correct_streaks', stdout=StringIO())
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.practice_correct_streak, 2)
+        self.assertEqual(self.profile.max_streak, 2)
+
     def test_no_double_extension_same_day(self):
         for i in range(10):
             self._answer(self.questions[i])
@@ -2673,6 +3417,7 @@ class PracticeStreakTests(APITestCase):
 
 class PartyModeTests(APITestCase):
     def setUp(self):
+        cache.clear()  # heartbeats are cached per room and user id
         self.host = User.objects.create_user(username='host', password='x')
         Profile.objects.create(user=self.host)
         self.guest = User.objects.create_user(username='guest', password='x')
@@ -2707,6 +3452,58 @@ class PartyModeTests(APITestCase):
         self.assertEqual(room.max_players, 30)
         self.assertEqual(room.num_questions, 40)
 
+    def test_party_state_answers_304_and_deltas_against_the_state_version(self):
+        from api.models import PartyRoom
+        third = User.objects.create_user(username='third', password='x')
+        Profile.objects.create(user=third)
+        data = self._create()
+        for user in (self.guest, third):
+            self.client.force_authenticate(user=user)
+            self.client.post(reverse('party_join'), {'code': data['code']}, format='json')
+        self.client.force_authenticate(user=self.host)
+        self.client.post(reverse('party_start', args=[data['id']]))
+        PartyRoom.objects.filter(id=data['id']).update(
+            phase_started_at=timezone.now() - timedelta(seconds=6),
+        )
+        url = reverse('party_state', args=[data['id']])
+
+        full = self.client.get(url)
+        self.assertEqual(full.data['status'], 'question')
+        version = full.data['version']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=full['ETag']).status_code, 304)
+        self.assertEqual(self.client.get(url, {'since': version}).status_code, 304)
+
+        self.client.force_authenticate(user=self.guest)
+        self.client.post(reverse('party_answer', args=[data['id']]), {'choice': 'A'}, format='json')
+        self.client.force_authenticate(user=self.host)
+        delta = self.client.get(url, {'since': version}).data
+        self.assertTrue(delta['delta'])
+        self.assertEqual([entry['id'] for entry in delta['players']], [self.guest.id])
+        self.assertTrue(delta['players'][0]['answered'])
+        self.assertNotIn('question', delta)
+        self.assertGreater(delta['version'], version)
+
+        # The viewer's own seat (or a phase change) always gets the full state.
+        self.client.post(reverse('party_answer', args=[data['id']]), {'choice': 'A'}, format='json')
+        mine = self.client.get(url, {'since': delta['version']}).data
+        self.assertNotIn('delta', mine)
+        self.assertEqual(len(mine['players']), 3)
+
+    def test_a_superseded_room_reaches_its_pollers_as_finished(self):
+        old = self._create()
+        self.client.force_authenticate(user=self.guest)
+        self.client.post(reverse('party_join'), {'code': old['code']}, format='json')
+        url = reverse('party_state', args=[old['id']])
+        full = self.client.get(url)
+        self.assertEqual(self.client.get(url, {'since': full.data['version']}).status_code, 304)
+
+        self._create()
+        self.client.force_authenticate(user=self.guest)
+        stale = self.client.get(url, {'since': full.data['version']})
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale.data['status'], 'finished')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=full['ETag']).status_code, 200)
+
     def test_party_reactions_use_the_duel_reaction_table_and_premium_loadout(self):
         data = self._create()
         sent = self.client.post(
@@ -2954,6 +3751,40 @@ class PartyModeTests(APITestCase):
         # The stale lobby seat was freed.
         self.assertEqual(room.players.count(), 1)
 
+    def test_heartbeats_write_the_row_at_most_every_few_seconds(self):
+        from api.models import PartyPlayer
+        from api.party_presence import _written_key
+        data = self._create()
+        seat = PartyPlayer.objects.filter(room_id=data['id'], user=self.host)
+        url = reverse('party_state', args=[data['id']])
+        self.client.get(url)
+        written = seat.get().last_seen
+        self.client.get(url)
+        self.assertEqual(seat.get().last_seen, written)
+
+        cache.delete(_written_key(data['id'], self.host.id))  # HEARTBEAT_WRITE_SECONDS later
+        self.client.get(url)
+        self.assertGreater(seat.get().last_seen, written)
+
+    def test_a_cached_heartbeat_keeps_the_host_seated(self):
+        from api.models import PartyPlayer, PartyRoom
+        data = self._create()
+        self.client.get(reverse('party_state', args=[data['id']]))  # the host polls
+        self.client.force_authenticate(user=self.guest)
+        self.client.post(reverse('party_join'), {'code': data['code']}, format='json')
+
+        # The row lags (it is only written every few seconds); the cache doesn't.
+        PartyPlayer.objects.filter(room_id=data['id'], user=self.host).update(
+            last_seen=timezone.now() - timedelta(seconds=120))
+        state = self.client.get(reverse('party_state', args=[data['id']])).data
+        self.assertFalse(state['is_host'])
+        self.assertEqual(PartyRoom.objects.get(id=data['id']).players.count(), 2)
+
+        # Leaving drops the cached heartbeat along with the seat.
+        self.client.force_authenticate(user=self.host)
+        self.client.post(reverse('party_leave', args=[data['id']]))
+        self.assertEqual(PartyRoom.objects.get(id=data['id']).host, self.guest)
+
     def test_fully_abandoned_lobby_closes_on_join_attempt(self):
         from api.models import PartyPlayer, PartyRoom
         data = self._create()
@@ -3393,6 +4224,36 @@ class PartySurvivalModeTests(APITestCase):
         from api.models import PartyPlayer
         return PartyPlayer.objects.get(room_id=room_id, user=user).lives
 
+    def test_a_fifty_player_poll_fetches_the_roster_once(self):
+        from api.models import PartyPlayer, PartyRoom
+        cache.clear()
+        questions = list(Question.objects.values_list('id', flat=True)[:3])
+        room = PartyRoom.objects.create(
+            host=self.host, code='505050', mode='survival', lives=3, num_questions=3,
+            seconds_per_question=60, question_ids=questions, status='question', phase_started_at=timezone.now(),
+        )
+        User.objects.bulk_create([User(username=f'crowd{i}') for i in range(49)])
+        crowd = [self.host] + list(User.objects.filter(username__startswith='crowd'))
+        Profile.objects.bulk_create([Profile(user=user) for user in crowd[1:]])
+        PartyPlayer.objects.bulk_create([PartyPlayer(room=room, user=user, lives=3) for user in crowd])
+        # The question clock starts once the crowd is seated, however long that took.
+        PartyRoom.objects.filter(id=room.id).update(phase_started_at=timezone.now())
+        url = reverse('party_state', args=[room.id])
+        self.client.force_authenticate(user=self.host)
+        self.client.get(url)  # warm the question payload cache
+
+        # Room, roster, recent reactions; the heartbeat row write is not due yet.
+        with self.assertNumQueries(3):
+            self.assertEqual(len(self.client.get(url).data['players']), 50)
+
+        # The clock runs out: all 50 timeouts are charged in one bulk_update, then
+        # the phase change is versioned and the roster re-read once to match it.
+        PartyRoom.objects.filter(id=room.id).update(phase_started_at=timezone.now() - timedelta(seconds=61))
+        with self.assertNumQueries(10):
+            state = self.client.get(url).data
+        self.assertEqual(state['status'], 'leaderboard')
+        self.assertEqual(set(PartyPlayer.objects.filter(room=room).values_list('lives', flat=True)), {2})
+
     def test_lives_cap_for_last_standing_is_five(self):
         from api.models import PartyRoom
         room_id = self._room(lives=99, last_standing=True)
@@ -3537,6 +4398,7 @@ class PartySurvivalModeTests(APITestCase):
 
 class PartyGoldRushModeTests(APITestCase):
     def setUp(self):
+        cache.clear()  # question pools are cached per room id
         from api.models import PartyRoom
         self.PartyRoom = PartyRoom
         self.host = User.objects.create_user(username='host', password='x')
@@ -3584,6 +4446,26 @@ class PartyGoldRushModeTests(APITestCase):
         self.assertNotIn('answer', state['gold']['question'])
         self.assertGreater(state['seconds_left'], 0)
 
+    def test_polls_and_answers_are_served_from_the_room_pool(self):
+        from django.test.utils import CaptureQueriesContext
+        room_id = self._play()
+        self.client.force_authenticate(user=self.host)
+        state_url = reverse('party_state', args=[room_id])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(state_url).data['gold']['phase'], 'question')
+            wrong = self.client.post(reverse('party_gold_answer', args=[room_id]), {'choice': 'B'}, format='json')
+            review = self.client.get(state_url).data['gold']
+        self.assertEqual(wrong.data['correct_choice'], 'A')
+        self.assertEqual(review['review']['correct_choice'], 'A')
+        self.assertFalse([query['sql'] for query in queries if '"api_question"' in query['sql']])
+
+        # A worker without the pool rebuilds it once.
+        cache.delete(f'party:gold-pool:{room_id}')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(state_url)
+            self.client.get(state_url)
+        self.assertEqual(len([query for query in queries if '"api_question"' in query['sql']]), 1)
+
     def test_wrong_answer_locks_out_then_self_heals(self):
         room_id = self._play()
         self.client.force_authenticate(user=self.host)
@@ -3674,6 +4556,90 @@ class PartyGoldRushModeTests(APITestCase):
         self.assertEqual(resp.status_code, 400)
 
 
+@override_settings(PARTY_HOT_STATE=True)
+class PartyHotStateTests(APITestCase):
+    """settings.PARTY_HOT_STATE: seats live in the cache until their phase ends."""
+
+    def setUp(self):
+        cache.clear()
+        self.users = []
+        for name in ('host', 'guest', 'third'):
+            user = User.objects.create_user(username=name, password='x')
+            Profile.objects.create(user=user)
+            self.users.append(user)
+        self.host, self.guest, self.third = self.users
+        for i in range(40):
+            Question.objects.create(
+                question=f'Q{i}?', choice_a='a', choice_b='b', choice_c='c', choice_d='d',
+                answer='A', difficulty=(i % 3) + 2, question_type='Transitions',
+            )
+
+    def _start(self, **settings):
+        from api.models import PartyRoom
+        self.client.force_authenticate(user=self.host)
+        data = self.client.post(reverse('party_create'), {
+            'subject': 'english', 'difficulty': 'medium', **settings,
+        }, format='json').data
+        for user in self.users[1:]:
+            self.client.force_authenticate(user=user)
+            self.client.post(reverse('party_join'), {'code': data['code']}, format='json')
+        self.client.force_authenticate(user=self.host)
+        self.client.post(reverse('party_start', args=[data['id']]))
+        PartyRoom.objects.filter(id=data['id']).update(phase_started_at=timezone.now() - timedelta(seconds=6))
+        return data['id']
+
+    def test_answers_stay_in_the_cache_until_the_question_ends(self):
+        from api.models import PartyPlayer, PartyRoom
+        room_id = self._start(num_questions=3, seconds_per_question=60)
+        url = reverse('party_state', args=[room_id])
+        version = self.client.get(url).data['version']
+
+        self.client.force_authenticate(user=self.guest)
+        self.assertEqual(
+            self.client.post(reverse('party_answer', args=[room_id]), {'choice': 'A'}, format='json').status_code, 200,
+        )
+        self.assertEqual(PartyPlayer.objects.get(room_id=room_id, user=self.guest).answers, {})
+        self.client.force_authenticate(user=self.host)
+        delta = self.client.get(url, {'since': version}).data
+        self.assertEqual([(entry['id'], entry['answered']) for entry in delta['players']], [(self.guest.id, True)])
+        self.assertLess(delta['version'], PartyRoom.objects.get(id=room_id).state_version)
+
+        for user in (self.host, self.third):
+            self.client.force_authenticate(user=user)
+            self.client.post(reverse('party_answer', args=[room_id]), {'choice': 'B'}, format='json')
+        room = PartyRoom.objects.get(id=room_id)
+        self.assertEqual(room.status, 'leaderboard')
+        seats = {seat.user_id: seat for seat in room.players.all()}
+        self.assertTrue(seats[self.guest.id].answers['0']['correct'])
+        self.assertGreater(seats[self.guest.id].score, 500)
+        self.assertEqual(seats[self.third.id].answers['0']['choice'], 'B')
+        self.assertGreater(room.phase_version, delta['version'])
+        state = self.client.get(url, {'since': delta['version']}).data
+        self.assertNotIn('delta', state)
+        self.assertEqual(state['reveal']['your_choice'], 'B')
+
+    @patch('api.views.party_views._roll_reward', return_value={'kind': 'steal', 'pct': 50})
+    def test_gold_rush_moves_reach_the_rows_when_the_game_ends(self, _roll):
+        from api.models import PartyPlayer, PartyRoom
+        room_id = self._start(mode='goldrush', time_limit=600)
+        PartyRoom.objects.get(id=room_id).players.filter(user=self.guest).update(score=1000)
+
+        self.client.force_authenticate(user=self.host)
+        self.client.post(reverse('party_gold_answer', args=[room_id]), {'choice': 'A'}, format='json')
+        self.client.post(reverse('party_gold_chest', args=[room_id]), {'pick': 0}, format='json')
+        done = self.client.post(reverse('party_gold_chest', args=[room_id]), {'target': self.guest.id}, format='json')
+        self.assertEqual(done.data['gold'], 500)
+        self.assertEqual(PartyPlayer.objects.get(room_id=room_id, user=self.guest).score, 1000)
+        self.client.force_authenticate(user=self.guest)
+        players = self.client.get(reverse('party_state', args=[room_id])).data['players']
+        self.assertEqual({entry['id']: entry['score'] for entry in players}[self.guest.id], 500)
+
+        PartyRoom.objects.filter(id=room_id).update(phase_started_at=timezone.now() - timedelta(seconds=601))
+        self.assertEqual(self.client.get(reverse('party_state', args=[room_id])).data['status'], 'finished')
+        scores = dict(PartyPlayer.objects.filter(room_id=room_id).values_list('user_id', 'score'))
+        self.assertEqual((scores[self.host.id], scores[self.guest.id]), (500, 500))
+
+
 class PracticeTestResultTests(APITestCase):
     """Save + history for full-length practice tests."""
 
@@ -41,6 +41,8 @@ urlpatterns = [
     path('messages/send/', messaging_views.send_message, name='send_message'),
     path('messages/unread_count/', messaging_views.unread_count, name='messages_unread_count'),
     path('profile/view_profile/<int:user_id>/', profile_views.view_profile, name='view_profile'),
+    path('profile/rating_chart/', profile_views.rating_chart, name='rating_chart'),
+    path('profile/rating_chart/<int:user_id>/', profile_views.rating_chart, name='rating_chart_for_user'),
     path('infinite_questions_profile/', profile_views.infinite_questions_profile_view, name='infinite_questions_profile'),
     path('leaderboard/', profile_views.leaderboard_view, name='leaderboard'),
 
@@ -68,8 +70,11 @@ urlpatterns = [
     path('match/cancel_match/', duel_views.cancel_match, name='cancel_match'),
     path('match/get_match_history/', duel_views.get_match_history, name='get_match_history'),
     path('match/get_match_history/<int:user_id>/', duel_views.get_match_history, name='get_match_history_with_user_id'),
+    path('match/history/', duel_views.match_history, name='match_history'),
+    path('match/history/<int:user_id>/', duel_views.match_history, name='match_history_for_user'),
     path('match/info/', duel_views.get_match_info, name='get_match_info'),
     path('match/emotes/', duel_views.duel_emotes, name='duel_emotes'),
+    path('match/<int:room_id>/events/', duel_views.duel_events, name='duel_events'),
 
     path('trainer/infinite_question_stats/', trainer_view.get_infinite_question_stats,
          name='get_infinite_question_stats'),
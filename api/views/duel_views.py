@@ -1,16 +1,28 @@
 import random
+from datetime import datetime, timedelta, timezone as datetime_timezone
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
-from django.db import transaction
-from django.db.models import Q
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
-from api.bot_duels import advance_bot, available_bot_user
+from api.bot_duels import apply_bot_progress, claim_bot
+from api.duel_events import publish_room_event, room_event_stream
+from api.duel_results import history_payload, results_payload
+from api.matchmaking import BOT_FALLBACK_SECONDS, find_match
 from api.models import DuelEmote, Room, TestPrepUserStats, TrackedQuestion, usable_duel_emotes
+from api.question_bank import get_many as question_payloads
+from api.room_reaper import finish_room, sweep as sweep_rooms
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
 from api.views.serializers import RoomSerializer, TrackedQuestionSerializer, TrackedQuestionResultSerializer
 
 BOT_EMOTE_MODES = ('none', 'single', 'spam')
@@ -20,6 +32,12 @@ def _room_for_user(room_id, user):
     return get_object_or_404(Room, Q(user1=user) | Q(user2=user), id=room_id)
 
 
+def _tracked_questions_payload(queryset):
+    tracked = list(queryset)
+    questions = question_payloads([row.question_id for row in tracked])
+    return TrackedQuestionSerializer(tracked, many=True, context={'questions': questions}).data
+
+
 def _player_payload(user, test_prep):
     profile = user.profile
     return {
@@ -53,6 +71,9 @@ def _schedule_bot_emotes(room, bot, now, count):
 @permission_classes([IsAuthenticated])
 def match(request):
     test_prep = request.user.profile.active_test_prep_id
+    # Clears stale searches and this user's own overdue battle, either of
+    # which would block them below; reap_rooms settles everyone else's.
+    sweep_rooms(request.user)
     with transaction.atomic():
         user_in_room = Room.objects.filter(
             Q(user1=request.user, status__in=['Searching', 'Battling']) |
@@ -62,22 +83,12 @@ def match(request):
         if user_in_room:
             return Response({'error': 'You are already matching or in a room'}, status=400)
 
-        room = (
-            Room.objects.select_for_update()
-            .filter(user2__isnull=True, status='Searching', test_prep_id=test_prep)
-            .exclude(user1=request.user)
-            .first()
-        )
-
-        if room:
-            room.user2 = request.user
-            room.status = 'Battling'
-            room.save()
+        room, matched, wait = find_match(request.user, test_prep)
+        if matched:
             return Response({'id': room.id, 'full': 'true'}, status=200)
-        room = Room.objects.create(user1=request.user, status='Searching', test_prep_id=test_prep)
 
     serializer = RoomSerializer(room)
-    return Response(serializer.data, status=200)
+    return Response({**serializer.data, 'expected_wait': wait}, status=200)
 
 
 @api_view(['POST'])
@@ -95,8 +106,7 @@ def get_match_questions(request):
         return Response({'error': 'Room does not exist'}, status=404)
 
     tracked_questions = TrackedQuestion.objects.filter(user=user, room=room).order_by('id')
-    serializer = TrackedQuestionSerializer(tracked_questions, many=True)
-    return Response(serializer.data)
+    return Response(_tracked_questions_payload(tracked_questions))
 
 
 @api_view(['POST'])
@@ -127,6 +137,7 @@ def update_match_question(request):
     correct = track_question.question.answer_text == selected_choice
     track_question.status = 'Correct' if correct else 'Incorrect'
     track_question.save(update_fields=['status'])
+    publish_room_event(track_question.room_id)
     return Response({'status': 'success', 'result': 'correct' if correct else 'incorrect'})
 
 
@@ -148,13 +159,9 @@ def get_room_status(request):
             return Response({'status': 'full'})
 
         elapsed = (timezone.now() - room.created_at).total_seconds()
-        should_add_opponent = elapsed >= 10 or (elapsed >= 5 and random.random() < 0.35)
+        should_add_opponent = elapsed >= BOT_FALLBACK_SECONDS or (elapsed >= 5 and random.random() < 0.35)
         if room.status == 'Searching' and should_add_opponent:
-            bot = available_bot_user(exclude_user=request.user)
-            if bot:
-                room.user2 = bot
-                room.status = 'Battling'
-                room.save(update_fields=['user2', 'status'])
+            if claim_bot(room, exclude_user=request.user):
                 return Response({'status': 'full'})
     return Response({'status': 'waiting'})
 
@@ -168,12 +175,11 @@ def get_opponent_progres(request):
     room = _room_for_user(room_id, request.user)
     user = request.user
     opponent = room.user1 if user != room.user1 else room.user2
+    opponent_tracked_questions = list(TrackedQuestion.objects.filter(user=opponent, room=room).order_by('id'))
     if opponent and opponent.profile.is_bot:
-        # ponytail: polling advances bots; add a worker only when realtime scale needs one.
-        advance_bot(room, opponent)
-    opponent_tracked_questions = TrackedQuestion.objects.filter(user=opponent, room=room).order_by('id')
-    serializer = TrackedQuestionSerializer(opponent_tracked_questions, many=True)
-    return Response(serializer.data)
+        # The bot's answers come from its precomputed timeline; end_match writes them.
+        apply_bot_progress(room, opponent, opponent_tracked_questions)
+    return Response(_tracked_questions_payload(opponent_tracked_questions))
 
 
 @api_view(['GET'])
@@ -204,8 +210,7 @@ def get_end_time(request):
     room_id = data.get('room_id')
     room = _room_for_user(room_id, request.user)
     if room.battle_start_time is None:
-        room.battle_start_time = timezone.now()
-        room.save(update_fields=['battle_start_time'])
+        room.start_clock()
     end_time = room.battle_start_time + timezone.timedelta(seconds=room.battle_duration)
 
     return Response({
@@ -222,17 +227,18 @@ def end_match(request):
     room = _room_for_user(room_id, request.user)
     if room.status == 'Ended':
         return Response({'status': 'success'})
-    for player in (room.user1, room.user2):
-        if player.profile.is_bot:
-            advance_bot(room, player)
-    both_finished = not TrackedQuestion.objects.filter(room=room, status='Blank').exists()
-    if not both_finished and not room.is_battle_ended():
+    bots = [player for player in (room.user1, room.user2) if player.profile.is_bot]
+    blanks = TrackedQuestion.objects.filter(room=room, status='Blank').exclude(user__in=bots).exists()
+    for bot in bots:
+        if blanks:
+            break
+        rows = list(TrackedQuestion.objects.filter(room=room, user=bot).order_by('id'))
+        apply_bot_progress(room, bot, rows)
+        blanks = any(tracked.status == 'Blank' for tracked in rows)
+    if blanks and not room.is_battle_ended():
         return Response({'error': 'The duel is still in progress.'}, status=409)
-    room.user1_score = TrackedQuestion.objects.filter(room=room, user=room.user1, status='Correct').count()
-    room.user2_score = TrackedQuestion.objects.filter(room=room, user=room.user2, status='Correct').count()
-    room.status = 'Ended'
-    room.save(update_fields=['user1_score', 'user2_score', 'status'])
-
+    # Both players call this; finish() settles Elo for whichever call wins.
+    finish_room(room)
     return Response({'status': 'success'})
 
 
@@ -243,6 +249,9 @@ def get_results(request):
     data = request.data
     room_id = data.get('room_id')
     room = _room_for_user(room_id, request.user)
+    if room.result is not None:
+        return Response(results_payload(room.result, request.user.id))
+    # Rooms ended before result documents existed are rebuilt live.
     tracked_questions_user1 = TrackedQuestion.objects.filter(user=room.user1, room=room).order_by('id')
     tracked_questions_user2 = TrackedQuestion.objects.filter(user=room.user2, room=room).order_by('id')
     serializer_user1 = TrackedQuestionResultSerializer(tracked_questions_user1, many=True)
@@ -294,7 +303,8 @@ def cancel_match(request):
     data = request.data
     room_id = data.get('room_id')
     room = get_object_or_404(Room, id=room_id, user1=request.user, status='Searching')
-    room.delete()
+    if not room.cancel():
+        return Response({'error': 'An opponent already joined this match.'}, status=409)
     return Response({'status': 'success'})
 
 
@@ -302,8 +312,8 @@ def cancel_match(request):
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
 def get_match_history(request, user_id=None):
-    """Ended duels for a user, newest first. Was defined twice with an N+1
-    on the nested user serializers; now single, select_related, capped."""
+    """Ended duels for a user, newest first, served from the rooms' result
+    documents; only rooms that predate them go through RoomSerializer."""
     if user_id:
         try:
             user = User.objects.get(id=user_id)
@@ -317,19 +327,113 @@ def get_match_history(request, user_id=None):
     except ValueError:
         limit = 20
 
-    rooms = (
-        Room.objects
-        .filter(
-            Q(user1=user) | Q(user2=user),
-            status='Ended',
-            test_prep_id=request.user.profile.active_test_prep_id,
+    ended = Room.objects.filter(
+        Q(user1=user) | Q(user2=user),
+        status='Ended',
+        test_prep_id=request.user.profile.active_test_prep_id,
+    )
+    documents = list(ended.order_by('-created_at').values_list('id', 'result')[:limit])
+    legacy_ids = [room_id for room_id, document in documents if document is None]
+    legacy = {}
+    if legacy_ids:
+        rooms = (
+            Room.objects.filter(id__in=legacy_ids)
+            .select_related('user1__profile', 'user2__profile', 'winner')
+            .prefetch_related('user1__test_prep_stats', 'user2__test_prep_stats')
         )
-        .select_related('user1__profile', 'user2__profile', 'winner')
-        .prefetch_related('user1__test_prep_stats', 'user2__test_prep_stats')
-        .order_by('-created_at')[:limit]
+        legacy = {row['id']: row for row in RoomSerializer(rooms, many=True).data}
+    return Response([
+        legacy[room_id] if document is None else history_payload(document)
+        for room_id, document in documents
+    ])
+
+
+HISTORY_PAGE_SIZE = 20
+HISTORY_MAX_PAGE_SIZE = 100
+HISTORY_CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=datetime_timezone.utc)
+
+
+def _history_side(rooms, me, them):
+    """Ended rooms where the user sat in `me`, projected from their side."""
+    return rooms.values(
+        room_id=F('id'),
+        played_at=F('created_at'),
+        winner_user_id=F('winner_id'),
+        opponent_id=F(f'{them}_id'),
+        opponent_username=F(f'{them}__username'),
+        opponent_avatar=F(f'{them}__profile__avatar'),
+        opponent_avatar_icon=F(f'{them}__profile__avatar_icon'),
+        score=F(f'{me}_score'),
+        opponent_score=F(f'{them}_score'),
+        elo_before=F(f'{me}_elo_before'),
+        elo_after=F(f'{me}_elo_after'),
     )
-    serializer = RoomSerializer(rooms, many=True)
-    return Response(serializer.data)
+
+
+def _history_cursor(row):
+    """`<created_at in epoch microseconds>_<room id>`: digits only, safe unencoded in a URL."""
+    micros = (row['played_at'] - HISTORY_CURSOR_EPOCH) // timedelta(microseconds=1)
+    return f"{micros}_{row['room_id']}"
+
+
+def _parse_history_cursor(raw):
+    """A _history_cursor -> (datetime, int); raises ValueError when malformed."""
+    micros, _, room_id = raw.partition('_')
+    if not (micros.isdigit() and room_id.isdigit()):
+        raise ValueError(raw)
+    return HISTORY_CURSOR_EPOCH + timedelta(microseconds=int(micros)), int(room_id)
+
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def match_history(request, user_id=None):
+    """Compact duel history, newest first, paged by a (created_at, id) cursor.
+
+    Each side of the room (user as user1, user as user2) is its own keyset
+    range over a partial index on ended rooms; where the database can limit
+    inside a UNION both ranges are cut to one page before merging, so a page
+    costs the same however long the history is.
+    """
+    user_id = user_id or request.user.id
+    try:
+        limit = min(HISTORY_MAX_PAGE_SIZE, max(1, int(request.GET.get('limit', HISTORY_PAGE_SIZE))))
+    except ValueError:
+        limit = HISTORY_PAGE_SIZE
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            cursor = _parse_history_cursor(cursor)
+        except ValueError:
+            return Response({'error': 'Invalid cursor.'}, status=400)
+
+    ended = Room.objects.filter(status='Ended', test_prep_id=request.user.profile.active_test_prep_id)
+    if cursor:
+        played_at, room_id = cursor
+        ended = ended.filter(Q(created_at__lt=played_at) | Q(created_at=played_at, id__lt=room_id))
+    newest = ('-played_at', '-room_id')
+    as_user1 = _history_side(ended.filter(user1_id=user_id), 'user1', 'user2')
+    as_user2 = _history_side(ended.filter(user2_id=user_id), 'user2', 'user1')
+    if connection.features.supports_slicing_ordering_in_compound:
+        as_user1 = as_user1.order_by(*newest)[:limit + 1]
+        as_user2 = as_user2.order_by(*newest)[:limit + 1]
+    page = list(as_user1.union(as_user2, all=True).order_by(*newest)[:limit + 1])
+
+    results = []
+    for row in page[:limit]:
+        before, after = row.pop('elo_before'), row.pop('elo_after')
+        winner = row.pop('winner_user_id')
+        results.append({
+            **row,
+            'outcome': 'draw' if winner is None else 'win' if winner == user_id else 'loss',
+            'elo_after': after,
+            'elo_change': after - before if before is not None and after is not None else None,
+        })
+    last = page[limit - 1] if len(page) > limit else None
+    return Response({
+        'results': results,
+        'next_cursor': _history_cursor(last) if last else None,
+    })
 
 
 @api_view(['POST'])
@@ -378,6 +482,8 @@ def duel_emotes(request):
                 _schedule_bot_emotes(room, opponent, now, 1)
             elif mode == 'spam' and cooled_down:
                 _schedule_bot_emotes(room, opponent, now, random.randint(2, 4))
+        # Scheduled bot replies ride along: streams hold them until visible_at.
+        publish_room_event(room.id)
 
     if opponent and opponent.profile.is_bot:
         mode = _bot_emote_mode(opponent)
@@ -395,3 +501,44 @@ def duel_emotes(request):
         .values('id', 'sender_id', 'emoji', 'visible_at')[:20]
     )
     return Response({'emotes': list(reversed(emotes))})
+
+
+def _stream_user(request):
+    """JWT user for the event stream: Authorization header, or ?token= for
+    EventSource clients that cannot set headers."""
+    auth = JWTAuthentication()
+    try:
+        raw = request.GET.get('token')
+        if raw:
+            return auth.get_user(auth.get_validated_token(raw))
+        result = auth.authenticate(request)
+    except (AuthenticationFailed, InvalidToken):
+        return None
+    return result[0] if result else None
+
+
+@require_GET
+async def duel_events(request, room_id):
+    """Server-sent events for a live duel (see api.duel_events).
+
+    Replaces the status/progress/end-time/emote polling loops for new
+    clients; the polling endpoints stay for old ones. Only the ASGI events
+    app streams (see satduel.asgi); under WSGI Django would buffer the whole
+    stream and hold a worker thread for the battle, so the WSGI app answers
+    501 instead.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'Live events are served by the events app.'}, status=501)
+    user = await sync_to_async(_stream_user)(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication required.'}, status=401)
+    in_room = await sync_to_async(
+        Room.objects.filter(Q(user1=user) | Q(user2=user), id=room_id).exists
+    )()
+    if not in_room:
+        return JsonResponse({'error': 'Room does not exist'}, status=404)
+
+    response = StreamingHttpResponse(room_event_stream(room_id, user), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,12 +1,17 @@
 """Party Mode: Kahoot-style live quiz rooms.
 
 Clients poll `party_state` about once a second; the room's `advance()` derives
-phase transitions from timestamps, so no worker or websocket is needed.
+phase transitions from timestamps, so no worker or websocket is needed. Every
+visible mutation calls PartyRoom.bump_state, so an unchanged poll is a 304.
+Player moves go through `_seat_move`, which can run them against the optional
+cache-backed hot state (api/party_engine.py) instead of the room row lock.
 """
 import random
 
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import Prefetch, Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
@@ -14,6 +19,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from api import party_engine, party_presence
 from api.models import (
     DuelEmote,
     PARTY_COUNTDOWN_SECONDS,
@@ -27,6 +33,12 @@ from api.models import (
     party_lives_cap,
     usable_duel_emotes,
 )
+from api.question_bank import (
+    get_many as question_payloads,
+    get_payload as question_payload,
+    merge_entry,
+    payload_entries,
+)
 
 # Free-tier vs premium ceilings for room settings.
 CAPS = {
@@ -37,6 +49,8 @@ CAPS = {
 # over a long game, without ever exposing the whole bank.
 GOLD_POOL = {'free': 30, 'premium': 100}
 GOLD_LOCKOUT_SECONDS = 3  # wrong-answer penalty before the next question
+# A Gold Rush pool stays cached this long past the room's own clock.
+GOLD_POOL_GRACE_SECONDS = 10 * 60
 
 
 def _roll_reward():
@@ -97,7 +111,28 @@ def _player_entry(player, index_key):
     }
 
 
-def _gold_view(player):
+def _gold_pool(room):
+    """{question id: payload entry} for a Gold Rush room's whole pool.
+
+    Materialized at start_party and kept for the game, so polls and answer
+    checks never touch the question table; a worker that misses it rebuilds
+    it in one query. The room plays the questions as they were at kickoff.
+    """
+    key = f'party:gold-pool:{room.id}'
+    pool = cache.get(key)
+    if pool is None:
+        pool = payload_entries(room.question_ids)
+        ttl = PARTY_COUNTDOWN_SECONDS + room.time_limit + GOLD_POOL_GRACE_SECONDS
+        cache.set(key, pool, ttl)
+    return pool
+
+
+def _gold_question(room, question_id, review=False):
+    entry = _gold_pool(room).get(question_id)
+    return None if entry is None else merge_entry(entry, review)
+
+
+def _gold_view(room, player):
     """The player's current Gold Rush screen: question, wrong-answer, chest, or target pick."""
     now = timezone.now()
     view = {'gold': player.score}
@@ -107,15 +142,15 @@ def _gold_view(player):
         # Wrong answer: show the right one until the penalty clears.
         view['phase'] = 'wrong'
         view['seconds'] = max(0.0, (player.gq_locked_until - now).total_seconds())
-        q = Question.objects.filter(id=pending.get('question')).first()
+        q = _gold_question(room, pending['question'], review=True) if pending.get('question') else None
         if q:
-            view['correct_choice'] = q.answer
+            view['correct_choice'] = q['answer']
             view['review'] = {
-                'question': q.question,
-                'choices': [q.choice_a, q.choice_b, q.choice_c, q.choice_d],
-                'correct_choice': q.answer,
+                'question': q['question'],
+                'choices': q['choices'],
+                'correct_choice': q['answer'],
                 'your_choice': pending.get('choice'),
-                'explanation': q.explanation or '',
+                'explanation': q['explanation'],
             }
         return view
 
@@ -134,16 +169,16 @@ def _gold_view(player):
 
     view['phase'] = 'question'
     qid = player.gold_question_id()
-    q = Question.objects.filter(id=qid).first() if qid else None
+    q = _gold_question(room, qid) if qid else None
     if q:
-        view['question'] = {
-            'id': q.id,
-            'question': q.question,
-            'choices': [q.choice_a, q.choice_b, q.choice_c, q.choice_d],
-        }
+        view['question'] = _question_card(q)
     return view
 
 
+def _question_card(payload):
+    return {'id': payload['id'], 'question': payload['question'], 'choices': payload['choices']}
+
+
 def _team_standings(room, entries):
     """Group player entries into teams, ranked by total score."""
     teams = []
@@ -249,20 +284,20 @@ def _history_questions(room, player):
             for index, question_id in enumerate(question_ids)
         ]
 
-    questions = Question.objects.in_bulk(question_ids)
+    questions = question_payloads(question_ids, review=True)
     review = []
     for index, question_id, answer in entries:
         question = questions.get(question_id)
         if not question:
             continue
         review.append({
-            'id': question.id,
+            'id': question['id'],
             'number': index + 1,
-            'question': question.question,
-            'choices': [question.choice_a, question.choice_b, question.choice_c, question.choice_d],
-            'correct_choice': question.answer,
-            'correct_text': question.answer_text,
-            'explanation': question.explanation or '',
+            'question': question['question'],
+            'choices': question['choices'],
+            'correct_choice': question['answer'],
+            'correct_text': question['answer_text'],
+            'explanation': question['explanation'],
             'your_choice': answer.get('choice'),
             'correct': answer.get('correct') if answer else None,
             'points': answer.get('points', 0),
@@ -286,7 +321,12 @@ def create_party(request):
     mode = data.get('mode') if data.get('mode') in PartyRoom.MODES else 'classic'
 
     # One live room per host: a new room supersedes any the user abandoned.
-    PartyRoom.objects.filter(host=request.user).exclude(status='finished').update(status='finished')
+    # Each goes through bump_state so its pollers see the change (and a hot
+    # room's cached seats are written back).
+    for stale in PartyRoom.objects.filter(host=request.user).exclude(status='finished'):
+        stale.status = 'finished'
+        stale.save(update_fields=['status'])
+        stale.bump_state(room_wide=True)
 
     num_questions = _clamp(data.get('num_questions'), 2 if mode == 'jeopardy' else 1,
                            caps['num_questions'], 10)
@@ -332,7 +372,9 @@ def join_party(request):
     if room.players.count() >= room.max_players:
         return Response({'error': 'That room is full.'}, status=400)
 
-    PartyPlayer.objects.get_or_create(room=room, user=request.user)
+    player, created = PartyPlayer.objects.get_or_create(room=room, user=request.user)
+    if created:
+        room.bump_state(players=[player])
     return Response({'id': room.id})
 
 
@@ -379,6 +421,7 @@ def send_party_emote(request, room_id):
         DuelEmote(party_room=room, sender=request.user, emoji=emoji, visible_at=now)
         for emoji in emojis
     ])
+    room.bump_state()
     reactions = [
         {
             'id': emote.id,
@@ -443,6 +486,7 @@ def start_party(request, room_id):
         room.save(update_fields=['lives'])
         room.players.update(lives=room.lives)
     if room.mode == 'goldrush':
+        _gold_pool(room)  # materialize the pool before the first poll
         # Everyone walks their own shuffle of the same pool, so nobody is in lockstep.
         for player in room.players.all():
             deck = room.question_ids[:]
@@ -452,29 +496,71 @@ def start_party(request, room_id):
             player.gq_pending = None
             player.gq_locked_until = None
             player.save(update_fields=['gq_deck', 'gq_index', 'gq_pending', 'gq_locked_until'])
+    room.bump_state(room_wide=True)
     return Response({'status': 'countdown'})
 
 
+def _seat_move(request, room_id, move):
+    """Run one player's move: `move(room, player, seat)` -> (data, status, changed seats).
+
+    `seat(user_id)` loads another player's seat for moves that touch two. By
+    default the move holds the room row (select_for_update) and saves the
+    changed seats; with settings.PARTY_HOT_STATE it runs against the cached
+    seats under the room's cache lock instead (party_engine.apply). The room
+    advances before the move and again after it, since the move may have
+    been the last one the phase was waiting on.
+    """
+    if party_engine.enabled():
+        room = get_object_or_404(PartyRoom, id=room_id)
+        roster = room.roster()
+        room.advance(roster)
+        player = _seat_of(roster, request.user.id)
+        try:
+            data, status = party_engine.apply(room, player, move)
+        except party_engine.RoomBusy:
+            return Response({'error': 'The room is busy, try again.'}, status=503)
+        room.advance(roster)
+        return Response(data, status=status)
+
+    with transaction.atomic():
+        room = get_object_or_404(PartyRoom.objects.select_for_update(), id=room_id)
+        roster = room.roster()
+        room.advance(roster)
+        player = _seat_of(roster, request.user.id)
+        data, status, changed = move(
+            room, player, lambda user_id: next((seat for seat in roster if str(seat.user_id) == str(user_id)), None),
+        )
+        if changed:
+            PartyPlayer.objects.bulk_update(changed, party_engine.SEAT_FIELDS)
+            room.bump_state(players=changed)
+            room.advance(roster)
+    return Response(data, status=status)
+
+
+def _seat_of(roster, user_id):
+    """`user_id`'s seat in a loaded roster; 404s for anyone not in the room."""
+    seat = next((seat for seat in roster if seat.user_id == user_id), None)
+    if seat is None:
+        raise Http404
+    return seat
+
+
 @api_view(['POST'])
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
 def answer_party_question(request, room_id):
-    with transaction.atomic():
-        room = get_object_or_404(PartyRoom.objects.select_for_update(), id=room_id)
-        room.advance()
-        if room.status != 'question':
-            return Response({'error': 'Not accepting answers right now.'}, status=400)
+    choice = str(request.data.get('choice', '')).upper()
 
-        player = get_object_or_404(PartyPlayer, room=room, user=request.user)
+    def move(room, player, seat):
+        if room.status != 'question':
+            return {'error': 'Not accepting answers right now.'}, 400, []
         key = str(room.current_index)
         if key in player.answers:
-            return Response({'error': 'Already answered.'}, status=400)
+            return {'error': 'Already answered.'}, 400, []
         if room.eliminates() and player.lives <= 0:
-            return Response({'error': "You're out — you can only watch now."}, status=400)
-
-        choice = str(request.data.get('choice', '')).upper()
+            return {'error': "You're out — you can only watch now."}, 400, []
         if choice not in ('A', 'B', 'C', 'D'):
-            return Response({'error': 'Invalid choice.'}, status=400)
+            return {'error': 'Invalid choice.'}, 400, []
 
         question = Question.objects.get(id=room.current_question_id())
         elapsed = (timezone.now() - room.phase_started_at).total_seconds()
@@ -498,9 +584,9 @@ def answer_party_question(request, room_id):
         entry['points'] = points
         player.answers[key] = entry
         player.score += points
-        player.save()
-        room.advance()  # everyone may have answered now
-    return Response({'answered': True})
+        return {'answered': True}, 200, [player]
+
+    return _seat_move(request, room_id, move)
 
 
 @api_view(['POST'])
@@ -519,6 +605,7 @@ def next_party_question(request, room_id):
         room.status = 'wager' if room.is_wager_question() else 'question'
     room.phase_started_at = timezone.now()
     room.save(update_fields=['status', 'current_index', 'phase_started_at'])
+    room.bump_state(room_wide=True)
     return Response({'status': room.status})
 
 
@@ -527,22 +614,18 @@ def next_party_question(request, room_id):
 @permission_classes([IsAuthenticated])
 def place_party_wager(request, room_id):
     """Lock in a Final Jeopardy bet before the last question is revealed."""
-    with transaction.atomic():
-        room = get_object_or_404(PartyRoom.objects.select_for_update(), id=room_id)
-        room.advance()
+    def move(room, player, seat):
         if room.status != 'wager':
-            return Response({'error': 'Bets are closed.'}, status=400)
-
-        player = get_object_or_404(PartyPlayer, room=room, user=request.user)
+            return {'error': 'Bets are closed.'}, 400, []
         if player.wager_locked:
-            return Response({'error': 'You already placed your bet.'}, status=400)
+            return {'error': 'You already placed your bet.'}, 400, []
 
         # You can only lose what you brought; everything else is clamped into range.
         player.wager = _clamp(request.data.get('amount'), 0, max(0, player.score), 0)
         player.wager_locked = True
-        player.save(update_fields=['wager', 'wager_locked'])
-        room.advance()  # everyone may have bet now
-    return Response({'wager': player.wager})
+        return {'wager': player.wager}, 200, [player]
+
+    return _seat_move(request, room_id, move)
 
 
 @api_view(['POST'])
@@ -550,44 +633,41 @@ def place_party_wager(request, room_id):
 @permission_classes([IsAuthenticated])
 def gold_rush_answer(request, room_id):
     """Answer the player's current Gold Rush question. Correct earns a chest."""
-    with transaction.atomic():
-        room = get_object_or_404(PartyRoom.objects.select_for_update(), id=room_id)
-        room.advance()
-        if room.mode != 'goldrush' or room.status != 'playing':
-            return Response({'error': 'Not accepting answers right now.'}, status=400)
+    choice = str(request.data.get('choice', '')).upper()
 
-        player = get_object_or_404(PartyPlayer, room=room, user=request.user)
+    def move(room, player, seat):
+        if room.mode != 'goldrush' or room.status != 'playing':
+            return {'error': 'Not accepting answers right now.'}, 400, []
         now = timezone.now()
         if player.gq_locked_until and now < player.gq_locked_until:
-            return Response({'error': 'Hold on a moment.'}, status=400)
+            return {'error': 'Hold on a moment.'}, 400, []
         if player.gq_pending:
-            return Response({'error': 'Open your chest first.'}, status=400)
-
-        choice = str(request.data.get('choice', '')).upper()
+            return {'error': 'Open your chest first.'}, 400, []
         if choice not in ('A', 'B', 'C', 'D'):
-            return Response({'error': 'Invalid choice.'}, status=400)
+            return {'error': 'Invalid choice.'}, 400, []
 
-        question = Question.objects.get(id=player.gold_question_id())
+        question_id = player.gold_question_id()
+        answer = _gold_pool(room)[question_id]['review']['answer']
         attempt = 1 + max(
             (int(key[1:]) for key in player.answers if key.startswith('g') and key[1:].isdigit()),
             default=-1,
         )
         player.answers[f'g{attempt}'] = {
-            'question_id': question.id,
+            'question_id': question_id,
             'choice': choice,
-            'correct': choice == question.answer,
+            'correct': choice == answer,
             'points': 0,
         }
-        if choice == question.answer:
+        if choice == answer:
             player.gq_pending = {'kind': 'chest', 'options': [_roll_reward() for _ in range(3)], 'picked': None}
-            player.save()
-            return Response({'correct': True})
+            return {'correct': True}, 200, [player]
 
         # Wrong: a short penalty, then the next question (handled by gold_rush_tick).
         player.gq_locked_until = now + timezone.timedelta(seconds=GOLD_LOCKOUT_SECONDS)
-        player.gq_pending = {'kind': 'wrong', 'question': question.id, 'choice': choice}
-        player.save()
-        return Response({'correct': False, 'correct_choice': question.answer})
+        player.gq_pending = {'kind': 'wrong', 'question': question_id, 'choice': choice}
+        return {'correct': False, 'correct_choice': answer}, 200, [player]
+
+    return _seat_move(request, room_id, move)
 
 
 @api_view(['POST'])
@@ -595,16 +675,12 @@ def gold_rush_answer(request, room_id):
 @permission_classes([IsAuthenticated])
 def gold_rush_chest(request, room_id):
     """Open a chosen Gold Rush chest, then apply its reward (targeted or not)."""
-    with transaction.atomic():
-        room = get_object_or_404(PartyRoom.objects.select_for_update(), id=room_id)
-        room.advance()
+    def move(room, player, seat):
         if room.mode != 'goldrush' or room.status != 'playing':
-            return Response({'error': 'The game is over.'}, status=400)
-
-        player = get_object_or_404(PartyPlayer, room=room, user=request.user)
+            return {'error': 'The game is over.'}, 400, []
         pending = player.gq_pending or {}
         if pending.get('kind') != 'chest':
-            return Response({'error': 'No chest to open.'}, status=400)
+            return {'error': 'No chest to open.'}, 400, []
 
         options = pending.get('options') or []
         # A chosen chest is locked in, so the follow-up target step can't reroll it.
@@ -619,10 +695,10 @@ def gold_rush_chest(request, room_id):
         if kind in ('steal', 'swap') and target_id is None:
             pending['picked'] = pick
             player.gq_pending = pending
-            player.save()
-            return Response({'needs_target': True, 'kind': kind})
+            return {'needs_target': True, 'kind': kind}, 200, [player]
 
         result = {'kind': kind}
+        changed = [player]
         if kind == 'gold':
             player.score += reward['amount']
             result['amount'] = reward['amount']
@@ -635,9 +711,9 @@ def gold_rush_chest(request, room_id):
             player.score -= loss
             result['amount'] = -loss
         else:  # steal / swap — both need a valid opponent
-            target = room.players.filter(user_id=target_id).exclude(user_id=player.user_id).first()
+            target = seat(target_id) if str(target_id) != str(player.user_id) else None
             if not target:
-                return Response({'error': 'Pick another player.'}, status=400)
+                return {'error': 'Pick another player.'}, 400, []
             if kind == 'steal':
                 taken = target.score * reward['pct'] // 100
                 target.score -= taken
@@ -647,13 +723,14 @@ def gold_rush_chest(request, room_id):
                 player.score, target.score = target.score, player.score
                 result['amount'] = player.score
             result['target'] = target.user.username
-            target.save(update_fields=['score'])
+            changed.append(target)
 
         player.gq_pending = None
-        player.gq_index += 1
-        player.save()
+        player.next_gold_question()
         result['gold'] = player.score
-        return Response(result)
+        return result, 200, changed
+
+    return _seat_move(request, room_id, move)
 
 
 @api_view(['POST'])
@@ -690,6 +767,7 @@ def update_party_teams(request, room_id):
         for user_id, team in (data.get('assignments') or {}).items():
             seat = None if team is None else _clamp(team, 0, room.num_teams - 1, None)
             room.players.filter(user_id=user_id).update(team=seat)
+    room.bump_state(room_wide=True)
     return Response({'ok': True})
 
 
@@ -699,6 +777,7 @@ def update_party_teams(request, room_id):
 def leave_party(request, room_id):
     room = get_object_or_404(PartyRoom, id=room_id)
     player = room.players.filter(user=request.user)
+    party_presence.forget(room.id, request.user.id)
     if room.status == 'lobby':
         player.delete()
     else:
@@ -707,6 +786,7 @@ def leave_party(request, room_id):
         player.update(
             last_seen=timezone.now() - timezone.timedelta(seconds=PARTY_PRESENCE_TIMEOUT_SECONDS + 1),
         )
+    room.bump_state(room_wide=True)
     # Empty room closes; a departing host hands off to the next player.
     room.sync_presence()
     return Response({'left': True})
@@ -765,20 +845,90 @@ def party_history_detail(request, room_id):
     return Response(detail)
 
 
+# What a delta carries besides the changed players: everything else in the
+# full state only moves with a room-wide change or the viewer's own seat.
+DELTA_KEYS = ('id', 'version', 'status', 'server_time', 'seconds_left', 'reactions', 'teams', 'survivors', 'wager')
+
+
+def _since(request):
+    try:
+        return int(request.query_params['since'])
+    except (KeyError, ValueError):
+        return None
+
+
 @api_view(['GET'])
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
 def party_state(request, room_id):
-    room = get_object_or_404(PartyRoom, id=room_id)
-    player = room.players.filter(user=request.user).first()
+    """The viewer's room state, versioned by PartyRoom.state_version.
+
+    Clients send back the ETag (If-None-Match) or the `version` (?since=) of
+    the last state they hold: an unchanged room answers 304, and a room where
+    only some seats changed since then answers a delta ({'delta': True, ...}
+    with just those players). `server_time` lets a client that keeps an old
+    payload keep its timers honest.
+    """
+    room = get_object_or_404(PartyRoom.objects.select_related('host'), id=room_id)
+    # Read before the roster, so a payload is never older than its version.
+    version = party_engine.version(room)
+    roster = room.roster()  # the only seat fetch, shared with advance()
+    player = next((seat for seat in roster if seat.user_id == request.user.id), None)
     if not player:
         return Response({'error': 'You are not in this room.'}, status=403)
-    player.save(update_fields=['last_seen'])  # auto_now heartbeat
-    room.advance()
+    party_presence.heartbeat(player)
+    stamped = room.state_version
+    room.advance(roster)
+    if room.mode == 'goldrush' and room.status == 'playing':
+        _gold_rush_tick(room, player)
+    if room.state_version != stamped:
+        # This poll moved the room itself, so the new version may cover other
+        # requests' changes too; re-read the seats to match it.
+        version = party_engine.version(room)
+        roster = room.roster()
+        player = next(seat for seat in roster if seat.user_id == request.user.id)
+
+    etag = f'"party-{room.id}-{request.user.id}-{version}"'
+    since = _since(request)
+    if since == version or etag in request.headers.get('If-None-Match', '').replace('W/', '').split(', '):
+        return Response(status=304, headers={'ETag': etag})
+
+    state = _party_state_payload(room, player, roster)
+    state['version'] = version
+    if since is not None and room.phase_version <= since < version and player.state_version <= since:
+        changed = {seat.user_id for seat in roster if seat.state_version > since}
+        state = {
+            **{key: state[key] for key in DELTA_KEYS if key in state},
+            'delta': True,
+            'players': [entry for entry in state['players'] if entry['id'] in changed],
+        }
+    return Response(state, headers={'ETag': etag})
+
+
+def _gold_rush_tick(room, player):
+    """Clear the viewer's expired wrong-answer lockout (PartyPlayer.gold_rush_tick)."""
+    if not party_engine.enabled():
+        if player.gold_rush_tick():
+            room.bump_state(players=[player])
+        return
+
+    def move(room, player, seat):
+        moved = room.status == 'playing' and player.gold_rush_tick(save=False)
+        return None, None, [player] if moved else []
 
+    # Only take the room's lock when the cached seat says there is something to clear.
+    party_engine.overlay(room, [player])
+    if player.gq_locked_until and timezone.now() >= player.gq_locked_until:
+        try:
+            party_engine.apply(room, player, move)
+        except party_engine.RoomBusy:
+            pass  # the next poll clears it
+
+
+def _party_state_payload(room, player, roster):
     now = timezone.now()
+    user = player.user
     key = str(room.current_index)
-    roster = list(room.players.select_related('user__profile').all())
     players = [_player_entry(p, key) for p in roster]
     if room.mode == 'survival':
         # Hearts decide it; the speed score is only the tiebreak.
@@ -789,10 +939,11 @@ def party_state(request, room_id):
     state = {
         'id': room.id,
         'code': room.code,
+        'server_time': now.isoformat(),
         'status': room.status,
         'started': bool(room.question_ids),  # lets the UI tell "host closed the lobby" from "game over"
-        'you': request.user.id,
-        'is_host': room.host_id == request.user.id,
+        'you': user.id,
+        'is_host': room.host_id == user.id,
         'host_username': room.host.username,
         'test_prep': room.test_prep_id,
         'mode': room.mode,
@@ -808,7 +959,7 @@ def party_state(request, room_id):
             'last_standing': room.last_standing,
         },
         'players': players,
-        'your_emotes': usable_duel_emotes(request.user.profile),
+        'your_emotes': usable_duel_emotes(user.profile),
         'reactions': list(reversed([
             {
                 'id': reaction.id,
@@ -834,9 +985,8 @@ def party_state(request, room_id):
         state['survivors'] = len(room.survivors(roster))
 
     if room.mode == 'goldrush' and room.status == 'playing':
-        player.gold_rush_tick()  # clear an expired wrong-answer lockout
         state['seconds_left'] = max(0.0, (room.game_deadline() - now).total_seconds())
-        state['gold'] = _gold_view(player)
+        state['gold'] = _gold_view(room, player)
 
     if room.status == 'countdown':
         ends = room.phase_started_at + timezone.timedelta(seconds=PARTY_COUNTDOWN_SECONDS)
@@ -850,19 +1000,15 @@ def party_state(request, room_id):
             'waiting_on': sum(1 for p in roster if not p.wager_locked and p.score > 0),
         }
     elif room.status == 'question':
-        question = Question.objects.get(id=room.current_question_id())
+        question = question_payload(room.current_question_id())
         state['seconds_left'] = max(0.0, (room.question_deadline() - now).total_seconds())
         state['is_final_question'] = room.is_wager_question()
         if room.is_wager_question():
             state['your_wager'] = player.wager
-        state['question'] = {
-            'id': question.id,
-            'question': question.question,
-            'choices': [question.choice_a, question.choice_b, question.choice_c, question.choice_d],
-        }
+        state['question'] = _question_card(question)
         state['your_answer'] = player.answers.get(key, {}).get('choice')
     elif room.status == 'leaderboard':
-        question = Question.objects.get(id=room.current_question_id())
+        question = question_payload(room.current_question_id(), review=True)
         answer = player.answers.get(key, {})
         counts = {'A': 0, 'B': 0, 'C': 0, 'D': 0}
         skipped = 0
@@ -873,8 +1019,8 @@ def party_state(request, room_id):
             else:
                 skipped += 1
         state['reveal'] = {
-            'correct_choice': question.answer,
-            'correct_text': question.answer_text,
+            'correct_choice': question['answer'],
+            'correct_text': question['answer_text'],
             'your_choice': answer.get('choice'),
             'correct': answer.get('correct', False),
             'points_earned': answer.get('points', 0),
@@ -882,14 +1028,14 @@ def party_state(request, room_id):
             'was_final_bet': room.is_wager_question(),
             'lost_life': bool(answer.get('life_lost')),
             'your_lives': player.lives,
-            'is_last': room.game_is_over(),
+            'is_last': room.game_is_over(roster),
             'distribution': counts,
             'skipped': skipped,
             'review': {
-                'question': question.question,
-                'choices': [question.choice_a, question.choice_b, question.choice_c, question.choice_d],
-                'explanation': question.explanation or '',
+                'question': question['question'],
+                'choices': question['choices'],
+                'explanation': question['explanation'],
             },
         }
 
-    return Response(state)
+    return state
@@ -23,7 +23,9 @@ import hashlib
 import random
 
 from django.conf import settings
-from django.db.models import Count, F, Max, Q
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, Q
+from django.db.models.functions import Greatest, Least
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import (
@@ -36,17 +38,23 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from api import generation
+from api.practice_index import get_practice_index, invalidate_practice_index, note_question_rating
+from api.practice_state import bitmap_ids, has, load_practice_state, note_practice_answer, note_saved
+from api.question_bank import get_many as question_payloads, type_totals
 from api.models import (
     DEFAULT_TEST_PREP,
     PracticeActiveQuestion,
     PracticeAttempt,
+    PracticeDay,
     PracticeStats,
     PracticeTestResult,
     PracticeTypeStats,
+    Profile,
     Question,
+    RatingEvent,
     SavedQuestion,
+    UserQuestionState,
 )
-from api.views.serializers import QuestionSerializer
 
 # question_types are the official College Board skill names in the AI
 # generator's taxonomy — reused so the two never drift apart.
@@ -93,6 +101,10 @@ def practice_stats_breakdown(user):
             user=user, test_prep_id=DEFAULT_TEST_PREP,
         )
     }
+    return _breakdown_payload(rows, practice_current_streak(user))
+
+
+def _breakdown_payload(rows, current_streak):
     payload = {}
     for subject in SUBJECTS:
         row = rows.get(subject)
@@ -108,58 +120,30 @@ def practice_stats_breakdown(user):
         round(payload['practice_correct'] / payload['practice_answered'] * 100)
         if payload['practice_answered'] else None
     )
-    payload['current_streak'] = practice_current_streak(user)
+    payload['current_streak'] = current_streak
     return payload
 
 
-# Old name, kept so callers read naturally at both call sites.
-practice_attempt_breakdown = practice_stats_breakdown
-
-
-def record_practice_answer(user, question, correct, subject, selected_choice):
-    """Log the attempt and bump the subject's lifetime counters atomically."""
-    first_attempt = not PracticeAttempt.objects.filter(
-        user=user, test_prep_id=DEFAULT_TEST_PREP, question=question,
-    ).exists()
-    PracticeAttempt.objects.create(
-        user=user, test_prep_id=DEFAULT_TEST_PREP, question=question, correct=correct, subject=subject,
-        selected_choice=selected_choice,
-    )
-    stats = get_practice_stats(user, subject)
-    stats.answered = F('answered') + 1
-    if correct:
-        stats.correct = F('correct') + 1
-    stats.save(update_fields=['answered', 'correct'])
-
-    # Question-bank progress counts DISTINCT questions, so only the first
-    # attempt at a question moves the per-type counters (same rule as Elo).
-    if first_attempt and question.question_type:
-        type_stats, _ = PracticeTypeStats.objects.get_or_create(
-            user=user, test_prep_id=DEFAULT_TEST_PREP, subject=subject,
-            question_type=question.question_type,
-        )
-        type_stats.solved = F('solved') + 1
-        fields = ['solved']
-        if correct:
-            type_stats.correct = F('correct') + 1
-            fields.append('correct')
-        type_stats.save(update_fields=fields)
+def answer_stats_payload(breakdown):
+    """The `practice_stats` block check_answer returns (legacy keys + breakdown)."""
+    return {
+        'correct_number': breakdown['practice_correct'],
+        'incorrect_number': breakdown['practice_answered'] - breakdown['practice_correct'],
+        'answered': breakdown['practice_answered'],
+        **breakdown,
+    }
 
 
 def practice_type_progress(user, subjects=None):
     """Question-bank progress per type: solved (distinct attempted) vs total.
 
     Returns {subject: [{'type', 'solved', 'correct', 'total'}, ...]} in the
-    taxonomy's teaching order. Totals come from the live Question table, so
-    solved is clamped in case questions were deleted after being attempted.
+    taxonomy's teaching order. Totals are the cached per-version bank counts,
+    so solved is clamped in case questions were deleted after being attempted.
     """
     subjects = [s for s in (subjects or SUBJECTS) if s in SUBJECT_TYPES]
     types = [t for s in subjects for t in SUBJECT_TYPES[s]]
-    totals = {
-        row['question_type']: row['total']
-        for row in Question.objects.filter(test_prep_id=DEFAULT_TEST_PREP, question_type__in=types)
-        .values('question_type').annotate(total=Count('id'))
-    }
+    totals = type_totals()
     stats = {
         row.question_type: row
         for row in PracticeTypeStats.objects.filter(
@@ -185,14 +169,26 @@ def practice_type_progress(user, subjects=None):
 
 
 def practice_current_streak(user):
-    streak = 0
-    for correct in PracticeAttempt.objects.filter(
-        user=user, test_prep_id=DEFAULT_TEST_PREP,
-    ).order_by('-created_at', '-id').values_list('correct', flat=True):
-        if not correct:
-            break
-        streak += 1
-    return streak
+    """Current run of correct recorded answers (see Profile.practice_correct_streak)."""
+    profile = getattr(user, 'profile', None)
+    return profile.practice_correct_streak if profile else 0
+
+
+def _bump_correct_streak(profile, correct):
+    """Extend or reset the correct-answer run; returns the new value."""
+    if profile is None:
+        return 0
+    if correct:
+        Profile.objects.filter(pk=profile.pk).update(
+            practice_correct_streak=F('practice_correct_streak') + 1,
+            max_streak=Greatest('max_streak', F('practice_correct_streak') + 1),
+        )
+        profile.practice_correct_streak += 1
+        profile.max_streak = max(profile.max_streak, profile.practice_correct_streak)
+    else:
+        Profile.objects.filter(pk=profile.pk).update(practice_correct_streak=0)
+        profile.practice_correct_streak = 0
+    return profile.practice_correct_streak
 
 USER_K_PROVISIONAL = 32
 USER_K_STABLE = 16
@@ -210,17 +206,19 @@ def get_quota(user):
     """Return (used_today, limit, has_premium). limit is None for premium."""
     profile = getattr(user, 'profile', None)
     has_premium = bool(profile and profile.has_premium)
-    start, end = _local_day_bounds_utc(profile, _local_today(profile))
-    used = PracticeAttempt.objects.filter(
-        user=user, test_prep_id=DEFAULT_TEST_PREP, created_at__gte=start, created_at__lt=end,
-    ).count()
+    used = _attempts_on(user, profile, _local_today(profile))
     limit = None if has_premium else settings.FREE_DAILY_LIMIT
     return used, limit, has_premium
 
 
 def quota_payload(user):
-    used, limit, has_premium = get_quota(user)
-    profile = getattr(user, 'profile', None)
+    used, _, _ = get_quota(user)
+    return _quota_from(getattr(user, 'profile', None), used)
+
+
+def _quota_from(profile, used):
+    has_premium = bool(profile and profile.has_premium)
+    limit = None if has_premium else settings.FREE_DAILY_LIMIT
     _, reset_at = _local_day_bounds_utc(profile, _local_today(profile))
     return {
         'used': used,
@@ -246,40 +244,156 @@ def _clamp(rating):
     return max(RATING_MIN, min(RATING_MAX, int(rating)))
 
 
-def apply_practice_elo(user, question, correct):
-    """First-attempt-only rating update between a user and a question."""
-    subject = subject_of(question)
-    stats = get_practice_stats(user, subject)
-    previous_rating = stats.elo
+def _clamped_shift(field, delta):
+    """F() expression moving a rating column by `delta` within the clamp."""
+    return Greatest(RATING_MIN, Least(RATING_MAX, F(field) + delta))
 
-    already_attempted = PracticeAttempt.objects.filter(
-        user=user, test_prep_id=DEFAULT_TEST_PREP, question=question,
-    ).exists()
-    if already_attempted:
-        return {
-            'rated': False, 'subject': subject,
-            'previous_rating': previous_rating, 'new_rating': previous_rating, 'delta': 0,
-        }
 
-    total_attempts = PracticeAttempt.objects.filter(
+# ---------------------------------------------------------------------------
+# Answer pipeline (check_answer in practice mode)
+# ---------------------------------------------------------------------------
+
+def answer_practice_question(user, question, correct, selected_choice):
+    """Apply one practice-mode answer and build check_answer's fields.
+
+    The user's practice context (stats rows, attempted bitmap, today's answer
+    count) is loaded once up front; Elo, counters, the attempt row and the
+    streaks are written in one transaction with F() updates; the response is
+    built from the in-memory context instead of re-reading it.
+
+    A repeat sighting of an answered question is a review (surfaced by the
+    done-before/result filters): it is graded but never charges the quota,
+    moves Elo, touches lifetime stats, or extends the daily streak. Only the
+    first attempt at a question moves Elo, the per-type progress counters, and
+    the quota.
+
+    Returns (payload, error_status); on error the payload is the error body.
+    """
+    subject = subject_of(question)
+    active = PracticeActiveQuestion.objects.filter(
         user=user, test_prep_id=DEFAULT_TEST_PREP,
-    ).filter(subject_filter(subject)).count()
-    user_k = USER_K_PROVISIONAL if total_attempts < PROVISIONAL_ATTEMPTS else USER_K_STABLE
+        question__question_type__in=SUBJECT_TYPES[subject],
+    )
+    heads = queue_heads(active)
+    if heads and question.id not in heads:
+        return {
+            'error': 'active_question_required',
+            'detail': 'Answer your current practice question before moving on.',
+        }, status.HTTP_400_BAD_REQUEST
 
-    expected = _expected_score(previous_rating, question.sp_elo_rating)
-    result = 1.0 if correct else 0.0
+    profile = getattr(user, 'profile', None)
+    rows = {
+        row.subject: row
+        for row in PracticeStats.objects.filter(user=user, test_prep_id=DEFAULT_TEST_PREP)
+    }
+    stats = rows.get(subject) or get_practice_stats(user, subject)
+    rows[subject] = stats
+    today = _local_today(profile)
+    used = _attempts_on(user, profile, today)
+
+    def review_payload():
+        active.filter(question=question).delete()
+        return {
+            'rated': False,
+            'review': True,
+            'quota': _quota_from(profile, used),
+            'sp_elo_rating': stats.elo,
+            'subject': subject,
+            # Unchanged, but returned so the client's progress panel stays in sync.
+            'type_progress': practice_type_progress(user, [subject]),
+            'practice_stats': answer_stats_payload(
+                _breakdown_payload(rows, practice_current_streak(user)),
+            ),
+        }, None
+
+    if has(load_practice_state(user).attempted, question.id):
+        return review_payload()
+
+    quota = _quota_from(profile, used)
+    if quota['remaining'] is not None and quota['remaining'] <= 0:
+        return {'error': 'daily_limit', 'quota': quota}, status.HTTP_429_TOO_MANY_REQUESTS
 
+    result = 1.0 if correct else 0.0
+    expected = _expected_score(stats.elo, question.sp_elo_rating)
+    user_k = USER_K_PROVISIONAL if stats.answered < PROVISIONAL_ATTEMPTS else USER_K_STABLE
+    previous_rating = stats.elo
     new_rating = _clamp(previous_rating + user_k * (result - expected))
-    stats.elo = new_rating
-    stats.save(update_fields=['elo'])
+    question_rating = _clamp(question.sp_elo_rating - QUESTION_K * (result - expected))
 
-    question.sp_elo_rating = _clamp(question.sp_elo_rating - QUESTION_K * (result - expected))
-    question.save(update_fields=['sp_elo_rating'])
+    claimed = False
+    try:
+        with transaction.atomic():
+            # The first-attempt claim: the unique row decides which of two
+            # racing submissions is rated, whatever the bitmap said.
+            UserQuestionState.objects.create(
+                user=user, test_prep_id=DEFAULT_TEST_PREP, question=question,
+                first_attempt_at=timezone.now(), last_correct=correct,
+            )
+            claimed = True
+            PracticeStats.objects.filter(pk=stats.pk).update(
+                elo=_clamped_shift('elo', new_rating - previous_rating),
+                answered=F('answered') + 1,
+                correct=F('correct') + int(correct),
+            )
+            Question.objects.filter(pk=question.pk).update(
+                sp_elo_rating=_clamped_shift('sp_elo_rating', question_rating - question.sp_elo_rating),
+            )
+            PracticeAttempt.objects.create(
+                user=user, test_prep_id=DEFAULT_TEST_PREP, question=question, correct=correct,
+                subject=subject, selected_choice=selected_choice,
+            )
+            if new_rating != previous_rating:
+                RatingEvent.objects.create(
+                    user=user, test_prep_id=DEFAULT_TEST_PREP, kind='practice', subject=subject,
+                    rating=new_rating, delta=new_rating - previous_rating,
+                )
+            if question.question_type:
+                _bump_type_stats(user, subject, question.question_type, correct)
+            active.filter(question=question).delete()
+            _bump_practice_day(user, today, subject)
+            daily = advance_daily_streak(profile, today, used + 1)
+
+            # max_streak (the best run) is shown on the streak leaderboard.
+            current_streak = _bump_correct_streak(profile, correct)
+    except IntegrityError:
+        if claimed:
+            raise
+        return review_payload()
+
+    note_practice_answer(user, question.id, correct)
+    question.sp_elo_rating = question_rating
+    note_question_rating(question.id, question_rating)
+
+    stats.elo = new_rating
+    stats.answered += 1
+    stats.correct += int(correct)
     return {
-        'rated': True, 'subject': subject,
-        'previous_rating': previous_rating, 'new_rating': new_rating,
-        'delta': new_rating - previous_rating,
-    }
+        'rated': True,
+        'quota': _quota_from(profile, used + 1),
+        'sp_elo_rating': new_rating,
+        'sp_elo_rating_previous': previous_rating,
+        'sp_elo_rating_delta': new_rating - previous_rating,
+        # Daily-goal streak: answering DAILY_PRACTICE_GOAL questions in a local
+        # day completes it and extends the flame.
+        'daily': daily,
+        'subject': subject,
+        'type_progress': practice_type_progress(user, [subject]),
+        'practice_stats': answer_stats_payload(_breakdown_payload(rows, current_streak)),
+    }, None
+
+
+def _bump_type_stats(user, subject, question_type, correct):
+    # Question-bank progress counts DISTINCT questions; callers only reach
+    # this on a first attempt.
+    lookup = dict(user=user, test_prep_id=DEFAULT_TEST_PREP, subject=subject, question_type=question_type)
+    bump = dict(solved=F('solved') + 1, correct=F('correct') + int(correct))
+    if PracticeTypeStats.objects.filter(**lookup).update(**bump):
+        return
+    _, created = PracticeTypeStats.objects.get_or_create(
+        **lookup, defaults={'solved': 1, 'correct': int(correct)},
+    )
+    if not created:
+        PracticeTypeStats.objects.filter(**lookup).update(**bump)
 
 
 # ---------------------------------------------------------------------------
@@ -347,85 +461,71 @@ def topic_lane_signature(question_type):
     return 't:' + hashlib.sha1(question_type.encode()).hexdigest()[:16]
 
 
-def latest_attempt_correct_ids(user, correct):
-    """Question ids whose user's MOST RECENT recorded attempt matches `correct`.
+def _pick_from_bank(user, subject, types, levels, filters, exclude=frozenset()):
+    """Shared picker over the in-process rating index.
 
-    Only counted (first-time) answers are recorded, so this reflects how a
-    question was originally graded; impact-free reviews never change it.
+    The index narrows by subject/type/level and rating; the user's bitmaps
+    decide eligibility. The chosen id is re-checked against the database: a
+    miss means the bank changed under this worker's index, so it is rebuilt
+    and the pick retried once.
     """
-    latest = {}
-    for question_id, was_correct in (
-        PracticeAttempt.objects.filter(user=user, test_prep_id=DEFAULT_TEST_PREP)
-        .order_by('created_at', 'id')
-        .values_list('question_id', 'correct')
-    ):
-        latest[question_id] = was_correct  # later rows win → most recent attempt
-    return {qid for qid, ok in latest.items() if ok == correct}
+    state = load_practice_state(user)
+    review = filters_want_review(filters)
+    require, forbid = state.masks(filters, review)
+
+    def saved_ok(question_id):
+        if question_id in exclude:
+            return False
+        if filters['saved'] == 'all':
+            return True
+        return has(state.saved, question_id) == (filters['saved'] == 'only')
+
+    for _ in range(2):
+        index = get_practice_index()
+        keys = index.keys_for(subject, types, levels)
+        if filters['saved'] == 'only':
+            any_questions = any(index.in_keys(qid, keys) for qid in bitmap_ids(state.saved))
+        elif filters['saved'] == 'exclude':
+            saved_here = sum(1 for qid in bitmap_ids(state.saved) if index.in_keys(qid, keys))
+            any_questions = index.size(keys) > saved_here
+        else:
+            any_questions = index.size(keys) > 0
+        if not any_questions:
+            return None, 'no_questions'
+
+        if review:
+            pool = [qid for qid in bitmap_ids(require) if index.in_keys(qid, keys) and saved_ok(qid)]
+            if not pool:
+                return None, 'no_matches'
+            question_id = random.choice(pool)
+        else:
+            question_id = index.sample_near(
+                keys, get_practice_stats(user, subject).elo,
+                lambda qid: not has(forbid, qid) and saved_ok(qid),
+            )
+            if question_id is None:
+                return None, 'completed_topic'
+
+        question = Question.objects.filter(
+            id=question_id, test_prep_id=DEFAULT_TEST_PREP, subject=subject,
+            question_type__in=types,
+        ).first()
+        if question is not None and (not levels or question.difficulty in levels):
+            return question, None
+        invalidate_practice_index()
+    return None, 'completed_topic'
 
 
-def pick_filtered_question(user, subject, filters):
+def pick_filtered_question(user, subject, filters, exclude=frozenset()):
     """Pick a practice question honoring the filter bar.
 
     Returns (question, empty_state). With default filters this is the adaptive
     fresh-only picker. The done-before/result filters instead draw from a
-    review pool of already-answered questions.
+    review pool of already-answered questions. `exclude` holds ids already
+    queued in the lane.
     """
-    base = Question.objects.filter(
-        test_prep_id=DEFAULT_TEST_PREP, subject=subject,
-        question_type__in=SUBJECT_TYPES[subject],
-    )
-    if filters['types']:
-        base = base.filter(question_type__in=filters['types'])
-    if filters['levels']:
-        base = base.filter(difficulty__in=filters['levels'])
-
-    if filters['saved'] != 'all':
-        saved_ids = SavedQuestion.objects.filter(
-            user=user, test_prep_id=DEFAULT_TEST_PREP,
-        ).values_list('question_id', flat=True)
-        if filters['saved'] == 'only':
-            base = base.filter(id__in=saved_ids)
-        else:  # 'exclude'
-            base = base.exclude(id__in=saved_ids)
-
-    if not base.exists():
-        return None, 'no_questions'
-
-    attempted_ids = set(
-        PracticeAttempt.objects.filter(
-            user=user, test_prep_id=DEFAULT_TEST_PREP,
-        ).values_list('question_id', flat=True)
-    )
-
-    if filters_want_review(filters):
-        pool = base.filter(id__in=attempted_ids)
-        if filters['result'] == 'correct':
-            pool = pool.filter(id__in=latest_attempt_correct_ids(user, True))
-        elif filters['result'] == 'incorrect':
-            pool = pool.filter(id__in=latest_attempt_correct_ids(user, False))
-        ids = list(pool.values_list('id', flat=True))
-        if not ids:
-            return None, 'no_matches'
-        return Question.objects.get(id=random.choice(ids)), None
-
-    # Fresh pool — practice never recycles a question the student has answered.
-    fresh = base.exclude(id__in=attempted_ids)
-    if not fresh.exists():
-        return None, 'completed_topic'
-
-    user_rating = get_practice_stats(user, subject).elo
-    for window in (250, 500, 1000, None):
-        qs = fresh
-        if window is not None:
-            qs = qs.filter(
-                sp_elo_rating__gte=user_rating - window,
-                sp_elo_rating__lte=user_rating + window,
-            )
-        fresh_ids = list(qs.values_list('id', flat=True))
-        if fresh_ids:
-            return Question.objects.get(id=random.choice(fresh_ids)), None
-
-    return None, 'completed_topic'
+    types = filters['types'] or SUBJECT_TYPES[subject]
+    return _pick_from_bank(user, subject, types, filters['levels'], filters, exclude)
 
 
 # ---------------------------------------------------------------------------
@@ -439,39 +539,82 @@ def pick_practice_question(user, subject, question_type=None):
     never silently recycles a question the student already answered.
     """
     types = SUBJECT_TYPES[subject]
-    user_rating = get_practice_stats(user, subject).elo
-
-    base = Question.objects.filter(test_prep_id=DEFAULT_TEST_PREP, subject=subject)
     if question_type and question_type != 'any' and question_type in types:
-        base = base.filter(question_type=question_type)
-    else:
-        base = base.filter(question_type__in=types)
+        types = [question_type]
+    filters = {'types': [], 'levels': [], 'saved': 'all', 'attempted': 'all', 'result': 'all'}
+    return _pick_from_bank(user, subject, types, [], filters)
 
-    if not base.exists():
-        return None, 'no_questions'
 
-    attempted_ids = set(
-        PracticeAttempt.objects.filter(
-            user=user, test_prep_id=DEFAULT_TEST_PREP,
-        ).values_list('question_id', flat=True)
+# ---------------------------------------------------------------------------
+# Lookahead queue
+# ---------------------------------------------------------------------------
+
+PRACTICE_LOOKAHEAD_MAX = 5
+# Rating drift after which a reservation no longer sits in the picker's
+# tightest window (250) around the user, so it is re-picked.
+PRACTICE_LOOKAHEAD_DRIFT = 125
+
+
+def parse_lookahead(request):
+    """How many questions the client wants per lane (1 = classic one-at-a-time)."""
+    try:
+        lookahead = int(request.GET.get('lookahead', 1))
+    except (TypeError, ValueError):
+        return 1
+    return max(1, min(PRACTICE_LOOKAHEAD_MAX, lookahead))
+
+
+def queue_heads(active_questions):
+    """Question ids at the front of each lane's queue — the only ones the
+    user may answer next."""
+    heads = {}
+    for lane, position, question_id in active_questions.values_list('lane', 'position', 'question_id'):
+        if lane not in heads or position < heads[lane][0]:
+            heads[lane] = (position, question_id)
+    return {question_id for _, question_id in heads.values()}
+
+
+def fill_lane_queue(user, subject, lane, filters, size):
+    """The lane's queue topped up to `size` entries, oldest first.
+
+    The head is never swapped — it is the question the user was shown as
+    current. Reservations behind it are dropped once the user's rating has
+    drifted past PRACTICE_LOOKAHEAD_DRIFT and re-picked on the spot. Returns
+    (queue, empty_state); empty_state is set only when the queue is empty.
+    """
+    queue = list(
+        PracticeActiveQuestion.objects.filter(user=user, test_prep_id=DEFAULT_TEST_PREP, lane=lane)
+        .order_by('position')
     )
-    fresh = base.exclude(id__in=attempted_ids)
-    if not fresh.exists():
-        return None, 'completed_topic'
-
-    # Widen the rating window until we find fresh questions.
-    for window in (250, 500, 1000, None):
-        qs = fresh
-        if window is not None:
-            qs = qs.filter(
-                sp_elo_rating__gte=user_rating - window,
-                sp_elo_rating__lte=user_rating + window,
-            )
-        fresh_ids = list(qs.values_list('id', flat=True))
-        if fresh_ids:
-            return Question.objects.get(id=random.choice(fresh_ids)), None
+    if queue and size == 1:
+        return queue, None
 
-    return None, 'completed_topic'
+    elo = get_practice_stats(user, subject).elo
+    stale = [
+        entry.id for entry in queue[1:]
+        if entry.reserved_elo is not None and abs(elo - entry.reserved_elo) > PRACTICE_LOOKAHEAD_DRIFT
+    ]
+    if stale:
+        PracticeActiveQuestion.objects.filter(id__in=stale).delete()
+        queue = [entry for entry in queue if entry.id not in stale]
+
+    taken = {entry.question_id for entry in queue}
+    position = queue[-1].position + 1 if queue else 0
+    empty_state = None
+    while len(queue) < size:
+        question, empty_state = pick_filtered_question(user, subject, filters, exclude=taken)
+        if question is None:
+            break
+        # A concurrent request may have claimed this slot; keep whatever won.
+        entry, _ = PracticeActiveQuestion.objects.get_or_create(
+            user=user, test_prep_id=DEFAULT_TEST_PREP, lane=lane, position=position,
+            defaults={'question': question, 'reserved_elo': elo},
+        )
+        position += 1
+        if entry.question_id not in taken:
+            taken.add(entry.question_id)
+            queue.append(entry)
+    return queue, (None if queue else empty_state)
 
 
 # ---------------------------------------------------------------------------
@@ -503,34 +646,30 @@ def next_question(request):
             status=status.HTTP_429_TOO_MANY_REQUESTS,
         )
 
+    # Lookahead is capped by what the user may still answer today; reviews are free.
+    lookahead = parse_lookahead(request)
+    size = lookahead
+    if not review and quota['remaining'] is not None:
+        size = min(size, quota['remaining'])
+
     empty_states = []
     for question_type in filters['types'] or [None]:
         lane = f'{subject}:{topic_lane_signature(question_type)}'
-        active = PracticeActiveQuestion.objects.filter(
-            user=request.user, test_prep_id=DEFAULT_TEST_PREP, lane=lane,
-        ).first()
-        if active:
-            return Response({
-                'question': QuestionSerializer(active.question).data,
-                'quota': quota, 'subject': subject,
-            })
-
         lane_filters = {**filters, 'types': [question_type] if question_type else []}
-        question, empty_state = pick_filtered_question(request.user, subject, lane_filters)
-        if question is None:
+        queue, empty_state = fill_lane_queue(request.user, subject, lane, lane_filters, size)
+        if not queue:
             empty_states.append(empty_state)
             continue
 
-        active, _ = PracticeActiveQuestion.objects.get_or_create(
-            user=request.user,
-            test_prep_id=DEFAULT_TEST_PREP,
-            lane=lane,
-            defaults={'question': question},
-        )
-        return Response({
-            'question': QuestionSerializer(active.question).data,
+        served = [entry.question_id for entry in queue[:size]]
+        questions = question_payloads(served)
+        payload = {
+            'question': questions[served[0]],
             'quota': quota, 'subject': subject,
-        })
+        }
+        if lookahead > 1:
+            payload['upcoming'] = [questions[question_id] for question_id in served[1:] if question_id in questions]
+        return Response(payload)
 
     empty_state = 'no_matches' if 'no_matches' in empty_states else (
         'completed_topic' if 'completed_topic' in empty_states else 'no_questions'
@@ -684,12 +823,14 @@ def saved_questions(request):
                             status=status.HTTP_404_NOT_FOUND)
         # Idempotent: re-saving an already-saved question is a no-op rather
         # than an error, so a double click can't fail the button.
-        SavedQuestion.objects.get_or_create(
+        _, created = SavedQuestion.objects.get_or_create(
             user=request.user,
             test_prep_id=DEFAULT_TEST_PREP,
             question=question,
             defaults={'subject': resolve_subject(subject_of(question))},
         )
+        if created:
+            note_saved(request.user, question.id, True)
         return Response({'saved': True, 'question_id': question.id})
 
     subject = request.GET.get('subject')
@@ -747,9 +888,11 @@ def saved_questions(request):
 @permission_classes([IsAuthenticated])
 def unsave_question(request, question_id):
     """Remove a question from the user's saved list."""
-    SavedQuestion.objects.filter(
+    deleted, _ = SavedQuestion.objects.filter(
         user=request.user, test_prep_id=DEFAULT_TEST_PREP, question_id=question_id,
     ).delete()
+    if deleted:
+        note_saved(request.user, question_id, False)
     return Response({'saved': False, 'question_id': question_id})
 
 
@@ -804,10 +947,49 @@ def _local_day_bounds_utc(profile, local_date):
 
 
 def _attempts_on(user, profile, local_date):
-    start, end = _local_day_bounds_utc(profile, local_date)
-    return PracticeAttempt.objects.filter(
-        user=user, test_prep_id=DEFAULT_TEST_PREP, created_at__gte=start, created_at__lt=end,
-    ).count()
+    return PracticeDay.objects.filter(
+        user=user, test_prep_id=DEFAULT_TEST_PREP, date=local_date,
+    ).values_list('answered', flat=True).first() or 0
+
+
+def _practice_days(user, start_date, end_date):
+    """{local date: PracticeDay} for the inclusive range."""
+    return {
+        day.date: day for day in PracticeDay.objects.filter(
+            user=user, test_prep_id=DEFAULT_TEST_PREP, date__gte=start_date, date__lte=end_date,
+        )
+    }
+
+
+def _bump_practice_day(user, local_date, subject):
+    lookup = dict(user=user, test_prep_id=DEFAULT_TEST_PREP, date=local_date)
+    bump = {'answered': F('answered') + 1, subject: F(subject) + 1}
+    if PracticeDay.objects.filter(**lookup).update(**bump):
+        return
+    _, created = PracticeDay.objects.get_or_create(**lookup, defaults={'answered': 1, subject: 1})
+    if not created:
+        PracticeDay.objects.filter(**lookup).update(**bump)
+
+
+def rebuild_practice_days(user):
+    """Recompute a user's PracticeDay rows from the attempt log in their
+    current timezone (after a timezone change or hand-edited attempts)."""
+    tz = _user_tz(getattr(user, 'profile', None))
+    days = {}
+    for stamp, subject in PracticeAttempt.objects.filter(
+        user=user, test_prep_id=DEFAULT_TEST_PREP,
+    ).values_list('created_at', 'subject').iterator():
+        day = days.setdefault(stamp.astimezone(tz).date(), {'answered': 0, 'english': 0, 'math': 0})
+        day['answered'] += 1
+        if subject in day:
+            day[subject] += 1
+    with transaction.atomic():
+        PracticeDay.objects.filter(user=user, test_prep_id=DEFAULT_TEST_PREP).delete()
+        PracticeDay.objects.bulk_create([
+            PracticeDay(user=user, test_prep_id=DEFAULT_TEST_PREP, date=date, **counts)
+            for date, counts in days.items()
+        ])
+    return len(days)
 
 
 def effective_streak(profile, today=None):
@@ -824,13 +1006,19 @@ def update_daily_streak(user):
     """Called after each practice attempt. Extends the streak the moment the
     user's answer count for their local day reaches the goal."""
     profile = getattr(user, 'profile', None)
+    if profile is None:
+        return advance_daily_streak(None, None, 0)
+    today = _local_today(profile)
+    return advance_daily_streak(profile, today, _attempts_on(user, profile, today))
+
+
+def advance_daily_streak(profile, today, count):
+    """update_daily_streak for a caller that already knows today's count."""
     goal = settings.DAILY_PRACTICE_GOAL
     if profile is None:
         return {'count': 0, 'goal': goal, 'completed_today': False,
                 'streak': 0, 'longest': 0, 'streak_extended': False}
 
-    today = _local_today(profile)
-    count = _attempts_on(user, profile, today)
     _, day_ends_at = _local_day_bounds_utc(profile, today)
     completed = count >= goal
     extended = False
@@ -867,25 +1055,17 @@ def week_strip(user, profile):
     today = _local_today(profile)
     goal = settings.DAILY_PRACTICE_GOAL
     start_date = today - datetime.timedelta(days=6)
-    start_utc, _ = _local_day_bounds_utc(profile, start_date)
-
-    tz = _user_tz(profile)
-    counts = {}
-    stamps = PracticeAttempt.objects.filter(
-        user=user, test_prep_id=DEFAULT_TEST_PREP, created_at__gte=start_utc,
-    ).values_list('created_at', flat=True)
-    for stamp in stamps:
-        local_date = stamp.astimezone(tz).date()
-        counts[local_date] = counts.get(local_date, 0) + 1
+    rows = _practice_days(user, start_date, today)
 
     days = []
     for offset in range(7):
         d = start_date + datetime.timedelta(days=offset)
+        count = rows[d].answered if d in rows else 0
         days.append({
             'date': d.isoformat(),
             'weekday': d.strftime('%a'),
-            'count': counts.get(d, 0),
-            'completed': counts.get(d, 0) >= goal,
+            'count': count,
+            'completed': count >= goal,
             'is_today': d == today,
         })
     return days
@@ -896,24 +1076,18 @@ def practice_activity(user, days=365):
     profile = getattr(user, 'profile', None)
     today = _local_today(profile)
     start_date = today - datetime.timedelta(days=days - 1)
-    start_utc, _ = _local_day_bounds_utc(profile, start_date)
-    _, end_utc = _local_day_bounds_utc(profile, today)
-    tz = _user_tz(profile)
-    counts = {}
-    attempts = PracticeAttempt.objects.filter(
-        user=user, test_prep_id=DEFAULT_TEST_PREP,
-        created_at__gte=start_utc, created_at__lt=end_utc,
-    ).values_list('created_at', 'subject')
-    for stamp, subject in attempts:
-        local_date = stamp.astimezone(tz).date()
-        day = counts.setdefault(local_date, {'count': 0, 'english': 0, 'math': 0})
-        day['count'] += 1
-        day[subject] += 1
-
-    return [
-        {'date': date.isoformat(), **counts.get(date, {'count': 0, 'english': 0, 'math': 0})}
-        for date in (start_date + datetime.timedelta(days=offset) for offset in range(days))
-    ]
+    rows = _practice_days(user, start_date, today)
+
+    activity = []
+    for date in (start_date + datetime.timedelta(days=offset) for offset in range(days)):
+        row = rows.get(date)
+        activity.append({
+            'date': date.isoformat(),
+            'count': row.answered if row else 0,
+            'english': row.english if row else 0,
+            'math': row.math if row else 0,
+        })
+    return activity
 
 
 def daily_snapshot(user):
@@ -7,7 +7,9 @@ from django.db.models import F, IntegerField, OuterRef, Q, Subquery, Value
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework.response import Response
-from api.models import DEFAULT_TEST_PREP, DirectMessage, Profile, FriendRequest, PracticeStats, TestPrepUserStats
+from api.models import (
+    DEFAULT_TEST_PREP, DirectMessage, Profile, FriendRequest, PracticeStats, RatingEvent, TestPrepUserStats,
+)
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -17,6 +19,10 @@ from rest_framework import status
 from api.views.practice_views import practice_activity, practice_stats_breakdown
 
 USERNAME_CHANGE_COOLDOWN = timedelta(days=30)
+RATING_CHART_DAYS = 90
+RATING_CHART_MAX_DAYS = 365
+RATING_CHART_POINTS = 60
+RATING_CHART_MAX_POINTS = 200
 USERNAME_RULE = re.compile(r'^[a-zA-Z0-9_]{1,15}$')
 
 LEADERBOARD_METRICS = {
@@ -428,3 +434,55 @@ def view_profile(request, user_id):
 @permission_classes([IsAuthenticated])
 def infinite_questions_profile_view(request):
     return Response(_practice_statistics_payload(request.user))
+
+
+def _bounded_int(raw, default, upper):
+    try:
+        return min(upper, max(1, int(raw)))
+    except (TypeError, ValueError):
+        return default
+
+
+def downsample_ratings(events, since, until, points):
+    """Keep each series' last rating per time bucket: {series: [{'t', 'rating'}]}.
+
+    `events` are (created_at, kind, subject, rating) tuples in time order;
+    duel ratings form the 'duel' series, practice ratings one per subject.
+    """
+    width = max((until - since).total_seconds() / points, 1)
+    buckets = {}
+    for created_at, kind, subject, rating in events:
+        series = 'duel' if kind == 'duel' else subject
+        bucket = min(points - 1, int((created_at - since).total_seconds() // width))
+        buckets.setdefault(series, {})[bucket] = (created_at, rating)
+    return {
+        series: [{'t': created_at.isoformat(), 'rating': rating} for _, (created_at, rating) in sorted(kept.items())]
+        for series, kept in buckets.items()
+    }
+
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def rating_chart(request, user_id=None):
+    """A user's duel and practice rating timelines for the active test prep,
+    downsampled to at most ?points= per series over the last ?days=."""
+    if user_id is not None and not User.objects.filter(id=user_id).exists():
+        return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+    test_prep = request.user.profile.active_test_prep_id
+    days = _bounded_int(request.GET.get('days'), RATING_CHART_DAYS, RATING_CHART_MAX_DAYS)
+    points = _bounded_int(request.GET.get('points'), RATING_CHART_POINTS, RATING_CHART_MAX_POINTS)
+    until = timezone.now()
+    since = until - timedelta(days=days)
+    # One range scan over (user, test_prep, created_at).
+    events = (
+        RatingEvent.objects
+        .filter(user_id=user_id or request.user.id, test_prep_id=test_prep, created_at__gte=since)
+        .order_by('created_at', 'id')
+        .values_list('created_at', 'kind', 'subject', 'rating')
+    )
+    return Response({
+        'test_prep': test_prep,
+        'since': since.isoformat(),
+        'series': downsample_ratings(events, since, until, points),
+    })
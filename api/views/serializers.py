@@ -157,12 +157,20 @@ class RoomSerializer(serializers.ModelSerializer):
 
 
 class TrackedQuestionSerializer(serializers.ModelSerializer):
-    question = QuestionSerializer()
+    # Pass context={'questions': api.question_bank.get_many(...)} to reuse
+    # cached payloads instead of loading and serializing each question.
+    question = serializers.SerializerMethodField()
 
     class Meta:
         model = TrackedQuestion
         fields = '__all__'
 
+    def get_question(self, obj):
+        questions = self.context.get('questions')
+        if questions is not None and obj.question_id in questions:
+            return questions[obj.question_id]
+        return QuestionSerializer(obj.question).data
+
 
 class TrackedQuestionResultSerializer(serializers.ModelSerializer):
     user = DuelUserSerializer()
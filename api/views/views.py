@@ -7,6 +7,7 @@ from rest_framework.decorators import api_view, authentication_classes, permissi
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from api import generation
+from api.question_bank import bump_bank_version
 from api.views.serializers import QuestionSerializer, QuestionAdminSerializer
 from django.db import models
 from django.db import transaction
@@ -271,6 +272,7 @@ def bulk_update_questions(request):
 
     with transaction.atomic():
         updated = questions.update(**updates)
+    bump_bank_version()  # queryset.update() skips the Question signals
     return Response({'status': 'success', 'updated': updated})
 
 
@@ -357,11 +359,8 @@ def check_answer(request):
     they no longer batter the practice rating.
     """
     from api.views.practice_views import (
-        apply_practice_elo, get_practice_stats, practice_stats_breakdown,
-        practice_type_progress, quota_payload, record_practice_answer, subject_of,
+        answer_practice_question, answer_stats_payload, practice_stats_breakdown,
     )
-    from api.models import PracticeActiveQuestion, PracticeAttempt
-    from api.views.practice_views import SUBJECT_TYPES
 
     data = request.data
     question_id = data.get('question_id')
@@ -389,82 +388,14 @@ def check_answer(request):
     if is_practice:
         if question.test_prep_id != DEFAULT_TEST_PREP:
             return Response({'error': 'Question does not belong to SAT practice.'}, status=400)
-        subject = subject_of(question)
-        active_subject_questions = PracticeActiveQuestion.objects.filter(
-            user=request.user,
-            test_prep_id=DEFAULT_TEST_PREP,
-            question__question_type__in=SUBJECT_TYPES[subject],
-        )
-        if active_subject_questions.exists() and not active_subject_questions.filter(question=question).exists():
-            return Response(
-                {'error': 'active_question_required',
-                 'detail': 'Answer your current practice question before moving on.'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        # A repeat sighting of an answered question is a review (surfaced by the
-        # done-before/result filters): grade it, but never charge the quota,
-        # move Elo, touch lifetime stats, or extend the daily streak.
-        is_review = PracticeAttempt.objects.filter(
-            user=request.user, test_prep_id=DEFAULT_TEST_PREP, question=question,
-        ).exists()
-        if is_review:
-            current_elo = get_practice_stats(request.user, subject).elo
-            payload['rated'] = False
-            payload['review'] = True
-            payload['quota'] = quota_payload(request.user)
-            payload['sp_elo_rating'] = current_elo
-            payload['subject'] = subject
-            # Unchanged, but returned so the client's progress panel stays in sync.
-            payload['type_progress'] = practice_type_progress(request.user, [subject])
-            active_subject_questions.filter(question=question).delete()
-            if request.user.is_authenticated:
-                stats = practice_stats_breakdown(request.user)
-                payload['practice_stats'] = {
-                    'correct_number': stats['practice_correct'],
-                    'incorrect_number': stats['practice_answered'] - stats['practice_correct'],
-                    'answered': stats['practice_answered'],
-                    **stats,
-                }
-            return Response(payload)
-
-        quota = quota_payload(request.user)
-        if quota['remaining'] is not None and quota['remaining'] <= 0:
-            return Response(
-                {'error': 'daily_limit', 'quota': quota},
-                status=status.HTTP_429_TOO_MANY_REQUESTS,
-            )
-        from api.views.practice_views import practice_current_streak, update_daily_streak
-        rating_update = apply_practice_elo(request.user, question, correct)
-        record_practice_answer(request.user, question, correct, subject, selected_choice)
-        payload['rated'] = rating_update['rated']
-        payload['quota'] = quota_payload(request.user)
-        payload['sp_elo_rating'] = rating_update['new_rating']
-        payload['sp_elo_rating_previous'] = rating_update['previous_rating']
-        payload['sp_elo_rating_delta'] = rating_update['delta']
-        # Daily-goal streak: answering DAILY_PRACTICE_GOAL questions in a local
-        # day completes it and extends the flame.
-        payload['daily'] = update_daily_streak(request.user)
-        payload['subject'] = subject
-        payload['type_progress'] = practice_type_progress(request.user, [subject])
-        active_subject_questions.filter(question=question).delete()
-
-        # Best correct-answer run, shown on the streak leaderboard.
-        profile = getattr(request.user, 'profile', None)
-        if correct and profile:
-            streak = practice_current_streak(request.user)
-            if streak > profile.max_streak:
-                profile.max_streak = streak
-                profile.save(update_fields=['max_streak'])
+        fields, error_status = answer_practice_question(request.user, question, correct, selected_choice)
+        if error_status is not None:
+            return Response(fields, status=error_status)
+        payload.update(fields)
+        return Response(payload)
 
     if request.user.is_authenticated:
-        stats = practice_stats_breakdown(request.user)
-        payload['practice_stats'] = {
-            'correct_number': stats['practice_correct'],
-            'incorrect_number': stats['practice_answered'] - stats['practice_correct'],
-            'answered': stats['practice_answered'],
-            **stats,
-        }
+        payload['practice_stats'] = answer_stats_payload(practice_stats_breakdown(request.user))
 
     return Response(payload)
 
@@ -3,6 +3,12 @@ ASGI config for satduel project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Only the events app serves this: a second Heroku app on this repo and
+database, on its own hostname, with DUEL_EVENTS_APP=True (see the Procfile).
+It carries the duel event streams (/api/match/<id>/events/), which hold
+their connections open; the main app stays on WSGI and its thread pool, and
+answers 501 on the stream URL.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
@@ -129,6 +129,32 @@ DATABASES = {
     'default': dj_database_url.config(default=f'sqlite:///{BASE_DIR / "db.sqlite3"}')
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Holds question payloads, practice bitmaps, bot busy marks, party presence,
+# Gold Rush pools and the party hot state. With REDIS_URL set (Heroku Key-Value
+# Store) every worker shares one cache. Without it each worker process has its
+# own locmem cache: busy marks and presence are then per worker, and
+# PARTY_HOT_STATE must stay off with more than one worker. MAX_ENTRIES is sized
+# to hold a whole question bank's payloads without culling.
+REDIS_URL = os.environ.get('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            # Heroku's TLS endpoint uses a self-signed certificate.
+            'OPTIONS': {'ssl_cert_reqs': None} if REDIS_URL.startswith('rediss://') else {},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 20000))},
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -252,6 +278,11 @@ FREE_DAILY_LIMIT = int(os.environ.get('FREE_DAILY_LIMIT', 25))
 # and extend the day streak.
 DAILY_PRACTICE_GOAL = int(os.environ.get('DAILY_PRACTICE_GOAL', 10))
 
+# Party Mode: keep live rooms' seats in the cache between phase boundaries
+# instead of locking the room row for every move (api/party_engine.py). The
+# cache must be shared by every worker that serves a room (REDIS_URL, above).
+PARTY_HOT_STATE = os.environ.get('PARTY_HOT_STATE', 'False') == 'True'
+
 # Google OAuth client ID used to verify id_tokens from the frontend.
 # Public value (safe to ship); overridable via env. Must match the client ID
 # the frontend uses to mint the token, or verification fails.